@@ -1,80 +1,95 @@
 """Streamlit application for Mirage simulation decision support."""
 
+import os
 import sys
 from pathlib import Path
-import importlib
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Force reload of backend modules to pick up changes
-if "src.mirage.constants" in sys.modules:
-    import src.mirage.constants
-    importlib.reload(src.mirage.constants)
-if "src.mirage.models" in sys.modules:
-    import src.mirage.models
-    importlib.reload(src.mirage.models)
-if "src.mirage.calculator" in sys.modules:
-    import src.mirage.calculator
-    importlib.reload(src.mirage.calculator)
-
 import streamlit as st
-import pandas as pd
-import json # Added for save/load features
-
-from src.mirage.models import (
-    AllDecisions,
-    ProductDecision,
-    MarketingDecision,
-    ApprovisionnementDecision,
-    ProductionDecision,
-    RSEDecision,
-    FinanceDecision,
-    TitresDecision,
-    PeriodState,
-)
+import copy
+
+from src.mirage.models import PeriodState
 from src.mirage.calculator import calculate_all, calculate_study_costs
 from src.mirage import constants as C
-from src.mirage.parser import parse_mirage_markdown, extract_period_state, get_empty_state
+from src.mirage.parser import get_empty_state
+from src.mirage.cache import parse_report_cached
 from src.mirage.utils import serialize_simulation_state, deserialize_simulation_state
+from src.mirage.binding import DECISION_BINDINGS, STATE_BINDINGS, SESSION_KEYS
+# snapshot, history, library, jobs, watcher, schema : importés dans les sections qui s'en servent
+
+# --- WORKSPACE ---
+@st.cache_resource
+def get_workspace_watcher():
+    """Un seul watcher par serveur : les rapports du workspace sont analysés en arrière-plan."""
+    from src.mirage.watcher import WorkspaceWatcher
+
+    return WorkspaceWatcher(Path(__file__).parent.parent, "Simulation*.md").start()
+
 
 # --- SAVE / LOAD HELPERS ---
-SAVE_FILE = "data/saved_defaults.json"
+# Ancien fichier de valeurs par défaut, importé une fois dans la bibliothèque de scénarios
+LEGACY_SAVE_FILE = "data/saved_defaults.json"
+
+@st.cache_resource
+def get_library():
+    """Bibliothèque de scénarios partagée (data/scenarios.sqlite)."""
+    from src.mirage.library import DEFAULT_SCENARIO, ScenarioLibrary
+
+    library = ScenarioLibrary()
+    if DEFAULT_SCENARIO not in library and Path(LEGACY_SAVE_FILE).exists():
+        library.import_session_json(LEGACY_SAVE_FILE, DEFAULT_SCENARIO, tags=["defaut"])
+    return library
+
+def save_scenario(name: str, tags=()):
+    """Enregistre les widgets liés de la session comme scénario `name`."""
+    from src.mirage import snapshot
+
+    metadata = {}
+    if st.session_state.get("user_notes"):
+        metadata["notes"] = st.session_state["user_notes"]
+    # Prévisions saisies dans l'onglet décisions (clé du cache de résultats)
+    forecasts = st.session_state.get("forecasts")
+    history = st.session_state.get("history")
+    results = None
+    if history is not None and history.current is not None:
+        results = history.cached_results(forecasts)
+    scenario = snapshot.snapshot_from_session(st.session_state, forecasts)
+    get_library().save(name, scenario, tags, metadata, results)
+
+def scenario_session_values(name: str) -> dict:
+    """{clé de widget: valeur} du scénario `name` (notes comprises)."""
+    from src.mirage import snapshot
+
+    library = get_library()
+    values = snapshot.session_values(library.load(name))
+    notes = library.info(name).metadata.get("notes")
+    if notes:
+        values["user_notes"] = notes
+    return values
 
 def save_state_to_file():
-    """Sauvegarde l'état actuel (session_state) dans un fichier JSON."""
-    serializable_state = {}
-    # Keys to exclude from saving (especially buttons which cause errors if reloaded)
-    EXCLUDED_KEYS = ["state", "reset_btn", "auto_app_n", "auto_app_s"]
-
-    # On sauvegarde toutes les clés simples (int, float, str, bool, list)
-    # On exclut les objets complexes comme PeriodState qui sera reconstruit via les widgets
-    for k, v in st.session_state.items():
-        if k in EXCLUDED_KEYS: continue 
-        if isinstance(v, (int, float, str, bool, list, dict, type(None))):
-            serializable_state[k] = v
-            
+    """Sauvegarde l'état actuel comme scénario par défaut de la bibliothèque."""
+    from src.mirage.library import DEFAULT_SCENARIO
+
     try:
-        Path("data").mkdir(exist_ok=True)
-        with open(SAVE_FILE, "w") as f:
-            json.dump(serializable_state, f, indent=2)
+        save_scenario(DEFAULT_SCENARIO, tags=["defaut"])
         st.toast("✅ Valeurs sauvegardées comme défaut !", icon="💾")
     except Exception as e:
         st.error(f"Erreur sauvegarde: {e}")
 
 def load_state_from_file():
-    """Charge l'état depuis le fichier JSON."""
-    if not Path(SAVE_FILE).exists():
+    """Charge le scénario par défaut de la bibliothèque."""
+    from src.mirage.library import DEFAULT_SCENARIO
+
+    if DEFAULT_SCENARIO not in get_library():
         st.toast("⚠️ Aucune sauvegarde trouvée.", icon="📂")
         return
     
     try:
-        with open(SAVE_FILE, "r") as f:
-            loaded_state = json.load(f)
-        
         # Mise à jour du session_state
-        for k, v in loaded_state.items():
-            if k == "reset_btn": continue # Safety check
+        for k, v in scenario_session_values(DEFAULT_SCENARIO).items():
             st.session_state[k] = v
             
         # On force le rechargement pour que les widgets prennent les nouvelles valeurs
@@ -85,22 +100,7 @@ def load_state_from_file():
 
 def sync_widgets_with_state(state: PeriodState):
     """Met à jour les widgets de la sidebar avec les valeurs de l'état."""
-    st.session_state.s_a_ct = float(state.stock_a_ct) if state.stock_a_ct is not None else 0.0
-    st.session_state.s_a_gs = float(state.stock_a_gs) if state.stock_a_gs is not None else 0.0
-    st.session_state.s_b_ct = float(state.stock_b_ct) if state.stock_b_ct is not None else 0.0
-    st.session_state.s_b_gs = float(state.stock_b_gs) if state.stock_b_gs is not None else 0.0
-    st.session_state.s_c_ct = float(state.stock_c_ct) if state.stock_c_ct is not None else 0.0
-    st.session_state.s_c_gs = float(state.stock_c_gs) if state.stock_c_gs is not None else 0.0
-    st.session_state.s_mp_n = int(state.stock_mp_n) if state.stock_mp_n is not None else 0
-    st.session_state.s_mp_s = int(state.stock_mp_s) if state.stock_mp_s is not None else 0
-    st.session_state.s_ouvriers = int(state.nb_ouvriers) if state.nb_ouvriers is not None else 0
-    st.session_state.s_m1 = int(state.nb_machines_m1) if state.nb_machines_m1 is not None else 0
-    st.session_state.s_m2 = int(state.nb_machines_m2) if state.nb_machines_m2 is not None else 0
-    st.session_state.s_cash = float(state.cash) if state.cash is not None else 0.0
-    st.session_state.s_dlt = float(state.dette_lt) if state.dette_lt is not None else 0.0
-    st.session_state.s_dct = float(state.dette_ct) if state.dette_ct is not None else 0.0
-    st.session_state.s_ip = float(state.indice_prix) if state.indice_prix is not None else 0.0
-    st.session_state.s_is = float(state.indice_salaire) if state.indice_salaire is not None else 0.0
+    STATE_BINDINGS.push(state, st.session_state)
 
 def update_indices_from_period():
     """Recalcule les indices Prix et Salaire basés sur la période sélectionnée (Base 100 en P-3)."""
@@ -148,9 +148,8 @@ with st.sidebar:
     col_save, col_load = st.columns(2)
     
     with col_save:
-        # Pousser le dictionnaire de session_state actuel vers JSON
-        # On convertit en dict d'abord pour passer à la fonction
-        json_state = serialize_simulation_state(dict(st.session_state))
+        # Pousser les clés liées aux widgets vers JSON (pas toute la session)
+        json_state = serialize_simulation_state(st.session_state, SESSION_KEYS)
         st.download_button(
             label="💾 Sauvegarder",
             data=json_state,
@@ -158,14 +157,29 @@ with st.sidebar:
             mime="application/json",
             help="Télécharger le fichier de sauvegarde de votre session actuelle"
         )
+    with col_load:
+        # Format binaire compact (décisions + état), voir mirage.snapshot
+        from src.mirage import snapshot
+
+        st.download_button(
+            label="📦 Snapshot",
+            data=snapshot.dump_one(snapshot.snapshot_from_session(
+                st.session_state, st.session_state.get("forecasts"))),
+            file_name="mirage_session.mrsn",
+            mime="application/octet-stream",
+            help="Télécharger un snapshot binaire compact (décisions, état initial, prévisions)"
+        )
         
     # Charger
-    uploaded_session = st.file_uploader("Charger une session (.json)", type=["json"], label_visibility="collapsed")
+    uploaded_session = st.file_uploader("Charger une session (.json, .mrsn)", type=["json", "mrsn"], label_visibility="collapsed")
     
     if uploaded_session is not None:
         try:
-            content = uploaded_session.read().decode("utf-8")
-            loaded_state = deserialize_simulation_state(content)
+            raw = uploaded_session.read()
+            if raw.startswith(b"MRSN"):
+                loaded_state = snapshot.session_values(snapshot.load_one(raw))
+            else:
+                loaded_state = deserialize_simulation_state(raw.decode("utf-8"))
             
             if loaded_state:
                 # Update session state with loaded values
@@ -194,6 +208,39 @@ with st.sidebar:
         if st.button("📂 Charger Défaut", use_container_width=True, help="Charger les valeurs personnalisées sauvegardées"):
             load_state_from_file() # Actually this function sets st.session_state, which is fine IF it reruns. And load_state_from_file has rerun().
 
+    with st.expander("📚 Bibliothèque de scénarios"):
+        library = get_library()
+        scen_name = st.text_input("Nom du scénario", key="lib_name")
+        scen_tags = st.text_input("Tags (séparés par des virgules)", key="lib_tags")
+        if st.button("💾 Enregistrer le scénario", use_container_width=True, disabled=not scen_name.strip()):
+            save_scenario(scen_name.strip(), [t for t in scen_tags.split(",") if t.strip()])
+            st.toast(f"✅ Scénario '{scen_name.strip()}' enregistré", icon="📚")
+
+        st.markdown("**Rechercher**")
+        search_text = st.text_input("Nom contient", key="lib_search")
+        search_tag = st.selectbox("Tag", ["(tous)"] + library.tags(), key="lib_tag")
+        found = library.search(
+            text=search_text or None,
+            tag=None if search_tag == "(tous)" else search_tag,
+            limit=200,
+        )
+        if found:
+            chosen = st.selectbox(
+                "Scénarios",
+                [info.name for info in found],
+                format_func=lambda name: next(
+                    f"{i.name} (P{i.period}{', ' + ', '.join(i.tags) if i.tags else ''})"
+                    for i in found if i.name == name
+                ),
+                key="lib_choice",
+            )
+            if st.button("📥 Charger le scénario", use_container_width=True):
+                for k, v in scenario_session_values(chosen).items():
+                    st.session_state[k] = v
+                st.rerun()
+        else:
+            st.caption("Aucun scénario trouvé.")
+
     st.markdown("---")
 
     st.header("⚙️ Paramètres de Simulation")
@@ -236,14 +283,14 @@ st.markdown("---")
 # Initialize session state
 if "state" not in st.session_state:
     # First check if we have custom defaults saved
-    if Path(SAVE_FILE).exists() and st.query_params.get("reset") != "true":
+    if st.query_params.get("reset") != "true":
          try:
-            with open(SAVE_FILE, "r") as f:
-                loaded_state = json.load(f)
-            for k, v in loaded_state.items():
-                if k == "reset_btn": continue
-                st.session_state[k] = v
-         except:
+            from src.mirage.library import DEFAULT_SCENARIO
+
+            if DEFAULT_SCENARIO in get_library():
+                for k, v in scenario_session_values(DEFAULT_SCENARIO).items():
+                    st.session_state[k] = v
+         except Exception:
              pass
 
     if "state" not in st.session_state: # If still not present (or we just loaded params but not the complex object)
@@ -289,37 +336,35 @@ with st.sidebar:
     if uploaded_file is not None:
         try:
             content = uploaded_file.read().decode("utf-8")
-            parsed = parse_mirage_markdown(content)
-            new_state = extract_period_state(parsed)
+            _, new_state = parse_report_cached(content)
             st.session_state.state = new_state
             sync_widgets_with_state(new_state)
             st.success(f"✅ Fichier '{uploaded_file.name}' importé!")
         except Exception as e:
             st.error(f"Erreur lors de l'import: {e}")
 
-    # Load from existing files in workspace
-    workspace_path = Path(__file__).parent.parent
-    md_files = list(workspace_path.glob("Simulation*.md"))
+    # Load from existing files in workspace (parsed in the background by the watcher)
+    watcher = get_workspace_watcher()
+    md_files = watcher.names()
 
     if md_files:
         st.markdown("**Ou charger depuis le workspace:**")
-        file_options = ["-- Sélectionner --"] + [f.name for f in md_files]
+        file_options = ["-- Sélectionner --"] + md_files
         selected_file = st.selectbox("Fichier existant", file_options)
 
         if selected_file != "-- Sélectionner --":
-            if st.button("📥 Charger ce fichier"):
-                file_path = workspace_path / selected_file
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    parsed = parse_mirage_markdown(content)
-                    new_state = extract_period_state(parsed)
-                    st.session_state.state = new_state
-                    sync_widgets_with_state(new_state)
-                    st.success(f"✅ Données de '{selected_file}' chargées!")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Erreur: {e}")
+            entry = watcher.get(selected_file)
+            status = watcher.status(selected_file)
+            if status == "erreur":
+                st.error(f"Erreur: {entry.error}")
+            elif status == "en cours":
+                st.caption("⏳ Analyse du fichier en cours...")
+            if st.button("📥 Charger ce fichier", disabled=status != "prêt"):
+                new_state = copy.deepcopy(entry.state)
+                st.session_state.state = new_state
+                sync_widgets_with_state(new_state)
+                st.success(f"✅ Données de '{selected_file}' chargées!")
+                st.rerun()
 
     st.markdown("---")
 
@@ -363,31 +408,31 @@ with st.sidebar:
     st.subheader("✏️ Stocks Produits Finis (U)")
     col1, col2 = st.columns(2)
     with col1:
-        stock_a_ct = st.number_input("Stock A-CT", min_value=0, step=1000, key="s_a_ct")
-        stock_b_ct = st.number_input("Stock B-CT", min_value=0, step=1000, key="s_b_ct")
-        stock_c_ct = st.number_input("Stock C-CT", min_value=0, step=1000, key="s_c_ct")
+        st.number_input("Stock A-CT", min_value=0, step=1000, key="s_a_ct")
+        st.number_input("Stock B-CT", min_value=0, step=1000, key="s_b_ct")
+        st.number_input("Stock C-CT", min_value=0, step=1000, key="s_c_ct")
     with col2:
-        stock_a_gs = st.number_input("Stock A-GS", min_value=0, step=1000, key="s_a_gs")
-        stock_b_gs = st.number_input("Stock B-GS", min_value=0, step=1000, key="s_b_gs")
-        stock_c_gs = st.number_input("Stock C-GS", min_value=0, step=1000, key="s_c_gs")
+        st.number_input("Stock A-GS", min_value=0, step=1000, key="s_a_gs")
+        st.number_input("Stock B-GS", min_value=0, step=1000, key="s_b_gs")
+        st.number_input("Stock C-GS", min_value=0, step=1000, key="s_c_gs")
 
     st.subheader("📦 Stocks MP (unités)")
-    stock_mp_n = st.number_input("Stock MP N", min_value=0, step=10000, key="s_mp_n")
-    stock_mp_s = st.number_input("Stock MP S", min_value=0, step=10000, key="s_mp_s")
+    st.number_input("Stock MP N", min_value=0, step=10000, key="s_mp_n")
+    st.number_input("Stock MP S", min_value=0, step=10000, key="s_mp_s")
 
     st.subheader("👷 Effectifs & Équipements")
-    nb_ouvriers = st.number_input("Nb Ouvriers", min_value=0, step=10, key="s_ouvriers")
-    nb_machines_m1 = st.number_input("Nb Machines M1", min_value=0, step=1, key="s_m1")
-    nb_machines_m2 = st.number_input("Nb Machines M2", min_value=0, step=1, key="s_m2")
+    st.number_input("Nb Ouvriers", min_value=0, step=10, key="s_ouvriers")
+    st.number_input("Nb Machines M1", min_value=0, step=1, key="s_m1")
+    st.number_input("Nb Machines M2", min_value=0, step=1, key="s_m2")
 
     st.subheader("💰 Trésorerie & Dettes (K€)")
-    cash = st.number_input("Trésorerie", step=100.0, key="s_cash")
-    dette_lt = st.number_input("Dette LT", min_value=0.0, step=100.0, key="s_dlt")
-    dette_ct = st.number_input("Dette CT", min_value=0.0, step=100.0, key="s_dct")
+    st.number_input("Trésorerie", step=100.0, key="s_cash")
+    st.number_input("Dette LT", min_value=0.0, step=100.0, key="s_dlt")
+    st.number_input("Dette CT", min_value=0.0, step=100.0, key="s_dct")
 
     st.subheader("📈 Indices")
-    indice_prix = st.number_input("Indice Prix", step=0.1, key="s_ip")
-    indice_salaire = st.number_input("Indice Salaire", step=0.1, key="s_is")
+    st.number_input("Indice Prix", step=0.1, key="s_ip")
+    st.number_input("Indice Salaire", step=0.1, key="s_is")
 
     st.markdown("---")
     
@@ -407,25 +452,8 @@ with st.sidebar:
 # Or use session_state access.
 current_period = st.session_state.get("period_selector_val", 1)
 
-state = PeriodState(
-    period_num=current_period,
-    stock_a_ct=stock_a_ct,
-    stock_a_gs=stock_a_gs,
-    stock_b_ct=stock_b_ct,
-    stock_b_gs=stock_b_gs,
-    stock_c_ct=stock_c_ct,
-    stock_c_gs=stock_c_gs,
-    stock_mp_n=stock_mp_n,
-    stock_mp_s=stock_mp_s,
-    nb_ouvriers=nb_ouvriers,
-    nb_machines_m1=nb_machines_m1,
-    nb_machines_m2=nb_machines_m2,
-    cash=cash,
-    dette_lt=dette_lt,
-    dette_ct=dette_ct,
-    indice_prix=indice_prix,
-    indice_salaire=indice_salaire,
-)
+state = STATE_BINDINGS.build(st.session_state)
+state.period_num = current_period
 
 
 # =====================================================
@@ -449,506 +477,783 @@ def decision_row(label, widget_type="number", **kwargs):
         elif widget_type == "text":
             return st.text_input(label, label_visibility="collapsed", **kwargs)
 
-# Tabs: Inputs vs Results
-tabs = st.tabs(["📝 Saisie des Décisions", "📊 Résultats & Analyse"])
-
 # =====================================================
-# TAB 1: SAISIE DES DÉCISIONS (Table Unique)
+# FRAGMENT - Décisions & Résultats
 # =====================================================
-with tabs[0]:
-    # Selecteur de période déplacé en haut
-    
-    st.header("Tableau de Bord des Décisions")
-    
-    # Button to reset all products to zero
-    if st.button("🔄 Remettre tous les produits à zéro", key="reset_btn"):
-        st.session_state.reset_products = True
-        st.rerun()
-
-    reset_products = st.session_state.get("reset_products", False)
-    if reset_products:
-        st.session_state.reset_products = False
-
-    # Header de la "Table"
-    st.markdown("---")
-    h1, h2 = st.columns([3, 2])
-    h1.markdown("#### Libellé des Décisions")
-    h2.markdown("#### Décision P. 1")
-    st.markdown("---")
-
-    # --- PRODUIT A ---
-    st.subheader("PRODUIT A")
-    # A-CT
-    a_ct_prix = decision_row("011-A CT Prix Tarif (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 20.60, step=0.10, key="a_ct_prix")
-    a_ct_promo = decision_row("012- Promotion (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 0.30, step=0.05, key="a_ct_promo")
-    a_ct_prod = decision_row("013- Production (KU)", "number", min_value=0, value=0 if reset_products else 420, step=10, key="a_ct_prod")
-    a_ct_qual = decision_row("014- Qualité Produite (%)", "number", min_value=0, max_value=100, value=100, step=5, key="a_ct_qual")
-    a_ct_emb = decision_row("015- Emballages Recyclés (O/N)", "checkbox", value=False, key="a_ct_emb")
-    with st.expander("Contrats A-CT"):
-        a_ct_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="a_ct_vc")
-        a_ct_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="a_ct_ac")
-    
-    # A-GS
-    st.markdown("**Produit A - Grande Surface**")
-    a_gs_prix = decision_row("021-A GS Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="a_gs_prix")
-    a_gs_rist = decision_row("022- Ristourne (%)", "number", min_value=0.0, max_value=20.0, value=0.0, step=0.5, key="a_gs_rist")
-    a_gs_promo = decision_row("023- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="a_gs_promo")
-    a_gs_prod = decision_row("024- Production (KU)", "number", min_value=0, value=0, step=10, key="a_gs_prod")
-    a_gs_qual = decision_row("025- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="a_gs_qual")
-    a_gs_emb = decision_row("026- Emballages Recyclés (O/N)", "checkbox", value=False, key="a_gs_emb")
-    with st.expander("Contrats A-GS"):
-        a_gs_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="a_gs_vc")
-        a_gs_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="a_gs_ac")
-    
-    net_a_container = st.empty()
-    
-    st.markdown("---")
-
-    # --- PRODUIT B ---
-    st.subheader("PRODUIT B")
-    # B-CT
-    b_ct_prix = decision_row("031-B CT Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="b_ct_prix")
-    b_ct_promo = decision_row("032- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="b_ct_promo")
-    b_ct_prod = decision_row("033- Production (KU)", "number", min_value=0, value=0, step=10, key="b_ct_prod")
-    b_ct_qual = decision_row("034- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="b_ct_qual")
-    b_ct_emb = decision_row("035- Emballages Recyclés (O/N)", "checkbox", value=False, key="b_ct_emb")
-    with st.expander("Contrats B-CT"):
-        b_ct_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="b_ct_vc")
-        b_ct_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="b_ct_ac")
-
-    # B-GS
-    st.markdown("**Produit B - Grande Surface**")
-    b_gs_prix = decision_row("041-B GS Prix Tarif (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 22.40, step=0.10, key="b_gs_prix")
-    b_gs_rist = decision_row("042- Ristourne (%)", "number", min_value=0.0, max_value=20.0, value=0.0 if reset_products else 7.0, step=0.5, key="b_gs_rist")
-    b_gs_promo = decision_row("043- Promotion (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 0.80, step=0.05, key="b_gs_promo")
-    b_gs_prod = decision_row("044- Production (KU)", "number", min_value=0, value=0 if reset_products else 120, step=10, key="b_gs_prod")
-    b_gs_qual = decision_row("045- Qualité Produite (%)", "number", min_value=0, max_value=100, value=50, step=5, key="b_gs_qual")
-    b_gs_emb = decision_row("046- Emballages Recyclés (O/N)", "checkbox", value=False, key="b_gs_emb")
-    with st.expander("Contrats B-GS"):
-        b_gs_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="b_gs_vc")
-        b_gs_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="b_gs_ac")
-    
-    net_b_container = st.empty()
-
-    st.markdown("---")
-
-    # --- PRODUIT C ---
-    st.subheader("PRODUIT C")
-    # C-CT
-    c_ct_prix = decision_row("051-C CT Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="c_ct_prix")
-    c_ct_promo = decision_row("052- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="c_ct_promo")
-    c_ct_prod = decision_row("053- Production (KU)", "number", min_value=0, value=0, step=10, key="c_ct_prod")
-    c_ct_qual = decision_row("054- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="c_ct_qual")
-    c_ct_emb = decision_row("055- Emballages Recyclés (O/N)", "checkbox", value=False, key="c_ct_emb")
-    with st.expander("Contrats C-CT"):
-        c_ct_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="c_ct_vc")
-        c_ct_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="c_ct_ac")
-
-    # C-GS
-    st.markdown("**Produit C - Grande Surface**")
-    c_gs_prix = decision_row("061-C GS Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="c_gs_prix")
-    c_gs_rist = decision_row("062- Ristourne (%)", "number", min_value=0.0, max_value=20.0, value=0.0, step=0.5, key="c_gs_rist")
-    c_gs_promo = decision_row("063- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="c_gs_promo")
-    c_gs_prod = decision_row("064- Production (KU)", "number", min_value=0, value=0, step=10, key="c_gs_prod")
-    c_gs_qual = decision_row("065- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="c_gs_qual")
-    c_gs_emb = decision_row("066- Emballages Recyclés (O/N)", "checkbox", value=False, key="c_gs_emb")
-    with st.expander("Contrats C-GS"):
-        c_gs_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="c_gs_vc")
-        c_gs_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="c_gs_ac")
-    
-    net_c_container = st.empty()
-    st.markdown("---")
-
-    # --- MARKETING ---
-    st.subheader("MARKETING")
-    mkt_vendeurs_ct = decision_row("071- Nombre Vendeurs C.T.", "number", min_value=0, value=35, step=1, key="mkt_ven_ct")
-    mkt_commission = decision_row("072- Commission (% du C.A.)", "number", min_value=0.0, max_value=5.0, value=0.5, step=0.1, key="mkt_comm")
-    
-    # Callback pour forcer majuscules sur les études
-    def force_upper(key):
-        if key in st.session_state and st.session_state[key]:
-            st.session_state[key] = st.session_state[key].upper()
-
-    mkt_etudes_abcd = decision_row("073- Etudes Codées (A..D) ou N", "text", value="ABC", key="mkt_etu_ad", on_change=force_upper, args=("mkt_etu_ad",))
-    
-    mkt_etudes_efgh = decision_row("074- Etudes Codées (E..H) ou N", "text", value="N", key="mkt_etu_eh", on_change=force_upper, args=("mkt_etu_eh",))
-
-    mkt_vendeurs_gs = decision_row("075- Nombre Vendeurs G.S.", "number", min_value=0, value=12, step=1, key="mkt_ven_gs")
-    mkt_prime_gs = decision_row("076- Prime Trimest. (€/Vendeur)", "number", min_value=0.0, value=600.0, step=50.0, key="mkt_prime_gs")
-    
-    mkt_pub_ct = decision_row("078- Publicité C.T. (K€)", "number", min_value=0.0, value=400.0, step=50.0, key="mkt_pub_ct")
-    mkt_pub_gs = decision_row("079- Publicité G.S. (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="mkt_pub_gs")
+# Toute la chaîne "décisions -> calculate_all -> résultats" vit dans un fragment :
+# modifier un prix ou une production ne relance que ce fragment, pas la sidebar
+# (imports, sauvegardes, état initial). La seule dépendance externe est `state`,
+# passé explicitement : une modification de l'état initial relance toute la page.
+# La carte 2D et les études sont des fragments à part (onglet Résultats) : ils
+# lisent les décisions et prévisions courantes dans st.session_state et ne sont
+# pas relancés à chaque saisie.
+def get_history():
+    """Historique des modifications de la session (créé au premier appel)."""
+    if "history" not in st.session_state:
+        from src.mirage.history import EditHistory
+
+        st.session_state.history = EditHistory()
+    return st.session_state.history
+
+
+def restore_version(step: str):
+    """Callback Annuler / Rétablir : remet les widgets à la version visée."""
+    history = get_history()
+    before = history.current
+    version = history.undo() if step == "undo" else history.redo()
+    if version is None:
+        return
+    for key, value in history.widget_values(version).items():
+        st.session_state[key] = value
+    # L'état initial vit dans la sidebar, hors du fragment : il faut relancer toute la page
+    if version.state != before.state:
+        st.session_state.history_full_rerun = True
 
-    net_mkt_container = st.empty()
 
-    st.markdown("---")
+# --- ÉTUDES EN ARRIÈRE-PLAN ---
+@st.cache_resource
+def get_job_manager():
+    """Pool de calcul partagé : les études tournent hors du script et survivent aux reruns."""
+    from src.mirage.jobs import JobManager
 
-    # --- APPROVISIONNEMENTS ---
-    st.subheader("APPROVISIONNEMENTS")
-    app_mp_n = decision_row("080- Commandes MP N (KU/per)", "number", min_value=0, value=0, step=500, key="app_mp_n_val")
-    app_duree_n = decision_row("081- Durée contrat N (1-4)", "number", min_value=0, max_value=4, value=0, step=1, key="app_duree_n")
+    return JobManager(workers=2)
 
-    app_mp_s = decision_row("082- Commandes MP S (KU/per)", "number", min_value=0, value=0, step=500, key="app_mp_s_val")
-    app_duree_s = decision_row("083- Durée contrat S (1-4)", "number", min_value=0, max_value=4, value=0, step=1, key="app_duree_s")
-    
-    app_maintenance = decision_row("086- Maintenance (O/N)", "checkbox", value=True, key="app_maint")
-
-    # Info Prix MP expander
-    with st.expander("📋 Voir Grille de Prix MP"):
-        col_prix1, col_prix2 = st.columns(2)
-        with col_prix1:
-            st.markdown("**MP N**")
-            prix_n_df = pd.DataFrame({
-                "Durée": ["1 per", "2 per", "3 per", "4 per"],
-                "<1000": [1.235, 1.204, 1.173, 1.143],
-                "1000-1500": [1.204, 1.173, 1.143, 1.112],
-                ">3000": [1.081, 1.050, 1.019, 0.988], # Simplified for space
-            })
-            st.dataframe(prix_n_df, hide_index=True)
-        with col_prix2:
-            st.markdown("**MP S**")
-            st.caption("Voir onglet Résultats pour détails si besoin")
-
-    net_appro_container = st.empty()
-
-    st.markdown("---")
+@st.cache_resource
+def numeric_paths():
+    """Champs numériques proposés pour les études (décisions) et comme objectif (résultats)."""
+    from src.mirage.schema import DECISIONS_SCHEMA, RESULTS_SCHEMA
 
+    return (
+        [spec.path for spec in DECISIONS_SCHEMA if spec.type in (int, float)],
+        [spec.path for spec in RESULTS_SCHEMA if spec.type in (int, float)],
+    )
 
+# Taille maximale d'une étude lancée depuis l'app (~15 000 lignes/s par processus)
+MAX_STUDY_ROWS = 1_000_000
 
-    # --- PRODUCTION ---
-    st.subheader("PRODUCTION")
+def apply_decisions(decisions):
+    """Callback : remet les widgets de décision aux valeurs données."""
+    for key, value in DECISION_BINDINGS.widget_values(decisions).items():
+        st.session_state[key] = value
+    # Les widgets vivent dans le fragment de saisie : il faut relancer toute la page
+    st.session_state.decisions_applied = True
 
-    prod_m1_actives = decision_row("089- Machines M1 Actives", "number", min_value=0, value=min(17, nb_machines_m1) if nb_machines_m1 > 0 else 0, step=1, key="prod_m1")
-    prod_m2_actives = decision_row("090- Machines M2 Actives", "number", min_value=0, value=0, step=1, key="prod_m2")
+def rerun_if_applied():
+    """Relance toute la page après apply_decisions (appelé en tête des fragments d'analyse)."""
+    if st.session_state.pop("decisions_applied", False):
+        st.rerun()
 
-    prod_ventes_m1 = decision_row("091- Ventes Machines M1", "number", min_value=0, value=0, step=1, key="prod_v_m1")
-    prod_achats_m1 = decision_row("092- Achats Machines M1", "number", min_value=0, value=0, step=1, key="prod_a_m1")
-    prod_achats_m2 = decision_row("093- Achats Machines M2", "number", min_value=0, value=0, step=1, key="prod_a_m2")
+def render_job(manager, job):
+    """Une étude : progression, meilleur résultat, résultats partiels."""
+    st.markdown(f"**{job.label}** · {job.kind} · _{job.status}_")
+    st.progress(job.progress, text=f"{job.done}/{job.total} blocs")
+    if job.error:
+        st.error(job.error)
+    if not job.finished:
+        st.button("⏹️ Annuler", key=f"cancel_{job.id}", on_click=manager.cancel, args=(job.id,))
+    if job.best is not None:
+        st.caption(f"Meilleur résultat : {job.best['value']:,.0f}")
+        if "decisions" in job.best:
+            st.button("✅ Appliquer la meilleure décision", key=f"apply_{job.id}",
+                      on_click=apply_decisions, args=(job.best["decisions"],))
+    if job.directory is not None and job.done:
+        from src.mirage.sink import read_results  # pandas/NumPy : seulement quand une étude s'affiche
 
-    prod_emb_deb = decision_row("094- Emb/Deb. Ouvriers", "number", value=0, step=10, key="prod_emb")
-    prod_var_pa = decision_row("095- Variat. Pouvoir Achat (%)", "number", value=2.0, step=0.5, key="prod_vpa")
-    
-    # Info Capacité
-    capacite_m1 = prod_m1_actives * C.M1_CAPACITY_A
-    capacite_m2 = prod_m2_actives * C.M2_CAPACITY_A
-    capacite_totale = capacite_m1 + capacite_m2
-    ouvriers_apres = nb_ouvriers + prod_emb_deb
-    ouvriers_necessaires = prod_m1_actives * C.WORKERS_PER_M1 + prod_m2_actives * C.WORKERS_PER_M2
-    
-    if ouvriers_apres < ouvriers_necessaires:
-        st.error(f"⚠️ **Attention**: Manque {ouvriers_necessaires - ouvriers_apres} ouvriers pour faire tourner les machines!")
+        try:
+            partial = read_results(job.directory)
+        except Exception as e:
+            st.caption(f"Résultats partiels illisibles : {e}")
+            return
+        if len(partial) and job.objective in partial.columns:
+            st.caption(f"{len(partial):,} lignes · {job.objective} : "
+                       f"moyenne {partial[job.objective].mean():,.0f}, "
+                       f"min {partial[job.objective].min():,.0f}, max {partial[job.objective].max():,.0f}")
+            top = partial.nlargest(20, job.objective)
+            st.dataframe(top[[c for c in top.columns if c in job.columns or c == job.objective]],
+                         hide_index=True, use_container_width=True)
+
+@st.fragment(run_every="2s")
+def live_jobs_panel():
+    """Liste des études rafraîchie toutes les 2 s tant que l'une tourne."""
+    rerun_if_applied()
+    jobs_panel()
+
+def jobs_panel():
+    manager = get_job_manager()
+    jobs = manager.jobs()
+    if not jobs:
+        st.caption("Aucune étude lancée.")
+        return
+    for job in jobs:
+        with st.container(border=True):
+            render_job(manager, job)
+    if any(job.finished for job in jobs):
+        st.button("🧹 Effacer les études terminées", on_click=manager.clear_finished)
+
+@st.fragment
+def background_studies(state: PeriodState):
+    """Formulaire de lancement d'études (Monte Carlo / grille) autour des décisions courantes."""
+    rerun_if_applied()
+    sweep_paths, objective_paths = numeric_paths()
+    decisions = st.session_state.current_decisions
+    forecasts = st.session_state.get("forecasts")
+    st.header("🧪 Études en arrière-plan")
+    manager = get_job_manager()
+    with st.form("sweep_form"):
+        mode = st.radio("Type d'étude", ["Monte Carlo", "Grille"], horizontal=True)
+        paths = st.multiselect(
+            "Décisions à faire varier",
+            sweep_paths,
+            default=["produit_a_ct.prix_tarif"],
+            format_func=field_label,
+        )
+        spread = st.slider("Amplitude autour de la valeur actuelle (%)", 5, 100, 20, step=5)
+        col_n, col_pts, col_obj = st.columns(3)
+        samples = col_n.number_input("Tirages (Monte Carlo)", min_value=2, max_value=MAX_STUDY_ROWS,
+                                     value=5000, step=100)
+        points = col_pts.number_input("Points par axe (grille)", min_value=2, max_value=1000,
+                                      value=10, step=1,
+                                      help="La grille compte points^(nombre de décisions) lignes")
+        objective = col_obj.selectbox("Objectif à maximiser", objective_paths,
+                                      index=objective_paths.index("resultat_net"))
+        submitted = st.form_submit_button("🚀 Lancer l'étude")
+    if submitted and paths:
+        from src.mirage.sweep import SweepSpec, axis_values, ranges_around
+
+        ranges = ranges_around(decisions, paths, spread / 100.0)
+        if mode == "Grille":
+            axes = {p: axis_values(p, lo, hi, int(points)) for p, (lo, hi) in ranges.items()}
+            spec = SweepSpec(base=decisions, state=state, axes=axes, forecasts=forecasts, objective=objective)
+        else:
+            spec = SweepSpec(base=decisions, state=state, ranges=ranges, samples=int(samples),
+                             forecasts=forecasts, objective=objective)
+        if spec.total_rows > MAX_STUDY_ROWS:
+            st.error(f"Étude trop grande : {spec.total_rows:,} lignes (max {MAX_STUDY_ROWS:,}). "
+                     "Réduire les points par axe ou le nombre de décisions.")
+        else:
+            manager.submit_sweep(spec, label=f"{mode} · {', '.join(paths)} · {spec.total_rows:,} lignes")
+
+    if manager.running():
+        live_jobs_panel()
     else:
-        st.caption(f"ℹ️ Capacité Totale: {capacite_totale:,.0f} U | Ouvriers dispo: {ouvriers_apres}")
-
-    # --- NOUVEAU: Pré-calcul des besoins en MP pour aider à la saisie ---
-    st.markdown("**Besoins en Matières Premières (Estimés)**")
-    # On utilise les résultats du calcul anticipé qui sont disponibles via sim_results
-    # MAIS attention sim_results n'est calculé que tout en bas du script, donc pas encore dispo ici dans le flux d'affichage standard...
-    # SAUF si on fait un pre-calcul léger ici ou si on utilise les placeholders.
-    # Pour faire simple et robuste : on calcule les besoins théoriques MP ici basés sur les inputs actuels
-    
-    # Recalcul rapide des besoins (logique dupliquée de calculator malheureusement, ou on attend le recalcul complet)
-    # Pour être "automatique", on peut proposer un bouton ou juste afficher l'info calculation
-    
-    # Récupération des décisions de prod saisies plus haut
-    prod_a_tot = (a_ct_prod + a_gs_prod) * 1000
-    prod_b_tot = (b_ct_prod + b_gs_prod) * 1000
-    prod_c_tot = (c_ct_prod + c_gs_prod) * 1000
-
-    def get_mp_needs_local(prod_u, units_per_prod, qual):
-        n_needed = prod_u * units_per_prod * (qual / 100.0)
-        s_needed = prod_u * units_per_prod * ((100.0 - qual) / 100.0)
-        return n_needed, s_needed
-
-    need_n_a, need_s_a = get_mp_needs_local(a_ct_prod*1000, C.UNITS_MP_PER_UNIT_A, a_ct_qual)
-    need_n_a_gs, need_s_a_gs = get_mp_needs_local(a_gs_prod*1000, C.UNITS_MP_PER_UNIT_A, a_gs_qual)
-    need_n_b, need_s_b = get_mp_needs_local(b_ct_prod*1000, C.UNITS_MP_PER_UNIT_B, b_ct_qual)
-    need_n_b_gs, need_s_b_gs = get_mp_needs_local(b_gs_prod*1000, C.UNITS_MP_PER_UNIT_B, b_gs_qual)
-    need_n_c, need_s_c = get_mp_needs_local(c_ct_prod*1000, C.UNITS_MP_PER_UNIT_C, c_ct_qual)
-    need_n_c_gs, need_s_c_gs = get_mp_needs_local(c_gs_prod*1000, C.UNITS_MP_PER_UNIT_C, c_gs_qual)
-
-    total_need_n = need_n_a + need_n_a_gs + need_n_b + need_n_b_gs + need_n_c + need_n_c_gs
-    total_need_s = need_s_a + need_s_a_gs + need_s_b + need_s_b_gs + need_s_c + need_s_c_gs
-
-    col_mp_info1, col_mp_info2 = st.columns(2)
-    with col_mp_info1:
-        st.info(f"Besoin TOTAL MP N : **{total_need_n:,.0f}** U")
-        st.caption(f"Stock N dispo : {stock_mp_n:,.0f} U")
-        manque_n = max(0, total_need_n - stock_mp_n)
-        if manque_n > 0:
-            st.warning(f"⚠️ Il manque **{manque_n:,.0f}** MP N")
-
-    with col_mp_info2:
-        st.info(f"Besoin TOTAL MP S : **{total_need_s:,.0f}** U")
-        st.caption(f"Stock S dispo : {stock_mp_s:,.0f} U")
-        manque_s = max(0, total_need_s - stock_mp_s)
-        if manque_s > 0:
-            st.warning(f"⚠️ Il manque **{manque_s:,.0f}** MP S")
-            if st.button("🛒 Ajuster Commande S", key="auto_app_s"):
-                missing_ku = manque_s / 1000.0
-                st.session_state["app_mp_s_val"] = float(int(missing_ku) + 1)
-                st.rerun()
+        jobs_panel()
+
+
+# --- CARTE DE DÉCISION 2D ---
+HEATMAP_PRESETS = {
+    "Prix × production (A-CT)": ("produit_a_ct.prix_tarif", "produit_a_ct.production"),
+    "Machines M1 × embauches": ("production.machines_m1_actives", "production.emb_deb_ouvriers"),
+    "Personnalisé": None,
+}
+
+@st.cache_resource
+def get_surface_pool():
+    """Processus gardés au chaud pour les cartes 2D (aucun sur une machine mono-cœur)."""
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None, 1
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers), workers
+
+def field_label(path: str) -> str:
+    from src.mirage.schema import DECISIONS_SCHEMA
+
+    unit = DECISIONS_SCHEMA[path].unit
+    return f"{path} ({unit})" if unit else path
+
+@st.fragment
+def decision_heatmap(state: PeriodState):
+    """Carte 2D : un résultat évalué sur toute une grille de deux décisions."""
+    from src.mirage.schema import DECISIONS_SCHEMA
+    from src.mirage.surface import SURFACE_OBJECTIVES, axis_range, evaluate_surface
+    from src.mirage.sweep import axis_values
+
+    rerun_if_applied()
+    sweep_paths = numeric_paths()[0]
+    decisions = st.session_state.current_decisions
+    forecasts = st.session_state.get("forecasts")
+    st.header("🗺️ Carte de décision 2D")
+    preset = st.selectbox("Couple de décisions", list(HEATMAP_PRESETS), key="hm_preset")
+    if HEATMAP_PRESETS[preset] is None:
+        col_x, col_y = st.columns(2)
+        x_path = col_x.selectbox("Axe horizontal", sweep_paths, key="hm_x", format_func=field_label,
+                                 index=sweep_paths.index("produit_a_ct.prix_tarif"))
+        y_path = col_y.selectbox("Axe vertical", sweep_paths, key="hm_y", format_func=field_label,
+                                 index=sweep_paths.index("produit_a_ct.production"))
+    else:
+        x_path, y_path = HEATMAP_PRESETS[preset]
+    if x_path == y_path:
+        st.warning("Choisir deux décisions différentes.")
+        return
 
-    net_prod_container = st.empty()
-    net_rse_container = st.empty()
+    bounds = {}
+    for path, col in zip((x_path, y_path), st.columns(2)):
+        # Bornes par défaut fixées à la première apparition de l'axe, puis laissées à l'utilisateur
+        if f"hm_lo_{path}" not in st.session_state:
+            low, high = axis_range(decisions, state, path)
+            st.session_state[f"hm_lo_{path}"], st.session_state[f"hm_hi_{path}"] = float(low), float(high)
+        step = 1.0 if DECISIONS_SCHEMA[path].type is int else 0.1
+        lo = col.number_input(f"{field_label(path)} min", step=step, key=f"hm_lo_{path}")
+        hi = col.number_input(f"{field_label(path)} max", step=step, key=f"hm_hi_{path}")
+        bounds[path] = (min(lo, hi), max(lo, hi))
+
+    col_n, col_obj = st.columns(2)
+    points = col_n.slider("Points par axe", 20, 200, 100, step=10, key="hm_points")
+    objective = col_obj.radio("Surface", SURFACE_OBJECTIVES, horizontal=True, key="hm_objective")
+    overlays = st.multiselect("Contraintes affichées", ["Manque d'ouvriers", "Manque de MP", "Alertes"],
+                              default=["Manque d'ouvriers", "Manque de MP"], key="hm_overlays")
+
+    key = (repr(decisions), repr(state), x_path, y_path, bounds[x_path], bounds[y_path], points,
+           tuple(sorted((forecasts or {}).items())))
+    if st.button("🗺️ Calculer la carte", key="hm_run"):
+        pool, workers = get_surface_pool()
+        with st.spinner("Évaluation de la grille..."):
+            st.session_state.heatmap = (key, evaluate_surface(
+                decisions, state,
+                x_path, axis_values(x_path, *bounds[x_path], points),
+                y_path, axis_values(y_path, *bounds[y_path], points),
+                forecasts=forecasts, pool=pool, workers=workers,
+            ))
+        if pool is not None and st.session_state.heatmap[1].workers == 1:
+            # Pool inutilisable : calcul fait dans ce processus, un nouveau pool au prochain calcul
+            pool.shutdown(wait=False, cancel_futures=True)
+            get_surface_pool.clear()
+            st.caption("Processus de calcul indisponibles : carte calculée sans parallélisme.")
+
+    if "heatmap" not in st.session_state:
+        return
+    computed_key, surface = st.session_state.heatmap
+    if (surface.x_path, surface.y_path) != (x_path, y_path):
+        return
+    if computed_key != key:
+        st.caption("Paramètres ou décisions modifiés depuis le calcul : relancer pour mettre à jour.")
+
+    import plotly.graph_objects as go  # plotly : seulement quand une carte s'affiche
+
+    z = surface[objective]
+    fig = go.Figure(go.Heatmap(
+        z=z, x=surface.x, y=surface.y, colorscale="RdYlGn", zmid=0,
+        colorbar={"title": "K€"},
+        hovertemplate=f"{x_path}=%{{x}}<br>{y_path}=%{{y}}<br>{objective}=%{{z:,.0f}}<extra></extra>",
+    ))
+    masks = {
+        "Manque d'ouvriers": (surface.workers_short, "#1f3b73", "solid"),
+        "Manque de MP": (surface.mp_short, "#6a1b9a", "dash"),
+        "Alertes": (surface["alertes"] > 0, "#000000", "dot"),
+    }
+    for name in overlays:
+        mask, color, dash = masks[name]
+        if mask.any() and not mask.all():
+            fig.add_trace(go.Contour(
+                z=mask.astype(float), x=surface.x, y=surface.y, name=name, showscale=False,
+                contours={"start": 0.5, "end": 0.5, "coloring": "none"},
+                line={"color": color, "width": 2, "dash": dash}, hoverinfo="skip", showlegend=True,
+            ))
+    fig.add_trace(go.Scatter(
+        x=[DECISIONS_SCHEMA[x_path].get(decisions)], y=[DECISIONS_SCHEMA[y_path].get(decisions)],
+        mode="markers", name="Décision actuelle", marker={"symbol": "x", "size": 12, "color": "black"},
+    ))
+    best = surface.best(objective, feasible_only=True)
+    if best is not None:
+        fig.add_trace(go.Scatter(x=[best["x"]], y=[best["y"]], mode="markers", name="Meilleur réalisable",
+                                 marker={"symbol": "star", "size": 14, "color": "white",
+                                         "line": {"color": "black", "width": 1}}))
+    fig.update_layout(xaxis_title=field_label(x_path), yaxis_title=field_label(y_path),
+                      legend={"orientation": "h", "y": -0.2}, height=550)
+    st.plotly_chart(fig, use_container_width=True)
+
+    rows, cols = surface.shape
+    st.caption(f"{rows * cols:,} points évalués en {surface.seconds:.2f} s · "
+               f"{surface.feasible.mean():.0%} réalisables (ouvriers et MP)")
+    if best is not None:
+        st.caption(f"Meilleur point réalisable : {x_path} = {best['x']:g}, {y_path} = {best['y']:g} "
+                   f"→ {objective} = {best['value']:,.0f} K€")
+        target = DECISIONS_SCHEMA.from_flat({
+            x_path: DECISIONS_SCHEMA[x_path].type(best["x"]),
+            y_path: DECISIONS_SCHEMA[y_path].type(best["y"]),
+        }, base=decisions)
+        st.button("✅ Appliquer ce point", key="hm_apply", on_click=apply_decisions, args=(target,))
+    else:
+        st.caption("Aucun point réalisable sur cette grille.")
 
-    st.markdown("---")
 
-    # --- RSE ---
-    st.subheader("RSE (RESPONSABILITÉ SOCIÉTALE)")
-    rse_recyclage = decision_row("087- Budget Recyclage (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="rse_cyc")
-    rse_amenagements = decision_row("088- Aménagements adaptés (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="rse_amen")
-    rse_rd = decision_row("096- Recherche et Dévelop. (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="rse_rd")
+@st.fragment
+def decision_workspace(state: PeriodState):
+    """Onglet de saisie : décisions, calcul anticipé et résultats pour l'état initial donné."""
+    nb_machines_m1 = state.nb_machines_m1
+    nb_ouvriers = state.nb_ouvriers
+    stock_mp_n = state.stock_mp_n
+    stock_mp_s = state.stock_mp_s
 
-    net_rse_container = st.empty()
+    with st.container():
+        # Selecteur de période déplacé en haut
 
-    st.markdown("---")
+        st.header("Tableau de Bord des Décisions")
 
-    # --- FINANCES ---
-    st.subheader("FINANCES")
-    
-    fin_emprunt_lt = decision_row("097- Emprunt Long Terme (K€)", "number", min_value=0.0, value=0.0, step=100.0, key="fin_elt")
-    fin_duree_lt = decision_row("098- Nb de Trimestres (2-8)", "number", min_value=0, max_value=8, value=0, step=1, key="fin_dlt")
-    
-    fin_effort_social = decision_row("101- Effort Social (%)", "number", min_value=0.0, max_value=10.0, value=0.0, step=0.5, key="fin_soc")
-    fin_emprunt_ct = decision_row("102- Emprunt Court Terme (K€)", "number", min_value=0.0, value=0.0, step=100.0, key="fin_ect")
-    fin_effets = decision_row("103- Effets escomptés (K€)", "number", min_value=0.0, value=0.0, step=100.0, key="fin_eff")
-    fin_escompte = decision_row("104- Escompte Paiement Cpt (%)", "number", min_value=0.0, max_value=10.0, value=7.5, step=0.5, key="fin_esc")
-    fin_dividendes = decision_row("105- Dividendes (K€)", "number", min_value=0.0, value=200.0, step=50.0, key="fin_div")
-    fin_rembt = decision_row("106- Rembt. dernier emprunt", "checkbox", value=False, key="fin_rem")
-    
-    fin_actions_new = decision_row("107- Nb actions nouvelles (KU)", "number", min_value=0, value=0, step=10, key="fin_act")
-    fin_prix_emission = decision_row("108- Prix d'emission (€)", "number", min_value=0.0, value=0.0, step=1.0, key="fin_pax")
+        if st.session_state.pop("history_full_rerun", False):
+            st.rerun()
 
-    net_finance_container = st.empty()
+        # Historique Annuler / Rétablir
+        history = get_history()
+        col_undo, col_redo, col_hist = st.columns([1, 1, 4])
+        col_undo.button("↩️ Annuler", key="undo_btn", disabled=not history.can_undo,
+                        on_click=restore_version, args=("undo",), use_container_width=True)
+        col_redo.button("↪️ Rétablir", key="redo_btn", disabled=not history.can_redo,
+                        on_click=restore_version, args=("redo",), use_container_width=True)
+        if history.current is not None:
+            col_hist.caption(f"Version {history.cursor + 1}/{len(history)} · {history.describe(history.current)}")
+
+        # Button to reset all products to zero
+        if st.button("🔄 Remettre tous les produits à zéro", key="reset_btn"):
+            st.session_state.reset_products = True
+            st.rerun(scope="fragment")
+
+        reset_products = st.session_state.get("reset_products", False)
+        if reset_products:
+            st.session_state.reset_products = False
+
+        # Header de la "Table"
+        st.markdown("---")
+        h1, h2 = st.columns([3, 2])
+        h1.markdown("#### Libellé des Décisions")
+        h2.markdown("#### Décision P. 1")
+        st.markdown("---")
+
+        # --- PRODUIT A ---
+        st.subheader("PRODUIT A")
+        # A-CT
+        decision_row("011-A CT Prix Tarif (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 20.60, step=0.10, key="a_ct_prix")
+        decision_row("012- Promotion (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 0.30, step=0.05, key="a_ct_promo")
+        a_ct_prod = decision_row("013- Production (KU)", "number", min_value=0, value=0 if reset_products else 420, step=10, key="a_ct_prod")
+        a_ct_qual = decision_row("014- Qualité Produite (%)", "number", min_value=0, max_value=100, value=100, step=5, key="a_ct_qual")
+        decision_row("015- Emballages Recyclés (O/N)", "checkbox", value=False, key="a_ct_emb")
+        with st.expander("Contrats A-CT"):
+            a_ct_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="a_ct_vc")
+            a_ct_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="a_ct_ac")
+
+        # A-GS
+        st.markdown("**Produit A - Grande Surface**")
+        decision_row("021-A GS Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="a_gs_prix")
+        decision_row("022- Ristourne (%)", "number", min_value=0.0, max_value=20.0, value=0.0, step=0.5, key="a_gs_rist")
+        decision_row("023- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="a_gs_promo")
+        a_gs_prod = decision_row("024- Production (KU)", "number", min_value=0, value=0, step=10, key="a_gs_prod")
+        a_gs_qual = decision_row("025- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="a_gs_qual")
+        decision_row("026- Emballages Recyclés (O/N)", "checkbox", value=False, key="a_gs_emb")
+        with st.expander("Contrats A-GS"):
+            a_gs_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="a_gs_vc")
+            a_gs_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="a_gs_ac")
+
+        net_a_container = st.empty()
+
+        st.markdown("---")
+
+        # --- PRODUIT B ---
+        st.subheader("PRODUIT B")
+        # B-CT
+        decision_row("031-B CT Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="b_ct_prix")
+        decision_row("032- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="b_ct_promo")
+        b_ct_prod = decision_row("033- Production (KU)", "number", min_value=0, value=0, step=10, key="b_ct_prod")
+        b_ct_qual = decision_row("034- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="b_ct_qual")
+        decision_row("035- Emballages Recyclés (O/N)", "checkbox", value=False, key="b_ct_emb")
+        with st.expander("Contrats B-CT"):
+            b_ct_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="b_ct_vc")
+            b_ct_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="b_ct_ac")
+
+        # B-GS
+        st.markdown("**Produit B - Grande Surface**")
+        decision_row("041-B GS Prix Tarif (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 22.40, step=0.10, key="b_gs_prix")
+        decision_row("042- Ristourne (%)", "number", min_value=0.0, max_value=20.0, value=0.0 if reset_products else 7.0, step=0.5, key="b_gs_rist")
+        decision_row("043- Promotion (€/U)", "number", min_value=0.0, value=0.0 if reset_products else 0.80, step=0.05, key="b_gs_promo")
+        b_gs_prod = decision_row("044- Production (KU)", "number", min_value=0, value=0 if reset_products else 120, step=10, key="b_gs_prod")
+        b_gs_qual = decision_row("045- Qualité Produite (%)", "number", min_value=0, max_value=100, value=50, step=5, key="b_gs_qual")
+        decision_row("046- Emballages Recyclés (O/N)", "checkbox", value=False, key="b_gs_emb")
+        with st.expander("Contrats B-GS"):
+            b_gs_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="b_gs_vc")
+            b_gs_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="b_gs_ac")
+
+        net_b_container = st.empty()
+
+        st.markdown("---")
+
+        # --- PRODUIT C ---
+        st.subheader("PRODUIT C")
+        # C-CT
+        decision_row("051-C CT Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="c_ct_prix")
+        decision_row("052- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="c_ct_promo")
+        c_ct_prod = decision_row("053- Production (KU)", "number", min_value=0, value=0, step=10, key="c_ct_prod")
+        c_ct_qual = decision_row("054- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="c_ct_qual")
+        decision_row("055- Emballages Recyclés (O/N)", "checkbox", value=False, key="c_ct_emb")
+        with st.expander("Contrats C-CT"):
+            c_ct_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="c_ct_vc")
+            c_ct_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="c_ct_ac")
+
+        # C-GS
+        st.markdown("**Produit C - Grande Surface**")
+        decision_row("061-C GS Prix Tarif (€/U)", "number", min_value=0.0, value=0.0, step=0.10, key="c_gs_prix")
+        decision_row("062- Ristourne (%)", "number", min_value=0.0, max_value=20.0, value=0.0, step=0.5, key="c_gs_rist")
+        decision_row("063- Promotion (€/U)", "number", min_value=0.0, value=0.0, step=0.05, key="c_gs_promo")
+        c_gs_prod = decision_row("064- Production (KU)", "number", min_value=0, value=0, step=10, key="c_gs_prod")
+        c_gs_qual = decision_row("065- Qualité Produite (%)", "number", min_value=0, max_value=100, value=0, step=5, key="c_gs_qual")
+        decision_row("066- Emballages Recyclés (O/N)", "checkbox", value=False, key="c_gs_emb")
+        with st.expander("Contrats C-GS"):
+            c_gs_v_contrat = decision_row("Ventes Contrat (U)", "number", min_value=0, value=0, step=100, key="c_gs_vc")
+            c_gs_a_contrat = decision_row("Achats Contrat (U)", "number", min_value=0, value=0, step=100, key="c_gs_ac")
+
+        net_c_container = st.empty()
+        st.markdown("---")
+
+        # --- MARKETING ---
+        st.subheader("MARKETING")
+        decision_row("071- Nombre Vendeurs C.T.", "number", min_value=0, value=35, step=1, key="mkt_ven_ct")
+        decision_row("072- Commission (% du C.A.)", "number", min_value=0.0, max_value=5.0, value=0.5, step=0.1, key="mkt_comm")
+
+        # Callback pour forcer majuscules sur les études
+        def force_upper(key):
+            if key in st.session_state and st.session_state[key]:
+                st.session_state[key] = st.session_state[key].upper()
+
+        decision_row("073- Etudes Codées (A..D) ou N", "text", value="ABC", key="mkt_etu_ad", on_change=force_upper, args=("mkt_etu_ad",))
+
+        decision_row("074- Etudes Codées (E..H) ou N", "text", value="N", key="mkt_etu_eh", on_change=force_upper, args=("mkt_etu_eh",))
+
+        decision_row("075- Nombre Vendeurs G.S.", "number", min_value=0, value=12, step=1, key="mkt_ven_gs")
+        decision_row("076- Prime Trimest. (€/Vendeur)", "number", min_value=0.0, value=600.0, step=50.0, key="mkt_prime_gs")
+
+        decision_row("078- Publicité C.T. (K€)", "number", min_value=0.0, value=400.0, step=50.0, key="mkt_pub_ct")
+        decision_row("079- Publicité G.S. (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="mkt_pub_gs")
+
+        net_mkt_container = st.empty()
+
+        st.markdown("---")
+
+        # --- APPROVISIONNEMENTS ---
+        st.subheader("APPROVISIONNEMENTS")
+        decision_row("080- Commandes MP N (KU/per)", "number", min_value=0, value=0, step=500, key="app_mp_n_val")
+        decision_row("081- Durée contrat N (1-4)", "number", min_value=0, max_value=4, value=0, step=1, key="app_duree_n")
+
+        decision_row("082- Commandes MP S (KU/per)", "number", min_value=0, value=0, step=500, key="app_mp_s_val")
+        decision_row("083- Durée contrat S (1-4)", "number", min_value=0, max_value=4, value=0, step=1, key="app_duree_s")
+
+        decision_row("086- Maintenance (O/N)", "checkbox", value=True, key="app_maint")
+
+        # Info Prix MP expander
+        with st.expander("📋 Voir Grille de Prix MP"):
+            col_prix1, col_prix2 = st.columns(2)
+            with col_prix1:
+                st.markdown("**MP N**")
+                prix_n_df = {
+                    "Durée": ["1 per", "2 per", "3 per", "4 per"],
+                    "<1000": [1.235, 1.204, 1.173, 1.143],
+                    "1000-1500": [1.204, 1.173, 1.143, 1.112],
+                    ">3000": [1.081, 1.050, 1.019, 0.988], # Simplified for space
+                }
+                st.dataframe(prix_n_df, hide_index=True)
+            with col_prix2:
+                st.markdown("**MP S**")
+                st.caption("Voir onglet Résultats pour détails si besoin")
+
+        net_appro_container = st.empty()
+
+        st.markdown("---")
+
+
+
+        # --- PRODUCTION ---
+        st.subheader("PRODUCTION")
+
+        prod_m1_actives = decision_row("089- Machines M1 Actives", "number", min_value=0, value=min(17, nb_machines_m1) if nb_machines_m1 > 0 else 0, step=1, key="prod_m1")
+        prod_m2_actives = decision_row("090- Machines M2 Actives", "number", min_value=0, value=0, step=1, key="prod_m2")
+
+        decision_row("091- Ventes Machines M1", "number", min_value=0, value=0, step=1, key="prod_v_m1")
+        decision_row("092- Achats Machines M1", "number", min_value=0, value=0, step=1, key="prod_a_m1")
+        decision_row("093- Achats Machines M2", "number", min_value=0, value=0, step=1, key="prod_a_m2")
+
+        prod_emb_deb = decision_row("094- Emb/Deb. Ouvriers", "number", value=0, step=10, key="prod_emb")
+        decision_row("095- Variat. Pouvoir Achat (%)", "number", value=2.0, step=0.5, key="prod_vpa")
+
+        # Info Capacité
+        capacite_m1 = prod_m1_actives * C.M1_CAPACITY_A
+        capacite_m2 = prod_m2_actives * C.M2_CAPACITY_A
+        capacite_totale = capacite_m1 + capacite_m2
+        ouvriers_apres = nb_ouvriers + prod_emb_deb
+        ouvriers_necessaires = prod_m1_actives * C.WORKERS_PER_M1 + prod_m2_actives * C.WORKERS_PER_M2
+
+        if ouvriers_apres < ouvriers_necessaires:
+            st.error(f"⚠️ **Attention**: Manque {ouvriers_necessaires - ouvriers_apres} ouvriers pour faire tourner les machines!")
+        else:
+            st.caption(f"ℹ️ Capacité Totale: {capacite_totale:,.0f} U | Ouvriers dispo: {ouvriers_apres}")
+
+        # --- NOUVEAU: Pré-calcul des besoins en MP pour aider à la saisie ---
+        st.markdown("**Besoins en Matières Premières (Estimés)**")
+        # On utilise les résultats du calcul anticipé qui sont disponibles via sim_results
+        # MAIS attention sim_results n'est calculé que tout en bas du script, donc pas encore dispo ici dans le flux d'affichage standard...
+        # SAUF si on fait un pre-calcul léger ici ou si on utilise les placeholders.
+        # Pour faire simple et robuste : on calcule les besoins théoriques MP ici basés sur les inputs actuels
+
+        # Recalcul rapide des besoins (logique dupliquée de calculator malheureusement, ou on attend le recalcul complet)
+        # Pour être "automatique", on peut proposer un bouton ou juste afficher l'info calculation
+
+        # Récupération des décisions de prod saisies plus haut
+        prod_a_tot = (a_ct_prod + a_gs_prod) * 1000
+        prod_b_tot = (b_ct_prod + b_gs_prod) * 1000
+        prod_c_tot = (c_ct_prod + c_gs_prod) * 1000
+
+        def get_mp_needs_local(prod_u, units_per_prod, qual):
+            n_needed = prod_u * units_per_prod * (qual / 100.0)
+            s_needed = prod_u * units_per_prod * ((100.0 - qual) / 100.0)
+            return n_needed, s_needed
+
+        need_n_a, need_s_a = get_mp_needs_local(a_ct_prod*1000, C.UNITS_MP_PER_UNIT_A, a_ct_qual)
+        need_n_a_gs, need_s_a_gs = get_mp_needs_local(a_gs_prod*1000, C.UNITS_MP_PER_UNIT_A, a_gs_qual)
+        need_n_b, need_s_b = get_mp_needs_local(b_ct_prod*1000, C.UNITS_MP_PER_UNIT_B, b_ct_qual)
+        need_n_b_gs, need_s_b_gs = get_mp_needs_local(b_gs_prod*1000, C.UNITS_MP_PER_UNIT_B, b_gs_qual)
+        need_n_c, need_s_c = get_mp_needs_local(c_ct_prod*1000, C.UNITS_MP_PER_UNIT_C, c_ct_qual)
+        need_n_c_gs, need_s_c_gs = get_mp_needs_local(c_gs_prod*1000, C.UNITS_MP_PER_UNIT_C, c_gs_qual)
+
+        total_need_n = need_n_a + need_n_a_gs + need_n_b + need_n_b_gs + need_n_c + need_n_c_gs
+        total_need_s = need_s_a + need_s_a_gs + need_s_b + need_s_b_gs + need_s_c + need_s_c_gs
+
+        col_mp_info1, col_mp_info2 = st.columns(2)
+        with col_mp_info1:
+            st.info(f"Besoin TOTAL MP N : **{total_need_n:,.0f}** U")
+            st.caption(f"Stock N dispo : {stock_mp_n:,.0f} U")
+            manque_n = max(0, total_need_n - stock_mp_n)
+            if manque_n > 0:
+                st.warning(f"⚠️ Il manque **{manque_n:,.0f}** MP N")
+
+        with col_mp_info2:
+            st.info(f"Besoin TOTAL MP S : **{total_need_s:,.0f}** U")
+            st.caption(f"Stock S dispo : {stock_mp_s:,.0f} U")
+            manque_s = max(0, total_need_s - stock_mp_s)
+            if manque_s > 0:
+                st.warning(f"⚠️ Il manque **{manque_s:,.0f}** MP S")
+                if st.button("🛒 Ajuster Commande S", key="auto_app_s"):
+                    missing_ku = manque_s / 1000.0
+                    st.session_state["app_mp_s_val"] = float(int(missing_ku) + 1)
+                    st.rerun(scope="fragment")
+
+        net_prod_container = st.empty()
+        net_rse_container = st.empty()
+
+        st.markdown("---")
+
+        # --- RSE ---
+        st.subheader("RSE (RESPONSABILITÉ SOCIÉTALE)")
+        decision_row("087- Budget Recyclage (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="rse_cyc")
+        decision_row("088- Aménagements adaptés (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="rse_amen")
+        decision_row("096- Recherche et Dévelop. (K€)", "number", min_value=0.0, value=0.0, step=50.0, key="rse_rd")
+
+        net_rse_container = st.empty()
+
+        st.markdown("---")
+
+        # --- FINANCES ---
+        st.subheader("FINANCES")
+
+        decision_row("097- Emprunt Long Terme (K€)", "number", min_value=0.0, value=0.0, step=100.0, key="fin_elt")
+        decision_row("098- Nb de Trimestres (2-8)", "number", min_value=0, max_value=8, value=0, step=1, key="fin_dlt")
+
+        decision_row("101- Effort Social (%)", "number", min_value=0.0, max_value=10.0, value=0.0, step=0.5, key="fin_soc")
+        decision_row("102- Emprunt Court Terme (K€)", "number", min_value=0.0, value=0.0, step=100.0, key="fin_ect")
+        decision_row("103- Effets escomptés (K€)", "number", min_value=0.0, value=0.0, step=100.0, key="fin_eff")
+        decision_row("104- Escompte Paiement Cpt (%)", "number", min_value=0.0, max_value=10.0, value=7.5, step=0.5, key="fin_esc")
+        decision_row("105- Dividendes (K€)", "number", min_value=0.0, value=200.0, step=50.0, key="fin_div")
+        decision_row("106- Rembt. dernier emprunt", "checkbox", value=False, key="fin_rem")
+
+        decision_row("107- Nb actions nouvelles (KU)", "number", min_value=0, value=0, step=10, key="fin_act")
+        decision_row("108- Prix d'emission (€)", "number", min_value=0.0, value=0.0, step=1.0, key="fin_pax")
+
+        net_finance_container = st.empty()
+
+        st.markdown("---")
+        st.subheader("FRAIS DE STRUCTURE & DIVERS")
+        st.info("ℹ️ Cette section regroupe les frais administratifs, de direction et de déplacements.")
+        net_structure_container = st.empty()
+
+        st.markdown("---")
+        st.subheader("ACHATS / VENTES DE TITRES")
+        decision_row("131- Actions F1", "number", value=0, step=100, key="tit_f1")
+        decision_row("132- Actions F2", "number", value=0, step=100, key="tit_f2")
+        decision_row("133- Actions F3", "number", value=0, step=100, key="tit_f3")
+        decision_row("134- Actions F4", "number", value=0, step=100, key="tit_f4")
+        decision_row("135- Actions F5", "number", value=0, step=100, key="tit_f5")
+        decision_row("136- Actions F6", "number", value=0, step=100, key="tit_f6")
+
+        st.markdown("---")
+
+        # --- PRÉVISIONS ---
+        st.subheader("PRÉVISIONS (Pour information)")
+
+        # Calcul des disponibilités maximales pour définir les bornes des sliders
+        # Dispo = Stock Init + Prod(U) + Achat Contract(U) - Vente Contract(U)
+        # Les inputs Production sont en KU (*1000)
+        def get_max_sales_vol(stock, prod_ku, achat_c, vente_c):
+            total_phys = stock + (prod_ku * 1000) + achat_c
+            return max(0, total_phys - vente_c)
+
+        # Récupération sécurisée des valeurs
+        max_a_ct = get_max_sales_vol(state.stock_a_ct, a_ct_prod, a_ct_a_contrat, a_ct_v_contrat)
+        max_a_gs = get_max_sales_vol(state.stock_a_gs, a_gs_prod, a_gs_a_contrat, a_gs_v_contrat)
+        max_b_ct = get_max_sales_vol(state.stock_b_ct, b_ct_prod, b_ct_a_contrat, b_ct_v_contrat)
+        max_b_gs = get_max_sales_vol(state.stock_b_gs, b_gs_prod, b_gs_a_contrat, b_gs_v_contrat)
+        max_c_ct = get_max_sales_vol(state.stock_c_ct, c_ct_prod, c_ct_a_contrat, c_ct_v_contrat)
+        max_c_gs = get_max_sales_vol(state.stock_c_gs, c_gs_prod, c_gs_a_contrat, c_gs_v_contrat)
+
+        st.markdown("##### 🔮 Hypothèses de Ventes (Volumes)")
+        st.caption("Ajustez le volume de vente prévisionnel pour estimer la trésorerie et la rentabilité. (Max = Stock dispo + Production net de contrats)")
+
+        col_prev1, col_prev2, col_prev3 = st.columns(3)
+
+        # Helper pour initialiser le number_input sans erreur si value > max
+        def numeric_input_safe(label, max_val, step=100):
+            # Si le max est 0, on garde 0.
+            # Sinon on essaye d'initialiser à max par défaut pour faciliter la vie.
+            return st.number_input(label, min_value=0, max_value=int(max_val), value=int(max_val), step=step)
+
+        with col_prev1:
+            st.markdown("**Produit A**")
+            fc_a_ct = numeric_input_safe("Prev. Vente A-CT", max_a_ct)
+            fc_a_gs = numeric_input_safe("Prev. Vente A-GS", max_a_gs)
+
+        with col_prev2:
+            st.markdown("**Produit B**")
+            fc_b_ct = numeric_input_safe("Prev. Vente B-CT", max_b_ct)
+            fc_b_gs = numeric_input_safe("Prev. Vente B-GS", max_b_gs)
+
+        with col_prev3:
+            st.markdown("**Produit C**")
+            fc_c_ct = numeric_input_safe("Prev. Vente C-CT", max_c_ct)
+            fc_c_gs = numeric_input_safe("Prev. Vente C-GS", max_c_gs)
+
+        forecast_dict = {
+            "A-CT": fc_a_ct, "A-GS": fc_a_gs,
+            "B-CT": fc_b_ct, "B-GS": fc_b_gs,
+            "C-CT": fc_c_ct, "C-GS": fc_c_gs
+        }
+        # Pour les sauvegardes faites hors du fragment (snapshot, bibliothèque)
+        st.session_state.forecasts = forecast_dict
+
+        # Calcul intermédiaire pour aider à la saisie
+        # On reconstitue l'objet décisions à partir des widgets liés (mirage.binding)
+        current_decisions = DECISION_BINDINGS.build(st.session_state)
+        st.session_state.current_decisions = current_decisions
+
+        # Calcul anticipé (mis en cache par version : revenir en arrière ne recalcule pas)
+        history.commit(current_decisions, state)
+        sim_results = history.results(
+            lambda: calculate_all(current_decisions, state, forecast_sales=forecast_dict),
+            forecast_dict,
+        )
 
-    st.markdown("---")
-    st.subheader("FRAIS DE STRUCTURE & DIVERS")
-    st.info("ℹ️ Cette section regroupe les frais administratifs, de direction et de déplacements.")
-    net_structure_container = st.empty()
+        # --- POPULATE NET CATEGORY PLACEHOLDERS ---
+
+        # NET A
+        if 'net_a_container' in locals():
+            res_a = sim_results.marge_sur_cout_variable_a
+            c_a = "green" if res_a > 0 else "red"
+            net_a_container.markdown(f"👉 **NET CATEGORIE A** (Gain - Coûts Spécifiques) : <span style='color:{c_a}; font-weight:bold'>{res_a:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET B
+        if 'net_b_container' in locals():
+            res_b = sim_results.marge_sur_cout_variable_b
+            c_b = "green" if res_b > 0 else "red"
+            net_b_container.markdown(f"👉 **NET CATEGORIE B** (Gain - Coûts Spécifiques) : <span style='color:{c_b}; font-weight:bold'>{res_b:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET C
+        if 'net_c_container' in locals():
+            res_c = sim_results.marge_sur_cout_variable_c
+            c_c = "green" if res_c > 0 else "red"
+            net_c_container.markdown(f"👉 **NET CATEGORIE C** (Gain - Coûts Spécifiques) : <span style='color:{c_c}; font-weight:bold'>{res_c:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET MARKETING
+        if 'net_mkt_container' in locals():
+            cost_mkt = sim_results.cout_marketing_total_section
+            # Marketing est toujours un coût, donc rouge
+            net_mkt_container.markdown(f"👉 **TOTAL SECTION MARKETING** : <span style='color:red; font-weight:bold'>-{cost_mkt:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET APPROVISIONNEMENT
+        if 'net_appro_container' in locals():
+            cost_appro = sim_results.cout_appro_total_section
+            net_appro_container.markdown(f"👉 **TOTAL SECTION APPROVISIONNEMENT** (MP Consommée + Maint.) : <span style='color:red; font-weight:bold'>-{cost_appro:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET PRODUCTION
+        if 'net_prod_container' in locals():
+            # Prod UI = MO + Amort (MP et Maint sont en Appro) + Embauche
+            # Note: sim_results.cout_production_total contient tout sauf embauche (ajoutée après dans calculator, champ séparé)
+            cost_prod_ui = sim_results.cout_main_oeuvre + sim_results.cout_amortissement + sim_results.cout_embauche
+            net_prod_container.markdown(f"👉 **TOTAL SECTION PRODUCTION** (Main d'Oeuvre + Amort + Embauche) : <span style='color:red; font-weight:bold'>-{cost_prod_ui:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET RSE
+        if 'net_rse_container' in locals():
+            cost_rse = sim_results.cout_rse_total_section
+            net_rse_container.markdown(f"👉 **TOTAL SECTION RSE** : <span style='color:red; font-weight:bold'>-{cost_rse:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET FINANCE
+        if 'net_finance_container' in locals():
+            cost_fin = sim_results.cout_finance_total_section
+            net_finance_container.markdown(f"👉 **TOTAL SECTION FINANCE** (Impayés + Escompte + Intérêts) : <span style='color:red; font-weight:bold'>-{cost_fin:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # NET STRUCTURE
+        if 'net_structure_container' in locals():
+            cost_struct = sim_results.cout_structure_admin + sim_results.cout_frais_deplacement
+            net_structure_container.markdown(f"👉 **TOTAL CHARGES STRUCTURE/ADMIN** : <span style='color:red; font-weight:bold'>-{cost_struct:,.0f} K€</span>", unsafe_allow_html=True)
+
+        # --- AFFICHAGE DES CALCULS DE PRÉVISION ---
+        col_prev1, col_prev2, col_prev3 = st.columns(3)
+        with col_prev1:
+            st.metric("CA Potentiel Total", f"{sim_results.ca_potentiel_total:,.0f} K€", help="Chiffre d'Affaires si tout le stock disponible est vendu")
+        with col_prev2:
+            # Estimation Résultat
+            res_imposable = sim_results.resultat_courant + sim_results.resultat_exceptionnel
+            impot = getattr(sim_results, "impot_societes", 0.0)
+            res_net = getattr(sim_results, "resultat_net", res_imposable - impot)
+
+            st.metric("Résultat Avant Impôt", f"{res_imposable:,.0f} K€", help="Résultat Courant + Exceptionnel")
+
+            # Affichage distinct de l'IS si pertinent
+            if impot > 0:
+                st.caption(f"Dont Impôt Sociétés : {impot:,.0f} K€")
+
+            st.metric("Résultat Net Est.", f"{res_net:,.0f} K€", delta_color="normal" if res_net >= 0 else "inverse")
+        with col_prev3:
+            delta_color = "normal" if sim_results.tresorerie_estimee >= 0 else "inverse"
+            st.metric("Trésorerie Fin Période", f"{sim_results.tresorerie_estimee:,.0f} K€", delta_color=delta_color)
+
+        # Flux de trésorerie détaillés
+        st.caption("Détail flux :")
+        col_flow1, col_flow2 = st.columns(2)
+        with col_flow1:
+            st.metric("Encaissements Totaux", f"+{sim_results.encaissements_total:,.0f} K€", help="Ventes encaissées + Emprunts + Cessions")
+        with col_flow2:
+            # Update Decaissements calculation logic in calculator? 
+            # Actually calculator computes decaissements_total separately.
+            # But we need to make sure calculator includes structure cost in decaissements.
+            # Checking calculator.py... yes, previously I added it to decaissements_autres via 'cout_production_total' hack which I removed.
+            # WAIT! I removed the hack in calculator.py but did I add it to decaissements_autres?
+            # I need to CHECK calculator.py again for decaissements logic.
+            curr_flow = sim_results.decaissements_total + sim_results.cout_structure_admin + sim_results.cout_frais_deplacement # Patching it here visually if missing in calculator? No, better fix calculator.
+            st.metric("Décaissements Totaux", f"-{sim_results.decaissements_total:,.0f} K€", help="Achats MP + Personnel + Charges + Investissements + Dividendes")
+
+        if sim_results.warnings:
+            st.error(f"⚠️ {len(sim_results.warnings)} Alertes détectées")
+            with st.expander("Voir le détail des alertes", expanded=True):
+                for w in sim_results.warnings:
+                    st.warning(w)
 
-    st.markdown("---")
-    st.subheader("ACHATS / VENTES DE TITRES")
-    titres_f1 = decision_row("131- Actions F1", "number", value=0, step=100, key="tit_f1")
-    titres_f2 = decision_row("132- Actions F2", "number", value=0, step=100, key="tit_f2")
-    titres_f3 = decision_row("133- Actions F3", "number", value=0, step=100, key="tit_f3")
-    titres_f4 = decision_row("134- Actions F4", "number", value=0, step=100, key="tit_f4")
-    titres_f5 = decision_row("135- Actions F5", "number", value=0, step=100, key="tit_f5")
-    titres_f6 = decision_row("136- Actions F6", "number", value=0, step=100, key="tit_f6")
 
-    st.markdown("---")
-    
-    # --- PRÉVISIONS ---
-    st.subheader("PRÉVISIONS (Pour information)")
-
-    # Calcul des disponibilités maximales pour définir les bornes des sliders
-    # Dispo = Stock Init + Prod(U) + Achat Contract(U) - Vente Contract(U)
-    # Les inputs Production sont en KU (*1000)
-    def get_max_sales_vol(stock, prod_ku, achat_c, vente_c):
-        total_phys = stock + (prod_ku * 1000) + achat_c
-        return max(0, total_phys - vente_c)
-
-    # Récupération sécurisée des valeurs
-    max_a_ct = get_max_sales_vol(state.stock_a_ct, a_ct_prod, a_ct_a_contrat, a_ct_v_contrat)
-    max_a_gs = get_max_sales_vol(state.stock_a_gs, a_gs_prod, a_gs_a_contrat, a_gs_v_contrat)
-    max_b_ct = get_max_sales_vol(state.stock_b_ct, b_ct_prod, b_ct_a_contrat, b_ct_v_contrat)
-    max_b_gs = get_max_sales_vol(state.stock_b_gs, b_gs_prod, b_gs_a_contrat, b_gs_v_contrat)
-    max_c_ct = get_max_sales_vol(state.stock_c_ct, c_ct_prod, c_ct_a_contrat, c_ct_v_contrat)
-    max_c_gs = get_max_sales_vol(state.stock_c_gs, c_gs_prod, c_gs_a_contrat, c_gs_v_contrat)
-
-    st.markdown("##### 🔮 Hypothèses de Ventes (Volumes)")
-    st.caption("Ajustez le volume de vente prévisionnel pour estimer la trésorerie et la rentabilité. (Max = Stock dispo + Production net de contrats)")
-
-    col_prev1, col_prev2, col_prev3 = st.columns(3)
-    
-    # Helper pour initialiser le number_input sans erreur si value > max
-    def numeric_input_safe(label, max_val, step=100):
-        # Si le max est 0, on garde 0.
-        # Sinon on essaye d'initialiser à max par défaut pour faciliter la vie.
-        return st.number_input(label, min_value=0, max_value=int(max_val), value=int(max_val), step=step)
-    
-    with col_prev1:
-        st.markdown("**Produit A**")
-        fc_a_ct = numeric_input_safe("Prev. Vente A-CT", max_a_ct)
-        fc_a_gs = numeric_input_safe("Prev. Vente A-GS", max_a_gs)
-    
-    with col_prev2:
-        st.markdown("**Produit B**")
-        fc_b_ct = numeric_input_safe("Prev. Vente B-CT", max_b_ct)
-        fc_b_gs = numeric_input_safe("Prev. Vente B-GS", max_b_gs)
-        
-    with col_prev3:
-        st.markdown("**Produit C**")
-        fc_c_ct = numeric_input_safe("Prev. Vente C-CT", max_c_ct)
-        fc_c_gs = numeric_input_safe("Prev. Vente C-GS", max_c_gs)
-
-    forecast_dict = {
-        "A-CT": fc_a_ct, "A-GS": fc_a_gs,
-        "B-CT": fc_b_ct, "B-GS": fc_b_gs,
-        "C-CT": fc_c_ct, "C-GS": fc_c_gs
-    }
+# Tabs: Inputs vs Results
+tabs = st.tabs(["📝 Saisie des Décisions", "📊 Résultats & Analyse"])
 
-    # Calcul intermédiaire pour aider à la saisie
-    # On reconstitue l'objet décisions avec les variables locales définies ci-dessus
-    current_decisions = AllDecisions(
-        produit_a_ct=ProductDecision(
-            prix_tarif=a_ct_prix, promotion=a_ct_promo, production=a_ct_prod,
-            qualite=a_ct_qual, emballage_recycle=a_ct_emb,
-            ventes_contrat=a_ct_v_contrat, achats_contrat=a_ct_a_contrat
-        ),
-        produit_a_gs=ProductDecision(
-            prix_tarif=a_gs_prix, ristourne=a_gs_rist, promotion=a_gs_promo,
-            production=a_gs_prod, qualite=a_gs_qual, emballage_recycle=a_gs_emb,
-            ventes_contrat=a_gs_v_contrat, achats_contrat=a_gs_a_contrat
-        ),
-        produit_b_ct=ProductDecision(
-            prix_tarif=b_ct_prix, promotion=b_ct_promo, production=b_ct_prod,
-            qualite=b_ct_qual, emballage_recycle=b_ct_emb,
-            ventes_contrat=b_ct_v_contrat, achats_contrat=b_ct_a_contrat
-        ),
-        produit_b_gs=ProductDecision(
-            prix_tarif=b_gs_prix, ristourne=b_gs_rist, promotion=b_gs_promo,
-            production=b_gs_prod, qualite=b_gs_qual, emballage_recycle=b_gs_emb,
-            ventes_contrat=b_gs_v_contrat, achats_contrat=b_gs_a_contrat
-        ),
-        produit_c_ct=ProductDecision(
-            prix_tarif=c_ct_prix, promotion=c_ct_promo, production=c_ct_prod,
-            qualite=c_ct_qual, emballage_recycle=c_ct_emb,
-            ventes_contrat=c_ct_v_contrat, achats_contrat=c_ct_a_contrat
-        ),
-        produit_c_gs=ProductDecision(
-            prix_tarif=c_gs_prix, ristourne=c_gs_rist, promotion=c_gs_promo,
-            production=c_gs_prod, qualite=c_gs_qual, emballage_recycle=c_gs_emb,
-            ventes_contrat=c_gs_v_contrat, achats_contrat=c_gs_a_contrat
-        ),
-        marketing=MarketingDecision(
-            vendeurs_ct=mkt_vendeurs_ct, commission_ct=mkt_commission,
-            vendeurs_gs=mkt_vendeurs_gs, prime_trimestre_gs=mkt_prime_gs,
-            publicite_ct=mkt_pub_ct, publicite_gs=mkt_pub_gs,
-            etudes_abcd=mkt_etudes_abcd, etudes_efgh=mkt_etudes_efgh
-        ),
-        approvisionnement=ApprovisionnementDecision(
-            commandes_mp_n=app_mp_n, duree_contrat_n=app_duree_n,
-            commandes_mp_s=app_mp_s, duree_contrat_s=app_duree_s,
-            maintenance=app_maintenance,
-            achat_spot_n=0, achat_spot_s=0
-        ),
-        production=ProductionDecision(
-            machines_m1_actives=prod_m1_actives, machines_m2_actives=prod_m2_actives,
-            ventes_m1=prod_ventes_m1, achats_m1=prod_achats_m1, achats_m2=prod_achats_m2,
-            emb_deb_ouvriers=prod_emb_deb, variation_pouvoir_achat=prod_var_pa
-        ),
-        rse=RSEDecision(
-            budget_recyclage=rse_recyclage, amenagements_adaptes=rse_amenagements,
-            recherche_dev=rse_rd
-        ),
-        finance=FinanceDecision(
-            emprunt_lt=fin_emprunt_lt, duree_emprunt_lt=fin_duree_lt,
-            effort_social=fin_effort_social, emprunt_ct=fin_emprunt_ct,
-            effets_escomptes=fin_effets, escompte_paiement_cpt=fin_escompte,
-            dividendes=fin_dividendes, rembt_dernier_emprunt=fin_rembt,
-            nb_actions_nouvelles=fin_actions_new, prix_emission=fin_prix_emission
-        ),
-        titres=TitresDecision(
-            actions_f1=titres_f1, actions_f2=titres_f2, actions_f3=titres_f3,
-            actions_f4=titres_f4, actions_f5=titres_f5, actions_f6=titres_f6
-        )
-    )
-    
-    # Calcul anticipé
-    sim_results = calculate_all(current_decisions, state, forecast_sales=forecast_dict)
+# =====================================================
+# TAB 1: SAISIE DES DÉCISIONS (Table Unique)
+# =====================================================
+with tabs[0]:
+    decision_workspace(state)
 
-    # --- POPULATE NET CATEGORY PLACEHOLDERS ---
-    
-    # NET A
-    if 'net_a_container' in locals():
-        res_a = sim_results.marge_sur_cout_variable_a
-        c_a = "green" if res_a > 0 else "red"
-        net_a_container.markdown(f"👉 **NET CATEGORIE A** (Gain - Coûts Spécifiques) : <span style='color:{c_a}; font-weight:bold'>{res_a:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # NET B
-    if 'net_b_container' in locals():
-        res_b = sim_results.marge_sur_cout_variable_b
-        c_b = "green" if res_b > 0 else "red"
-        net_b_container.markdown(f"👉 **NET CATEGORIE B** (Gain - Coûts Spécifiques) : <span style='color:{c_b}; font-weight:bold'>{res_b:,.0f} K€</span>", unsafe_allow_html=True)
-    
-    # NET C
-    if 'net_c_container' in locals():
-        res_c = sim_results.marge_sur_cout_variable_c
-        c_c = "green" if res_c > 0 else "red"
-        net_c_container.markdown(f"👉 **NET CATEGORIE C** (Gain - Coûts Spécifiques) : <span style='color:{c_c}; font-weight:bold'>{res_c:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # NET MARKETING
-    if 'net_mkt_container' in locals():
-        cost_mkt = sim_results.cout_marketing_total_section
-        # Marketing est toujours un coût, donc rouge
-        net_mkt_container.markdown(f"👉 **TOTAL SECTION MARKETING** : <span style='color:red; font-weight:bold'>-{cost_mkt:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # NET APPROVISIONNEMENT
-    if 'net_appro_container' in locals():
-        cost_appro = sim_results.cout_appro_total_section
-        net_appro_container.markdown(f"👉 **TOTAL SECTION APPROVISIONNEMENT** (MP Consommée + Maint.) : <span style='color:red; font-weight:bold'>-{cost_appro:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # NET PRODUCTION
-    if 'net_prod_container' in locals():
-        # Prod UI = MO + Amort (MP et Maint sont en Appro) + Embauche
-        # Note: sim_results.cout_production_total contient tout sauf embauche (ajoutée après dans calculator, champ séparé)
-        cost_prod_ui = sim_results.cout_main_oeuvre + sim_results.cout_amortissement + sim_results.cout_embauche
-        net_prod_container.markdown(f"👉 **TOTAL SECTION PRODUCTION** (Main d'Oeuvre + Amort + Embauche) : <span style='color:red; font-weight:bold'>-{cost_prod_ui:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # NET RSE
-    if 'net_rse_container' in locals():
-        cost_rse = sim_results.cout_rse_total_section
-        net_rse_container.markdown(f"👉 **TOTAL SECTION RSE** : <span style='color:red; font-weight:bold'>-{cost_rse:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # NET FINANCE
-    if 'net_finance_container' in locals():
-        cost_fin = sim_results.cout_finance_total_section
-        net_finance_container.markdown(f"👉 **TOTAL SECTION FINANCE** (Impayés + Escompte + Intérêts) : <span style='color:red; font-weight:bold'>-{cost_fin:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # NET STRUCTURE
-    if 'net_structure_container' in locals():
-        cost_struct = sim_results.cout_structure_admin + sim_results.cout_frais_deplacement
-        net_structure_container.markdown(f"👉 **TOTAL CHARGES STRUCTURE/ADMIN** : <span style='color:red; font-weight:bold'>-{cost_struct:,.0f} K€</span>", unsafe_allow_html=True)
-
-    # --- AFFICHAGE DES CALCULS DE PRÉVISION ---
-    col_prev1, col_prev2, col_prev3 = st.columns(3)
-    with col_prev1:
-        st.metric("CA Potentiel Total", f"{sim_results.ca_potentiel_total:,.0f} K€", help="Chiffre d'Affaires si tout le stock disponible est vendu")
-    with col_prev2:
-        # Estimation Résultat
-        res_imposable = sim_results.resultat_courant + sim_results.resultat_exceptionnel
-        impot = getattr(sim_results, "impot_societes", 0.0)
-        res_net = getattr(sim_results, "resultat_net", res_imposable - impot)
-        
-        st.metric("Résultat Avant Impôt", f"{res_imposable:,.0f} K€", help="Résultat Courant + Exceptionnel")
-        
-        # Affichage distinct de l'IS si pertinent
-        if impot > 0:
-            st.caption(f"Dont Impôt Sociétés : {impot:,.0f} K€")
-            
-        st.metric("Résultat Net Est.", f"{res_net:,.0f} K€", delta_color="normal" if res_net >= 0 else "inverse")
-    with col_prev3:
-        delta_color = "normal" if sim_results.tresorerie_estimee >= 0 else "inverse"
-        st.metric("Trésorerie Fin Période", f"{sim_results.tresorerie_estimee:,.0f} K€", delta_color=delta_color)
-
-    # Flux de trésorerie détaillés
-    st.caption("Détail flux :")
-    col_flow1, col_flow2 = st.columns(2)
-    with col_flow1:
-        st.metric("Encaissements Totaux", f"+{sim_results.encaissements_total:,.0f} K€", help="Ventes encaissées + Emprunts + Cessions")
-    with col_flow2:
-        # Update Decaissements calculation logic in calculator? 
-        # Actually calculator computes decaissements_total separately.
-        # But we need to make sure calculator includes structure cost in decaissements.
-        # Checking calculator.py... yes, previously I added it to decaissements_autres via 'cout_production_total' hack which I removed.
-        # WAIT! I removed the hack in calculator.py but did I add it to decaissements_autres?
-        # I need to CHECK calculator.py again for decaissements logic.
-        curr_flow = sim_results.decaissements_total + sim_results.cout_structure_admin + sim_results.cout_frais_deplacement # Patching it here visually if missing in calculator? No, better fix calculator.
-        st.metric("Décaissements Totaux", f"-{sim_results.decaissements_total:,.0f} K€", help="Achats MP + Personnel + Charges + Investissements + Dividendes")
-
-    if sim_results.warnings:
-        st.error(f"⚠️ {len(sim_results.warnings)} Alertes détectées")
-        with st.expander("Voir le détail des alertes", expanded=True):
-            for w in sim_results.warnings:
-                st.warning(w)
+# =====================================================
+# TAB 2: RÉSULTATS & ANALYSE
+# =====================================================
+with tabs[1]:
+    decision_heatmap(state)
+    st.divider()
+    background_studies(state)
@@ -2,3 +2,18 @@
 """Decision-making tool for Mirage business simulation."""
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    # Submodules load on first access (mirage.calculator...), so `import mirage`
+    # itself stays free of NumPy/pandas whatever the caller ends up using.
+    if name.startswith("_"):
+        raise AttributeError(name)
+    import importlib
+
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
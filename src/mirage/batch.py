@@ -0,0 +1,183 @@
+"""Struct-of-arrays containers for many decisions or results at once."""
+
+import dataclasses
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .models import AllDecisions, CalculatedResults
+from .schema import schema_for
+
+# str columns stay object arrays: fixed-width unicode arrays would truncate on assignment
+_DTYPES = {int: np.int64, float: np.float64, bool: np.bool_, str: object}
+
+
+def leaf_fields(model: type) -> List[Tuple[str, type]]:
+    """Every leaf field of a (nested) dataclass as ('produit_a_ct.prix_tarif', float)."""
+    return [(spec.column, spec.type) for spec in schema_for(model)]
+
+
+def _build(model: type, values: Dict[str, Any]) -> Any:
+    """Instantiate a nested dataclass from {'a.b': value} items of one row."""
+    kwargs = {}
+    nested: Dict[str, Dict[str, Any]] = {}
+    for path, value in values.items():
+        head, _, rest = path.partition(".")
+        if rest:
+            nested.setdefault(head, {})[rest] = value
+        else:
+            kwargs[head] = value
+    for f in dataclasses.fields(model):
+        if f.name in nested:
+            kwargs[f.name] = _build(f.type, nested[f.name])
+    return model(**kwargs)
+
+
+class _Batch:
+    """
+    One NumPy array per leaf field of `model`, all of the same length.
+
+    Indexing with a slice returns views (no copy); boolean masks and index
+    arrays return copies, as NumPy does.
+    """
+
+    model: type = object
+    # Leaf fields whose values are not scalars (stored in object arrays)
+    object_fields: Tuple[str, ...] = ()
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Toutes les colonnes d'un batch doivent avoir la même longueur")
+        missing = [path for path in self.paths() if path not in columns]
+        if missing:
+            raise ValueError(f"Colonnes manquantes: {', '.join(missing)}")
+        self.columns = columns
+
+    @classmethod
+    def leaves(cls) -> List[Tuple[str, type]]:
+        cached = cls.__dict__.get("_leaves")
+        if cached is None:
+            cached = leaf_fields(cls.model)
+            cls._leaves = cached
+        return cached
+
+    @classmethod
+    def paths(cls) -> List[str]:
+        return [path for path, _ in cls.leaves()]
+
+    @classmethod
+    def _array(cls, path: str, typ: type, values: Sequence[Any]) -> np.ndarray:
+        if path in cls.object_fields:
+            out = np.empty(len(values), dtype=object)
+            out[:] = [tuple(v) for v in values]
+            return out
+        return np.asarray(values, dtype=_DTYPES.get(typ, object))
+
+    # --- construction -------------------------------------------------------
+
+    @classmethod
+    def from_dataclasses(cls, items: Iterable[Any]):
+        items = list(items)
+        columns = {}
+        for spec in schema_for(cls.model):
+            get = spec.get
+            columns[spec.column] = cls._array(spec.column, spec.type, [get(item) for item in items])
+        return cls(columns)
+
+    @classmethod
+    def repeat(cls, item: Any = None, n: int = 1):
+        """`n` copies of one instance (the model defaults if None)."""
+        item = cls.model() if item is None else item
+        columns = {}
+        for spec in schema_for(cls.model):
+            path, value = spec.column, spec.get(item)
+            if path in cls.object_fields:
+                columns[path] = cls._array(path, spec.type, [value] * n)
+            else:
+                columns[path] = np.full(n, value, dtype=_DTYPES.get(spec.type, object))
+        return cls(columns)
+
+    @classmethod
+    def from_frame(cls, frame) -> "_Batch":
+        """From a DataFrame whose columns are leaf paths; missing columns get defaults."""
+        n = len(frame)
+        defaults = cls.repeat(n=n).columns
+        columns = {}
+        for path, typ in cls.leaves():
+            if path in frame.columns:
+                columns[path] = cls._array(path, typ, frame[path].to_numpy())
+            else:
+                columns[path] = defaults[path]
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, batches: Sequence["_Batch"]):
+        return cls({
+            path: np.concatenate([b.columns[path] for b in batches]) for path in cls.paths()
+        })
+
+    # --- conversion ---------------------------------------------------------
+
+    def to_dataclasses(self) -> List[Any]:
+        paths = self.paths()
+        lists = [self.columns[path].tolist() for path in paths]
+        object_fields = set(self.object_fields)
+        items = []
+        for row in zip(*lists):
+            values = {
+                path: list(value) if path in object_fields else value
+                for path, value in zip(paths, row)
+            }
+            items.append(_build(self.model, values))
+        return items
+
+    def to_frame(self):
+        """DataFrame with one column per leaf path (NumPy arrays passed without copy)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, copy=False)
+
+    # --- accès --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, key: Union[str, int, slice, np.ndarray, Sequence[int]]):
+        if isinstance(key, str):
+            return self.columns[key]
+        if isinstance(key, (int, np.integer)):
+            return self.row(int(key))
+        return type(self)({path: column[key] for path, column in self.columns.items()})
+
+    def __setitem__(self, path: str, values: Any) -> None:
+        """Assign a whole column (a scalar is broadcast)."""
+        column = self.columns[path]
+        column[...] = values
+
+    def row(self, i: int) -> Any:
+        """The i-th element as a model instance."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self[i:i + 1].to_dataclasses()[0]
+
+    def copy(self):
+        return type(self)({path: column.copy() for path, column in self.columns.items()})
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(n={len(self)}, fields={len(self.columns)})"
+
+
+class DecisionBatch(_Batch):
+    """Many AllDecisions as columns ('produit_b_gs.ristourne', 'marketing.vendeurs_ct'...)."""
+
+    model = AllDecisions
+
+
+class ResultBatch(_Batch):
+    """Many CalculatedResults as columns; warnings are kept as tuples in an object column."""
+
+    model = CalculatedResults
+    object_fields = ("warnings",)
@@ -0,0 +1,183 @@
+"""
+Mapping between the Streamlit widget keys of app/main.py and the model paths.
+
+    decisions = DECISION_BINDINGS.build(st.session_state)   # widgets -> AllDecisions
+    STATE_BINDINGS.push(state, st.session_state)            # PeriodState -> widgets
+
+Only bound keys are read or written, so a rerun or a session save does not have
+to walk the whole session_state.
+"""
+
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .models import AllDecisions, PeriodState
+from .schema import _deepcopy_dataclass, schema_for
+
+
+@dataclass(frozen=True)
+class WidgetBinding:
+    """One widget key bound to one model path; `cast` is the type the widget expects."""
+
+    key: str
+    path: str
+    cast: Optional[type] = None
+
+
+class BindingSet:
+    """The widgets bound to the fields of one model class."""
+
+    def __init__(self, model: type, bindings: Iterable[Union[WidgetBinding, Tuple[str, str]]]):
+        schema = schema_for(model)
+        self.model = model
+        self.bindings: List[WidgetBinding] = []
+        for binding in bindings:
+            if not isinstance(binding, WidgetBinding):
+                binding = WidgetBinding(*binding)
+            if binding.path not in schema:
+                raise ValueError(f"Champ inconnu pour {model.__name__}: {binding.path}")
+            self.bindings.append(binding)
+        self.keys: Tuple[str, ...] = tuple(b.key for b in self.bindings)
+        if len(set(self.keys)) != len(self.keys):
+            raise ValueError(f"Clé de widget liée deux fois pour {model.__name__}")
+        # (key, getter, setter, cast) resolved once
+        self._accessors: List[Tuple[str, Callable, Callable, Optional[type]]] = [
+            (b.key, schema[b.path].get, schema[b.path].set, b.cast) for b in self.bindings
+        ]
+
+    def path(self, key: str) -> str:
+        for binding in self.bindings:
+            if binding.key == key:
+                return binding.path
+        raise KeyError(key)
+
+    def build(self, values: Mapping[str, Any], base: Any = None) -> Any:
+        """
+        Model instance from widget values: the defaults (or a copy of `base`)
+        overwritten by every bound key present in `values`.
+        """
+        obj = self.model() if base is None else _deepcopy_dataclass(base)
+        for key, _, setter, _ in self._accessors:
+            if key in values:
+                setter(obj, values[key])
+        return obj
+
+    def widget_values(self, obj: Any) -> Dict[str, Any]:
+        """{widget key: value} for a model instance (None becomes the widget's zero)."""
+        values = {}
+        for key, getter, _, cast in self._accessors:
+            value = getter(obj)
+            if cast is not None:
+                value = cast(value) if value is not None else cast()
+            values[key] = value
+        return values
+
+    def push(self, obj: Any, session: MutableMapping[str, Any]) -> None:
+        """Write the fields of `obj` into the bound widget keys."""
+        for key, value in self.widget_values(obj).items():
+            session[key] = value
+
+    def extract(self, session: Mapping[str, Any]) -> Dict[str, Any]:
+        """Bound keys present in `session`, e.g. for saving."""
+        return {key: session[key] for key in self.keys if key in session}
+
+
+def _product(prefix: str, path: str, gs: bool) -> List[Tuple[str, str]]:
+    bindings = [
+        (f"{prefix}_prix", f"{path}.prix_tarif"),
+        (f"{prefix}_promo", f"{path}.promotion"),
+        (f"{prefix}_prod", f"{path}.production"),
+        (f"{prefix}_qual", f"{path}.qualite"),
+        (f"{prefix}_emb", f"{path}.emballage_recycle"),
+        (f"{prefix}_vc", f"{path}.ventes_contrat"),
+        (f"{prefix}_ac", f"{path}.achats_contrat"),
+    ]
+    if gs:
+        bindings.append((f"{prefix}_rist", f"{path}.ristourne"))
+    return bindings
+
+
+DECISION_BINDINGS = BindingSet(
+    AllDecisions,
+    _product("a_ct", "produit_a_ct", gs=False)
+    + _product("a_gs", "produit_a_gs", gs=True)
+    + _product("b_ct", "produit_b_ct", gs=False)
+    + _product("b_gs", "produit_b_gs", gs=True)
+    + _product("c_ct", "produit_c_ct", gs=False)
+    + _product("c_gs", "produit_c_gs", gs=True)
+    + [
+        ("mkt_ven_ct", "marketing.vendeurs_ct"),
+        ("mkt_comm", "marketing.commission_ct"),
+        ("mkt_etu_ad", "marketing.etudes_abcd"),
+        ("mkt_etu_eh", "marketing.etudes_efgh"),
+        ("mkt_ven_gs", "marketing.vendeurs_gs"),
+        ("mkt_prime_gs", "marketing.prime_trimestre_gs"),
+        ("mkt_pub_ct", "marketing.publicite_ct"),
+        ("mkt_pub_gs", "marketing.publicite_gs"),
+        ("app_mp_n_val", "approvisionnement.commandes_mp_n"),
+        ("app_duree_n", "approvisionnement.duree_contrat_n"),
+        ("app_mp_s_val", "approvisionnement.commandes_mp_s"),
+        ("app_duree_s", "approvisionnement.duree_contrat_s"),
+        ("app_maint", "approvisionnement.maintenance"),
+        ("prod_m1", "production.machines_m1_actives"),
+        ("prod_m2", "production.machines_m2_actives"),
+        ("prod_v_m1", "production.ventes_m1"),
+        ("prod_a_m1", "production.achats_m1"),
+        ("prod_a_m2", "production.achats_m2"),
+        ("prod_emb", "production.emb_deb_ouvriers"),
+        ("prod_vpa", "production.variation_pouvoir_achat"),
+        ("rse_cyc", "rse.budget_recyclage"),
+        ("rse_amen", "rse.amenagements_adaptes"),
+        ("rse_rd", "rse.recherche_dev"),
+        ("fin_elt", "finance.emprunt_lt"),
+        ("fin_dlt", "finance.duree_emprunt_lt"),
+        ("fin_soc", "finance.effort_social"),
+        ("fin_ect", "finance.emprunt_ct"),
+        ("fin_eff", "finance.effets_escomptes"),
+        ("fin_esc", "finance.escompte_paiement_cpt"),
+        ("fin_div", "finance.dividendes"),
+        ("fin_rem", "finance.rembt_dernier_emprunt"),
+        ("fin_act", "finance.nb_actions_nouvelles"),
+        ("fin_pax", "finance.prix_emission"),
+    ]
+    + [(f"tit_f{i}", f"titres.actions_f{i}") for i in range(1, 7)],
+)
+
+# Sidebar "État Initial" widgets (stocks of finished goods are float widgets)
+STATE_BINDINGS = BindingSet(
+    PeriodState,
+    [
+        WidgetBinding("s_a_ct", "stock_a_ct", float),
+        WidgetBinding("s_a_gs", "stock_a_gs", float),
+        WidgetBinding("s_b_ct", "stock_b_ct", float),
+        WidgetBinding("s_b_gs", "stock_b_gs", float),
+        WidgetBinding("s_c_ct", "stock_c_ct", float),
+        WidgetBinding("s_c_gs", "stock_c_gs", float),
+        WidgetBinding("s_mp_n", "stock_mp_n", int),
+        WidgetBinding("s_mp_s", "stock_mp_s", int),
+        WidgetBinding("s_ouvriers", "nb_ouvriers", int),
+        WidgetBinding("s_m1", "nb_machines_m1", int),
+        WidgetBinding("s_m2", "nb_machines_m2", int),
+        WidgetBinding("s_cash", "cash", float),
+        WidgetBinding("s_dlt", "dette_lt", float),
+        WidgetBinding("s_dct", "dette_ct", float),
+        WidgetBinding("s_ip", "indice_prix", float),
+        WidgetBinding("s_is", "indice_salaire", float),
+    ],
+)
+
+# Session keys saved besides the bound widgets
+EXTRA_SESSION_KEYS = ("state", "period_selector_val", "user_notes")
+
+SESSION_KEYS: Tuple[str, ...] = DECISION_BINDINGS.keys + STATE_BINDINGS.keys + EXTRA_SESSION_KEYS
@@ -0,0 +1,163 @@
+"""Persistent on-disk cache of parsed Mirage reports."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .models import PeriodState
+from .parser import PARSER_VERSION, extract_period_state, parse_mirage_markdown
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "reports"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 Mo
+DEFAULT_MAX_AGE_DAYS = 90
+
+# Entry layout: MAGIC | zlib(pickle((parsed, state)))
+_MAGIC = b"MRPC1"
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """SHA-256 of the report content (str is hashed as UTF-8)."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class ParseCache:
+    """
+    Parsed reports (raw tables + PeriodState) stored as compressed pickles.
+
+    Entries are keyed by the SHA-256 of the markdown content and PARSER_VERSION,
+    so a parser change never serves stale data. A hit touches the entry; eviction
+    drops entries older than `max_age_days`, then the least recently used ones
+    until the directory fits in `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+    def path_for(self, digest: str) -> Path:
+        return self.directory / f"{digest}-v{PARSER_VERSION}.bin"
+
+    def get(self, digest: str) -> Optional[Tuple[dict, PeriodState]]:
+        """Return the cached (parsed, state) for a content hash, or None."""
+        path = self.path_for(digest)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(_MAGIC):
+            return None
+        try:
+            parsed, state = pickle.loads(zlib.decompress(data[len(_MAGIC):]))
+        except Exception:
+            # Corrupted or written by an incompatible version: treat as a miss
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return parsed, state
+
+    def put(self, digest: str, parsed: dict, state: PeriodState) -> None:
+        """Store an entry atomically, then evict if the cache grew too large."""
+        try:
+            payload = _MAGIC + zlib.compress(
+                pickle.dumps((parsed, state), protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        except (pickle.PicklingError, AttributeError, TypeError):
+            # Not serializable (e.g. a class redefined since the objects were built):
+            # the entry is simply not cached
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, self.path_for(digest))
+        except OSError:
+            # A read-only or full disk only costs us the cache
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove expired entries, then LRU entries beyond max_bytes. Returns the count."""
+        try:
+            entries = [(p, p.stat()) for p in self.directory.glob("*.bin")]
+        except OSError:
+            return 0
+
+        removed = 0
+        cutoff = time.time() - self.max_age_days * 86400
+        kept = []
+        for path, st in entries:
+            if st.st_mtime < cutoff or not path.name.endswith(f"-v{PARSER_VERSION}.bin"):
+                removed += self._unlink(path)
+            else:
+                kept.append((path, st))
+
+        total = sum(st.st_size for _, st in kept)
+        kept.sort(key=lambda e: e[1].st_mtime)
+        for path, st in kept:
+            if total <= self.max_bytes:
+                break
+            total -= st.st_size
+            removed += self._unlink(path)
+        return removed
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.bin"):
+            self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: Path) -> int:
+        try:
+            path.unlink()
+            return 1
+        except OSError:
+            return 0
+
+
+_default_cache: Optional[ParseCache] = None
+
+
+def get_default_cache() -> ParseCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
+
+
+def parse_report_cached(
+    content: str, cache: Optional[ParseCache] = None
+) -> Tuple[dict, PeriodState]:
+    """
+    Parse a report (parse_mirage_markdown + extract_period_state) through the cache.
+
+    On a hit the markdown is only hashed, never parsed.
+    """
+    cache = cache or get_default_cache()
+    digest = content_hash(content)
+    hit = cache.get(digest)
+    if hit is not None:
+        return hit
+    parsed = parse_mirage_markdown(content)
+    state = extract_period_state(parsed)
+    cache.put(digest, parsed, state)
+    return parsed, state
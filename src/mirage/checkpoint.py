@@ -0,0 +1,116 @@
+"""
+Checkpoints of long runs (sweeps, Monte Carlo, optimizations), keyed by job ID.
+
+A checkpoint records what is needed to resume exactly where a run stopped:
+completed chunk ids, the sampler position, the RNG state, the best result so
+far and a hash of the run parameters (a job ID reused with other parameters
+is refused rather than silently mixed). Files are written atomically, so a
+killed process leaves either the previous or the new checkpoint, never a
+truncated one.
+"""
+
+import os
+import pickle
+import re
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_CHECKPOINT_DIR = Path(__file__).resolve().parents[2] / "data" / "checkpoints"
+
+# File layout: MAGIC | zlib(pickle(Checkpoint))
+_MAGIC = b"MRCK1"
+_JOB_ID = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+@dataclass
+class Checkpoint:
+    """Progress of one job."""
+
+    job_id: str
+    params_hash: str
+    completed: List[int] = field(default_factory=list)
+    sampler_state: Dict[str, Any] = field(default_factory=dict)
+    # numpy Generator.bit_generator.state (or random.getstate()) after the last completed chunk
+    rng_state: Any = None
+    best: Optional[Dict[str, Any]] = None
+    rows: int = 0
+    finished: bool = False
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class CheckpointStore:
+    """One `<job_id>.ckpt` file per job in `directory`."""
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_CHECKPOINT_DIR):
+        self.directory = Path(directory)
+
+    def path_for(self, job_id: str) -> Path:
+        if not _JOB_ID.match(job_id):
+            raise ValueError(f"Identifiant de job invalide: {job_id!r}")
+        return self.directory / f"{job_id}.ckpt"
+
+    def load(self, job_id: str) -> Optional[Checkpoint]:
+        """The job's last checkpoint, or None (absent or unreadable)."""
+        try:
+            with open(self.path_for(job_id), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(_MAGIC):
+            return None
+        try:
+            return pickle.loads(zlib.decompress(data[len(_MAGIC):]))
+        except Exception:
+            return None
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        checkpoint.updated_at = time.time()
+        path = self.path_for(checkpoint.job_id)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = _MAGIC + zlib.compress(pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL))
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, job_id: str) -> bool:
+        try:
+            self.path_for(job_id).unlink()
+            return True
+        except OSError:
+            return False
+
+    def jobs(self) -> List[str]:
+        return sorted(p.stem for p in self.directory.glob("*.ckpt"))
+
+
+class Checkpointer:
+    """Saves a job's checkpoint at most every `interval` seconds (or when forced)."""
+
+    def __init__(self, store: CheckpointStore, checkpoint: Checkpoint, interval: float = 5.0):
+        self.store = store
+        self.checkpoint = checkpoint
+        self.interval = interval
+        self._last = time.monotonic()
+
+    def maybe_save(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return False
+        self.store.save(self.checkpoint)
+        self._last = now
+        return True
@@ -0,0 +1,218 @@
+"""
+Headless batch evaluation: `mirage-sim` (or `python -m mirage.cli`).
+
+    mirage-sim --report "Simulation Md des données year -2.md" decisions/*.json
+    mirage-sim --session mirage_session.json --format csv --fields resultat_net,tresorerie_estimee
+    mirage-sim --session scenarios.mrsn --jobs 4 > results.json
+
+The initial state comes from a markdown report or a saved session (JSON
+download or .mrsn snapshot). Decisions come from the files given (JSON or
+.mrsn, one or many scenarios each) or, without files, from the session.
+Only the calculator and the stdlib-only modules around it are imported: no
+Streamlit, pandas or NumPy.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .calculator import calculate_all
+from .models import AllDecisions, CalculatedResults, PeriodState
+from .schema import DECISIONS_SCHEMA, RESULTS_SCHEMA, STATE_SCHEMA
+
+# (source label, decisions, forecasts)
+Scenario = Tuple[str, AllDecisions, Optional[Dict[str, int]]]
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _from_dict(schema, bindings, data: Dict[str, Any], base: Any) -> Any:
+    if any(key in bindings.keys for key in data):
+        return bindings.build(data, base=base)
+    flat = _flatten(data)
+    unknown = [path for path in flat if path not in schema]
+    if unknown:
+        raise ValueError(
+            f"Champs inconnus pour {schema.model.__name__}: {', '.join(sorted(unknown)[:5])}"
+        )
+    return schema.from_flat(flat, base=base)
+
+
+def decisions_from_dict(data: Dict[str, Any], base: Optional[AllDecisions] = None) -> AllDecisions:
+    """
+    AllDecisions from a JSON object: nested like dataclasses.asdict(), flat
+    schema paths ('produit_a_ct.prix_tarif'), or app widget keys ('a_ct_prix').
+    Fields absent from `data` keep their value in `base` (defaults otherwise).
+    """
+    from .binding import DECISION_BINDINGS
+
+    return _from_dict(DECISIONS_SCHEMA, DECISION_BINDINGS, data, base)
+
+
+def state_from_dict(data: Dict[str, Any], base: Optional[PeriodState] = None) -> PeriodState:
+    """PeriodState from a JSON object, in the same forms as decisions_from_dict ('s_cash'...)."""
+    from .binding import STATE_BINDINGS
+
+    return _from_dict(STATE_SCHEMA, STATE_BINDINGS, data, base)
+
+
+def load_state(report: Optional[str], session: Optional[str]) -> Tuple[PeriodState, List[Scenario]]:
+    """Initial state (and the session's own decisions, if any) from --report / --session."""
+    if report:
+        from .parser import extract_period_state, parse_mirage_markdown
+
+        with open(report, "r", encoding="utf-8") as f:
+            return extract_period_state(parse_mirage_markdown(f.read())), []
+    if session:
+        path = Path(session)
+        raw = path.read_bytes()
+        if raw.startswith(b"MRSN"):
+            from .snapshot import loads
+
+            snaps = loads(raw)
+            scenarios = [
+                (f"{path.name}#{i}", s.decisions, s.forecasts or None)
+                for i, s in enumerate(snaps)
+            ]
+            return (snaps[0].state if snaps else PeriodState()), scenarios
+        from .binding import DECISION_BINDINGS, STATE_BINDINGS
+        from .utils import deserialize_simulation_state
+
+        data = deserialize_simulation_state(raw.decode("utf-8"))
+        if not data:
+            raise ValueError(f"Session illisible: {session}")
+        base = data.get("state") if isinstance(data.get("state"), PeriodState) else None
+        state = STATE_BINDINGS.build(data, base=base)
+        if "period_selector_val" in data:
+            state.period_num = data["period_selector_val"]
+        return state, [(path.name, DECISION_BINDINGS.build(data), None)]
+    return PeriodState(), []
+
+
+def load_decision_files(
+    paths: Sequence[str], base: Optional[AllDecisions] = None
+) -> List[Scenario]:
+    """
+    Scenarios of each file: a JSON object, a JSON list of objects (partial
+    decisions applied over `base`), or a .mrsn snapshot.
+    """
+    scenarios: List[Scenario] = []
+    for name in paths:
+        path = Path(name)
+        raw = path.read_bytes()
+        if raw.startswith(b"MRSN"):
+            from .snapshot import loads
+
+            for i, snap in enumerate(loads(raw)):
+                scenarios.append((f"{path.name}#{i}", snap.decisions, snap.forecasts or None))
+            continue
+        data = json.loads(raw.decode("utf-8"))
+        items = data if isinstance(data, list) else [data]
+        for i, item in enumerate(items):
+            label = path.name if len(items) == 1 else f"{path.name}#{i}"
+            if not isinstance(item, dict):
+                raise ValueError(f"{label}: objet JSON attendu, {type(item).__name__} trouvé")
+            forecasts = item.pop("forecasts", None)
+            scenarios.append((label, decisions_from_dict(item, base), forecasts))
+    return scenarios
+
+
+def _evaluate(
+    args: Tuple[AllDecisions, PeriodState, Optional[Dict[str, int]]]
+) -> CalculatedResults:
+    decisions, state, forecasts = args
+    return calculate_all(decisions, state, forecast_sales=forecasts)
+
+
+def evaluate(
+    scenarios: Sequence[Scenario], state: PeriodState, jobs: int = 1
+) -> List[CalculatedResults]:
+    """calculate_all for each scenario, in `jobs` processes when there is more than one."""
+    work = [(decisions, state, forecasts) for _, decisions, forecasts in scenarios]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_evaluate, work, chunksize=max(1, len(work) // (jobs * 4))))
+    return [_evaluate(item) for item in work]
+
+
+def result_values(
+    result: CalculatedResults, fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """{field: value} of a result (every field of RESULTS_SCHEMA by default)."""
+    if not fields:
+        return RESULTS_SCHEMA.to_flat(result)
+    return {name: RESULTS_SCHEMA.get(result, name) for name in fields}
+
+
+def write_results(
+    scenarios: Sequence[Scenario],
+    results: Iterable[CalculatedResults],
+    fields: Optional[List[str]],
+    fmt: str,
+    out=None,
+) -> None:
+    out = out or sys.stdout
+    fields = fields or [spec.path for spec in RESULTS_SCHEMA]
+    rows = []
+    for (label, _, _), result in zip(scenarios, results):
+        rows.append({"source": label, **result_values(result, fields)})
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=["source"] + fields, lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            if "warnings" in row:
+                row["warnings"] = "; ".join(row["warnings"])
+            writer.writerow(row)
+    else:
+        json.dump(rows, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="mirage-sim", description="Évalue des fichiers de décisions sans Streamlit."
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--report", help="Rapport markdown donnant l'état initial")
+    source.add_argument("--session", help="Session sauvegardée (.json ou .mrsn)")
+    parser.add_argument("decisions", nargs="*", help="Fichiers de décisions (.json ou .mrsn)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--fields", help="Résultats à sortir, séparés par des virgules")
+    parser.add_argument("--jobs", type=int, default=1, help="Processus de calcul (défaut 1)")
+    args = parser.parse_args(argv)
+
+    fields = [name.strip() for name in args.fields.split(",")] if args.fields else None
+    unknown = [name for name in fields or [] if name not in RESULTS_SCHEMA]
+    if unknown:
+        parser.error(f"Résultats inconnus: {', '.join(unknown)}")
+
+    try:
+        state, scenarios = load_state(args.report, args.session)
+        if args.decisions:
+            base = scenarios[0][1] if scenarios else None
+            scenarios = load_decision_files(args.decisions, base)
+    except (OSError, ValueError) as e:
+        print(f"mirage-sim: {e}", file=sys.stderr)
+        return 1
+    if not scenarios:
+        scenarios = [("defaut", AllDecisions(), None)]
+
+    results = evaluate(scenarios, state, max(1, args.jobs))
+    write_results(scenarios, results, fields, args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
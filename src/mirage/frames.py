@@ -0,0 +1,108 @@
+"""Report tables parsed straight into pandas DataFrames."""
+
+import re
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .parser import (
+    SECTION_ALIASES,
+    SectionIndex,
+    parse_number_column,
+    split_table_row,
+)
+
+# A cell counts as numeric once markdown markers are gone: digits with space or
+# dot thousands, decimal comma, optional sign or parentheses and unit suffix.
+_NUMERIC_CELL = re.compile(r"[-+]?\(?-?[\d\s.,]*\d[\d\s.,]*\)?\s*(?:K€|KE|€|%)?")
+# Yes/no flags ('-N-', '-O-', 'Y') found in otherwise numeric columns
+_FLAG_CELL = re.compile(r"-?[NOY]-?")
+
+
+def _unique_columns(names: List[str]) -> List[str]:
+    """Make header names unique the way pandas.read_csv does ('Value', 'Value.1')."""
+    seen: Dict[str, int] = {}
+    out = []
+    for name in names:
+        if name in seen:
+            seen[name] += 1
+            out.append(f"{name}.{seen[name]}")
+        else:
+            seen[name] = 0
+            out.append(name)
+    return out
+
+
+def _block_frame(block: List[List[str]]) -> pd.DataFrame:
+    """
+    Build a DataFrame from the rows of one table: first row = header, first column = index.
+
+    Columns whose non-empty cells are all numeric are converted to float64. Empty
+    cells, and the yes/no flags some numeric columns carry ('Emballages Recyclés'),
+    become NaN; the flags stay available through Report. Other columns stay strings.
+    """
+    header = block[0]
+    width = max(len(row) for row in block)
+    names = list(header) + [""] * (width - len(header))
+    names = _unique_columns([name or str(j) for j, name in enumerate(names)])
+
+    # Column-wise lists go straight into the DataFrame constructor (no row transpose)
+    columns: List[List[str]] = [[] for _ in range(width)]
+    for row in block[1:]:
+        for j in range(width):
+            columns[j].append(row[j] if j < len(row) else "")
+
+    data = {}
+    for name, cells in zip(names[1:], columns[1:]):
+        numeric = [bool(_NUMERIC_CELL.fullmatch(c)) for c in cells]
+        if any(numeric) and all(
+            ok or not c or _FLAG_CELL.fullmatch(c) for ok, c in zip(numeric, cells)
+        ):
+            values = np.array(parse_number_column(cells), dtype="float64")
+            values[[not ok for ok in numeric]] = np.nan
+            data[name] = values
+        else:
+            data[name] = cells
+    index = pd.Index(columns[0], name=header[0] or "label")
+    return pd.DataFrame(data, index=index, columns=names[1:])
+
+
+def section_frames(
+    content: Union[str, SectionIndex], table_headers: List[str], nested: bool = False
+) -> List[pd.DataFrame]:
+    """One DataFrame per markdown table found in the section (in document order)."""
+    index = content if isinstance(content, SectionIndex) else SectionIndex(content)
+    span = index.find(table_headers, nested=nested)
+    if span is None:
+        return []
+
+    frames = []
+    block: List[List[str]] = []
+    for line in index.lines[span[0]:span[1]]:
+        if "|" in line:
+            cells = split_table_row(line.strip())
+            if cells is not None:
+                block.append(cells)
+            continue
+        if line.strip() and block:
+            # Text between two tables closes the current one
+            frames.append(_block_frame(block))
+            block = []
+    if block:
+        frames.append(_block_frame(block))
+    return frames
+
+
+def section_frame(
+    content: Union[str, SectionIndex], table_headers: List[str], nested: bool = False
+) -> Optional[pd.DataFrame]:
+    """The first table of the section as a DataFrame indexed by row label, or None."""
+    frames = section_frames(content, table_headers, nested=nested)
+    return frames[0] if frames else None
+
+
+def parse_mirage_frames(content: Union[str, SectionIndex]) -> Dict[str, Optional[pd.DataFrame]]:
+    """DataFrame counterpart of parse_mirage_markdown (one frame per known section)."""
+    index = content if isinstance(content, SectionIndex) else SectionIndex(content)
+    return {name: section_frame(index, headers) for name, headers in SECTION_ALIASES.items()}
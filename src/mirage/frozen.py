@@ -0,0 +1,166 @@
+"""
+Immutable, slotted counterparts of the models, usable as dict / LRU cache keys.
+
+Each Frozen* class mirrors the fields of its mutable model (generated from it, so
+the two never drift apart), stores them in __slots__ instead of a per-instance
+__dict__, and computes its hash once at construction. Lists (warnings) become
+tuples and nested decisions are frozen recursively.
+
+    key = FrozenAllDecisions.freeze(decisions)   # AllDecisions -> frozen
+    decisions = key.thaw()                       # frozen -> new AllDecisions
+"""
+
+import dataclasses
+from typing import Any, Dict, Optional
+
+from .models import (
+    AllDecisions,
+    ApprovisionnementDecision,
+    CalculatedResults,
+    FinanceDecision,
+    MarketingDecision,
+    PeriodState,
+    ProductDecision,
+    ProductionDecision,
+    RSEDecision,
+    TitresDecision,
+)
+
+
+def _frozen_variant(model: type, nested: Optional[Dict[str, type]] = None) -> type:
+    """Build the frozen, slotted, hash-cached dataclass mirroring `model`."""
+    nested = nested or {}
+    specs = []
+    names = []
+    list_fields = set()
+    for f in dataclasses.fields(model):
+        names.append(f.name)
+        if f.name in nested:
+            frozen_type = nested[f.name]
+            specs.append((f.name, frozen_type, dataclasses.field(default=frozen_type())))
+        elif f.default_factory is not dataclasses.MISSING:
+            # Only list fields use a factory in models.py (CalculatedResults.warnings)
+            list_fields.add(f.name)
+            specs.append((f.name, tuple, dataclasses.field(default=())))
+        else:
+            specs.append((f.name, f.type, dataclasses.field(default=f.default)))
+    specs.append(
+        ("_hash", int, dataclasses.field(default=0, init=False, repr=False, compare=False))
+    )
+    names = tuple(names)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash(tuple([getattr(self, n) for n in names])))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        # Rebuild through __init__: str hashes differ between processes
+        return type(self), tuple([getattr(self, n) for n in names])
+
+    def freeze(cls, obj):
+        """Frozen copy of a mutable model instance (returned as is if already frozen)."""
+        if isinstance(obj, cls):
+            return obj
+        values = {}
+        for name in names:
+            value = getattr(obj, name)
+            if name in nested:
+                value = nested[name].freeze(value)
+            elif name in list_fields:
+                value = tuple(value)
+            values[name] = value
+        return cls(**values)
+
+    def thaw(self):
+        """New mutable model instance with the same values."""
+        values = {}
+        for name in names:
+            value = getattr(self, name)
+            if name in nested:
+                value = value.thaw()
+            elif name in list_fields:
+                value = list(value)
+            values[name] = value
+        return model(**values)
+
+    def replace(self, **changes: Any):
+        """Copy with some fields changed (dataclasses.replace with a fresh hash)."""
+        return dataclasses.replace(self, **changes)
+
+    namespace = {
+        "__doc__": f"Version immuable de {model.__name__}.",
+        # Needed for pickling (make_dataclass only takes module= from Python 3.12)
+        "__module__": __name__,
+        "__post_init__": __post_init__,
+        "__hash__": __hash__,
+        "__reduce__": __reduce__,
+        "freeze": classmethod(freeze),
+        "thaw": thaw,
+        "replace": replace,
+        "model": model,
+        "field_names": names,
+    }
+    return dataclasses.make_dataclass(
+        f"Frozen{model.__name__}",
+        specs,
+        namespace=namespace,
+        frozen=True,
+        slots=True,
+    )
+
+
+FrozenProductDecision = _frozen_variant(ProductDecision)
+FrozenMarketingDecision = _frozen_variant(MarketingDecision)
+FrozenApprovisionnementDecision = _frozen_variant(ApprovisionnementDecision)
+FrozenProductionDecision = _frozen_variant(ProductionDecision)
+FrozenRSEDecision = _frozen_variant(RSEDecision)
+FrozenFinanceDecision = _frozen_variant(FinanceDecision)
+FrozenTitresDecision = _frozen_variant(TitresDecision)
+
+FrozenAllDecisions = _frozen_variant(
+    AllDecisions,
+    nested={
+        "produit_a_ct": FrozenProductDecision,
+        "produit_a_gs": FrozenProductDecision,
+        "produit_b_ct": FrozenProductDecision,
+        "produit_b_gs": FrozenProductDecision,
+        "produit_c_ct": FrozenProductDecision,
+        "produit_c_gs": FrozenProductDecision,
+        "marketing": FrozenMarketingDecision,
+        "approvisionnement": FrozenApprovisionnementDecision,
+        "production": FrozenProductionDecision,
+        "rse": FrozenRSEDecision,
+        "finance": FrozenFinanceDecision,
+        "titres": FrozenTitresDecision,
+    },
+)
+FrozenPeriodState = _frozen_variant(PeriodState)
+FrozenCalculatedResults = _frozen_variant(CalculatedResults)
+
+_FROZEN_BY_MODEL = {
+    cls.model: cls
+    for cls in (
+        FrozenProductDecision,
+        FrozenMarketingDecision,
+        FrozenApprovisionnementDecision,
+        FrozenProductionDecision,
+        FrozenRSEDecision,
+        FrozenFinanceDecision,
+        FrozenTitresDecision,
+        FrozenAllDecisions,
+        FrozenPeriodState,
+        FrozenCalculatedResults,
+    )
+}
+
+
+def freeze(obj: Any) -> Any:
+    """Frozen counterpart of any model instance (AllDecisions, PeriodState...)."""
+    frozen_type = _FROZEN_BY_MODEL.get(type(obj))
+    if frozen_type is None:
+        if type(obj) in _FROZEN_BY_MODEL.values():
+            return obj
+        raise TypeError(f"Pas de version immuable pour {type(obj).__name__}")
+    return frozen_type.freeze(obj)
@@ -0,0 +1,212 @@
+"""
+Undo/redo history of decision and state edits.
+
+Each version holds frozen decisions and state (mirage.frozen). Subtrees that did
+not change are the very same objects as in the previous version, so a version
+costs one new FrozenAllDecisions plus the sections actually edited. The delta
+against the previous version (path, old, new) is kept for display. Results are
+cached by content (decisions, state, sales forecasts), so jumping back to any
+version does not rerun calculate_all.
+
+    history = EditHistory()
+    history.commit(decisions, state)          # new Version, or None if nothing changed
+    results = history.results(lambda: calculate_all(...), forecasts)
+    history.undo(); history.redo(); history.goto(version_id)
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .frozen import FrozenAllDecisions, FrozenPeriodState, freeze
+
+Delta = Tuple[Tuple[str, Any, Any], ...]
+
+
+@dataclass(frozen=True)
+class Version:
+    """One point of the history; decisions and state are shared with neighbours when unchanged."""
+
+    id: int
+    decisions: FrozenAllDecisions
+    state: FrozenPeriodState
+    delta: Delta = ()
+    label: str = ""
+    created: float = 0.0
+
+
+def _diff(old: Any, new: Any, prefix: str = "") -> List[Tuple[str, Any, Any]]:
+    """Changed leaves between two frozen objects, skipping equal subtrees."""
+    changes = []
+    for name in type(new).field_names:
+        a, b = getattr(old, name), getattr(new, name)
+        if a is b or a == b:
+            continue
+        if hasattr(type(b), "field_names"):
+            changes += _diff(a, b, f"{prefix}{name}.")
+        else:
+            changes.append((f"{prefix}{name}", a, b))
+    return changes
+
+
+def _share(old: Any, new: Any) -> Any:
+    """`new` rebuilt so that every subtree equal to `old`'s is `old`'s object."""
+    if old == new:
+        return old
+    cls = type(new)
+    values = {}
+    for name in cls.field_names:
+        a, b = getattr(old, name), getattr(new, name)
+        if hasattr(type(b), "field_names"):
+            b = _share(a, b)
+        values[name] = b
+    return cls(**values)
+
+
+class EditHistory:
+    """
+    Linear history with a cursor: undo/redo move the cursor, a new commit after
+    an undo drops the redo branch. The first commit is the initial version.
+    Keeps at most `max_versions` versions and `max_results` cached results
+    (least recently used first out).
+    """
+
+    def __init__(self, max_versions: int = 200, max_results: int = 256):
+        self.max_versions = max_versions
+        self.max_results = max_results
+        self._next_id = 0
+        self._results: "OrderedDict[Tuple[Any, Any, Any], Any]" = OrderedDict()
+        self.versions: List[Version] = []
+        self.cursor = -1
+
+    def _version(self, decisions, state, delta: Delta = (), label: str = "") -> Version:
+        version = Version(
+            id=self._next_id,
+            decisions=decisions,
+            state=state,
+            delta=delta,
+            label=label,
+            created=time.time(),
+        )
+        self._next_id += 1
+        return version
+
+    # -------------------------------------------------------------------------
+    # Navigation
+    # -------------------------------------------------------------------------
+
+    @property
+    def current(self) -> Optional[Version]:
+        return self.versions[self.cursor] if self.versions else None
+
+    @property
+    def can_undo(self) -> bool:
+        return self.cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self.cursor < len(self.versions) - 1
+
+    def undo(self) -> Optional[Version]:
+        if not self.can_undo:
+            return None
+        self.cursor -= 1
+        return self.current
+
+    def redo(self) -> Optional[Version]:
+        if not self.can_redo:
+            return None
+        self.cursor += 1
+        return self.current
+
+    def goto(self, version_id: int) -> Version:
+        for i, version in enumerate(self.versions):
+            if version.id == version_id:
+                self.cursor = i
+                return version
+        raise KeyError(f"Version inconnue: {version_id}")
+
+    # -------------------------------------------------------------------------
+    # Enregistrement
+    # -------------------------------------------------------------------------
+
+    def commit(self, decisions: Any, state: Any, label: str = "") -> Optional[Version]:
+        """Record a new version if anything differs from the current one, else None."""
+        current = self.current
+        if current is None:
+            version = self._version(freeze(decisions), freeze(state), label=label or "initial")
+            self.versions.append(version)
+            self.cursor = 0
+            return version
+
+        new_decisions = _share(current.decisions, freeze(decisions))
+        new_state = _share(current.state, freeze(state))
+        if new_decisions is current.decisions and new_state is current.state:
+            return None
+
+        delta = [(f"decisions.{p}", a, b) for p, a, b in _diff(current.decisions, new_decisions)]
+        delta += [(f"state.{p}", a, b) for p, a, b in _diff(current.state, new_state)]
+        version = self._version(new_decisions, new_state, tuple(delta), label)
+        del self.versions[self.cursor + 1:]
+        self.versions.append(version)
+        if len(self.versions) > self.max_versions:
+            del self.versions[: len(self.versions) - self.max_versions]
+        self.cursor = len(self.versions) - 1
+        return version
+
+    # -------------------------------------------------------------------------
+    # Résultats
+    # -------------------------------------------------------------------------
+
+    def _key(self, version: Optional[Version], forecasts: Optional[Mapping[str, int]]):
+        version = version or self.current
+        return version.decisions, version.state, tuple(sorted((forecasts or {}).items()))
+
+    def results(
+        self,
+        compute: Callable[[], Any],
+        forecasts: Optional[Mapping[str, int]] = None,
+        version: Optional[Version] = None,
+    ) -> Any:
+        """
+        Cached results of a version (the current one by default) with these
+        forecasts; `compute()` runs only on a miss.
+        """
+        key = self._key(version, forecasts)
+        hit = self._results.get(key)
+        if hit is not None:
+            self._results.move_to_end(key)
+            return hit
+        value = compute()
+        self._results[key] = value
+        if len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        return value
+
+    def cached_results(
+        self, forecasts: Optional[Mapping[str, int]] = None, version: Optional[Version] = None
+    ) -> Optional[Any]:
+        return self._results.get(self._key(version, forecasts))
+
+    def describe(self, version: Version, limit: int = 3) -> str:
+        """Short text of a version's changes, e.g. 'produit_a_ct.prix_tarif: 20.6 → 21.0'."""
+        if version.label and not version.delta:
+            return version.label
+        parts = [
+            f"{path.partition('.')[2]}: {old} → {new}" for path, old, new in version.delta[:limit]
+        ]
+        if len(version.delta) > limit:
+            parts.append(f"+{len(version.delta) - limit}")
+        return ", ".join(parts)
+
+    def widget_values(self, version: Version) -> Dict[str, Any]:
+        """{widget key: value} restoring a version into the session (see mirage.binding)."""
+        from .binding import DECISION_BINDINGS, STATE_BINDINGS
+
+        values = DECISION_BINDINGS.widget_values(version.decisions)
+        values.update(STATE_BINDINGS.widget_values(version.state))
+        return values
+
+    def __len__(self) -> int:
+        return len(self.versions)
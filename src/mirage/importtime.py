@@ -0,0 +1,166 @@
+"""
+Import-time report and budget check: `python -m mirage.importtime`.
+
+Each module is imported in a fresh interpreter (`python -X importtime`, best
+of a few runs) and checked against a time budget and a list of heavy
+packages it must not pull in:
+
+    $ python -m mirage.importtime
+    module                  ms   budget  modules  heavy
+    mirage                 0.8      5.0        1  -
+    mirage.calculator     10.3     60.0       28  -
+    mirage.cli            23.6     80.0       95  -
+    ...
+    mirage.frames        129.0    400.0      530  numpy, pandas
+
+Exits with status 1 if a budget is exceeded or a forbidden package is loaded,
+so it can gate CI. `--top N` lists the slowest imports (self time) per module.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Packages the light modules (calculator path, CLI, server) must not import
+HEAVY = ("numpy", "pandas", "plotly", "pyarrow", "openpyxl", "streamlit")
+
+
+@dataclass(frozen=True)
+class Budget:
+    module: str
+    ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+# Budgets leave room for slow machines; the forbidden lists are the real contract.
+BUDGETS: List[Budget] = [
+    Budget("mirage", 5.0, HEAVY),
+    Budget("mirage.models", 40.0, HEAVY),
+    Budget("mirage.calculator", 60.0, HEAVY),
+    Budget("mirage.parser", 60.0, HEAVY),
+    Budget("mirage.schema", 60.0, HEAVY),
+    Budget("mirage.binding", 60.0, HEAVY),
+    Budget("mirage.snapshot", 60.0, HEAVY),
+    Budget("mirage.history", 60.0, HEAVY),
+    Budget("mirage.library", 80.0, HEAVY),
+    Budget("mirage.jobs", 60.0, HEAVY),
+    Budget("mirage.cli", 80.0, HEAVY),
+    Budget("mirage.server", 100.0, HEAVY),
+    Budget("mirage.sweep", 200.0, ("pandas", "plotly", "streamlit")),
+    Budget("mirage.frames", 400.0, ("plotly", "streamlit")),
+]
+
+_PROBE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+@dataclass
+class Measure:
+    module: str
+    ms: float
+    modules: List[str]
+    # (self µs, name) of the slowest imports, from -X importtime
+    slowest: List[Tuple[int, str]] = field(default_factory=list)
+
+    def heavy(self, packages: Sequence[str] = HEAVY) -> List[str]:
+        loaded = {name.partition(".")[0] for name in self.modules}
+        return [p for p in packages if p in loaded]
+
+
+def _parse_importtime(stderr: str, modules: Sequence[str]) -> List[Tuple[int, str]]:
+    wanted = set(modules)
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        if name in wanted:
+            timings.append((int(parts[0]), name))
+    return sorted(timings, reverse=True)
+
+
+def measure(module: str, runs: int = 3, path: Optional[str] = None) -> Measure:
+    """Best of `runs` cold imports of `module` in fresh interpreters."""
+    path = path or str(Path(__file__).resolve().parents[1])
+    best: Optional[Measure] = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": path},
+        )
+        if proc.returncode != 0:
+            last = proc.stderr.strip().splitlines()[-1]
+            raise RuntimeError(f"import {module} a échoué:\n{last}")
+        data = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or data["ms"] < best.ms:
+            best = Measure(module, data["ms"], data["modules"],
+                           _parse_importtime(proc.stderr, data["modules"]))
+    return best
+
+
+def check(
+    budgets: Sequence[Budget] = BUDGETS, runs: int = 3
+) -> List[Tuple[Budget, Measure, List[str]]]:
+    """(budget, measure, problems) for each module; problems is empty when it passes."""
+    report = []
+    for budget in budgets:
+        m = measure(budget.module, runs)
+        problems = []
+        if m.ms > budget.ms:
+            problems.append(f"{m.ms:.1f} ms > {budget.ms:.1f} ms")
+        loaded = m.heavy(budget.forbidden)
+        if loaded:
+            problems.append(f"charge {', '.join(loaded)}")
+        report.append((budget, m, problems))
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="mirage.importtime", description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", help="Modules à mesurer (défaut: tous les budgets)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0, help="Imports les plus lents par module")
+    parser.add_argument("--json", action="store_true", help="Rapport en JSON")
+    args = parser.parse_args(argv)
+
+    by_name: Dict[str, Budget] = {b.module: b for b in BUDGETS}
+    budgets = [by_name.get(name, Budget(name, float("inf"))) for name in args.modules] or BUDGETS
+    report = check(budgets, max(1, args.runs))
+
+    if args.json:
+        json.dump([
+            {"module": b.module, "ms": round(m.ms, 2), "budget_ms": b.ms, "modules": len(m.modules),
+             "heavy": m.heavy(), "problems": problems, "slowest": m.slowest[:args.top]}
+            for b, m, problems in report
+        ], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        width = max(len(b.module) for b, _, _ in report)
+        print(f"{'module':<{width}} {'ms':>8} {'budget':>8} {'modules':>8}  heavy")
+        for b, m, problems in report:
+            status = "  ÉCHEC: " + "; ".join(problems) if problems else ""
+            print(f"{b.module:<{width}} {m.ms:8.1f} {b.ms:8.1f} {len(m.modules):8d}  "
+                  f"{', '.join(m.heavy()) or '-'}{status}")
+            for us, name in m.slowest[:args.top]:
+                print(f"    {us / 1000:8.1f} ms  {name}")
+    return 1 if any(problems for _, _, problems in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
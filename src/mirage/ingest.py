@@ -0,0 +1,209 @@
+"""Bulk ingestion of a directory of Mirage reports into a long-format dataset."""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from .cache import content_hash
+from .models import PeriodState
+from .parser import SECTION_ALIASES, parse_number_column
+from .report import REPORT_SECTION_ALIASES, Report
+
+TIDY_COLUMNS = ["file", "hash", "period", "section", "row_label", "column", "value"]
+
+# Sections of the legacy table set that have no typed counterpart
+# ("balance_sheet" is the same table as the typed "bilan").
+_RAW_SECTIONS = [name for name in SECTION_ALIASES if name != "balance_sheet"]
+
+# Reports carry no period: it comes from the file name ("... year -2.md", "periode 3")
+PERIOD_PATTERN = r"(?:year|ann[ée]e|p[ée]riode|period|trimestre|quarter)\s*(-?\d+)"
+
+
+def period_from_name(name: Union[str, Path], pattern: str = PERIOD_PATTERN) -> Optional[int]:
+    """Period number found in a file name by `pattern` (first group), or None."""
+    match = re.search(pattern, Path(name).stem, re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class IngestResult:
+    """Tidy records of every ingested file plus its PeriodState (keyed by file path)."""
+
+    frame: pd.DataFrame
+    states: Dict[str, PeriodState] = field(default_factory=dict)
+    hashes: Dict[str, str] = field(default_factory=dict)
+    periods: Dict[str, Optional[int]] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+
+def report_records(
+    report: Report, file: str, digest: str, period: Optional[int] = None
+) -> List[tuple]:
+    """
+    Flatten every section of a report into (file, hash, period, section, row_label,
+    column, value) tuples.
+
+    The report itself does not say which period it covers: `period` is given
+    by the caller (None when unknown). The first row of a section provides the
+    column names; empty cells and non-numeric cells ('-N-', '100-N'...) are dropped.
+    """
+    sections: List[Tuple[str, List[List[str]]]] = [
+        (name, report.tables[name]) for name in _RAW_SECTIONS
+    ]
+    sections += [(name, report.section_rows(name)) for name in REPORT_SECTION_ALIASES]
+
+    records = []
+    for section, rows in sections:
+        if not rows:
+            continue
+        header = rows[0]
+        keys = []
+        cells = []
+        for row in rows[1:]:
+            label = row[0]
+            for j in range(1, len(row)):
+                cell = row[j]
+                if not cell or not any(ch.isdigit() for ch in cell):
+                    continue
+                keys.append((label, header[j] if j < len(header) and header[j] else str(j)))
+                cells.append(cell)
+        for (label, column), value in zip(keys, parse_number_column(cells)):
+            records.append((file, digest, period, section, label, column, value))
+    return records
+
+
+def _ingest_one(
+    path: str, digest: str, period: Optional[int]
+) -> Tuple[str, str, PeriodState, List[tuple]]:
+    with open(path, "r", encoding="utf-8") as f:
+        report = Report(f.read())
+    return path, digest, report.period_state, report_records(report, path, digest, period)
+
+
+def ingest_files(
+    paths: Iterable[Union[str, Path]],
+    known_hashes: Optional[Set[str]] = None,
+    workers: Optional[int] = None,
+    periods: Optional[Mapping[str, int]] = None,
+    period_pattern: Optional[str] = PERIOD_PATTERN,
+) -> IngestResult:
+    """
+    Parse report files across a process pool.
+
+    Files whose SHA-256 is in `known_hashes`, or duplicates of a file already
+    seen in this batch, are skipped without being parsed.
+
+    The period of each file comes from `periods` (keyed by path or file name),
+    else from its name with `period_pattern` (None disables it), else is None.
+    """
+    periods = periods or {}
+    seen = set(known_hashes or ())
+    todo: List[Tuple[str, str, Optional[int]]] = []
+    skipped: List[str] = []
+    for path in paths:
+        path = str(path)
+        with open(path, "rb") as f:
+            digest = content_hash(f.read())
+        if digest in seen:
+            skipped.append(path)
+            continue
+        seen.add(digest)
+        period = periods.get(path, periods.get(Path(path).name))
+        if period is None and period_pattern:
+            period = period_from_name(path, period_pattern)
+        todo.append((path, digest, period))
+
+    if workers is None:
+        workers = min(len(todo), os.cpu_count() or 1)
+
+    if workers <= 1 or len(todo) <= 1:
+        results = [_ingest_one(*item) for item in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_ingest_one, *zip(*todo)))
+
+    records: List[tuple] = []
+    result = IngestResult(frame=pd.DataFrame(columns=TIDY_COLUMNS), skipped=skipped)
+    for (path, digest, state, file_records), (_, _, period) in zip(results, todo):
+        result.states[path] = state
+        result.hashes[path] = digest
+        result.periods[path] = period
+        records.extend(file_records)
+    if records:
+        result.frame = pd.DataFrame.from_records(records, columns=TIDY_COLUMNS)
+    return result
+
+
+def ingest_directory(
+    directory: Union[str, Path],
+    pattern: str = "*.md",
+    known_hashes: Optional[Set[str]] = None,
+    workers: Optional[int] = None,
+    periods: Optional[Mapping[str, int]] = None,
+    period_pattern: Optional[str] = PERIOD_PATTERN,
+) -> IngestResult:
+    """Ingest every report matching `pattern` under `directory` (recursively)."""
+    paths = sorted(Path(directory).rglob(pattern))
+    return ingest_files(paths, known_hashes, workers, periods, period_pattern)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Ingère un dossier d'exports Mirage (.md) en un jeu de données long."
+    )
+    parser.add_argument("directory", help="Dossier contenant les exports markdown")
+    parser.add_argument("-o", "--output", help="Fichier CSV de sortie (stdout par défaut)")
+    parser.add_argument("--pattern", default="*.md", help="Motif des fichiers (défaut: *.md)")
+    parser.add_argument("--jobs", type=int, default=None, help="Nombre de processus")
+    parser.add_argument(
+        "--period", action="append", default=[], metavar="FICHIER=N",
+        help="Période d'un fichier (répétable), prioritaire sur le nom du fichier",
+    )
+    parser.add_argument(
+        "--period-pattern", default=PERIOD_PATTERN,
+        help="Expression régulière extrayant la période du nom de fichier (1er groupe)",
+    )
+    args = parser.parse_args(argv)
+
+    periods: Dict[str, int] = {}
+    for item in args.period:
+        name, sep, value = item.rpartition("=")
+        try:
+            periods[name] = int(value)
+        except ValueError:
+            sep = ""
+        if not sep:
+            parser.error(f"--period attend FICHIER=N, pas {item!r}")
+
+    # Appending to an existing dataset only ingests the new files
+    known: Set[str] = set()
+    existing = None
+    if args.output and Path(args.output).exists():
+        existing = pd.read_csv(args.output)
+        known = set(existing["hash"])
+
+    result = ingest_directory(
+        args.directory, args.pattern, known, args.jobs, periods, args.period_pattern or None
+    )
+    frame = result.frame if existing is None else pd.concat([existing, result.frame])
+
+    if args.output:
+        frame.to_csv(args.output, index=False)
+    else:
+        frame.to_csv(sys.stdout, index=False)
+    print(
+        f"{len(result.states)} fichier(s) ingéré(s), {len(result.skipped)} ignoré(s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
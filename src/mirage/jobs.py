@@ -0,0 +1,181 @@
+"""
+Background jobs (sweeps, Monte Carlo, optimizations) for the Streamlit app.
+
+The app holds one JobManager per server (st.cache_resource): jobs run in its
+worker threads while scripts keep rerunning, report progress and partial
+results through their Job record, can be cancelled, and stay listed once
+finished so later reruns can read them.
+
+    manager = JobManager(workers=2)
+    job = manager.submit_sweep(spec, label="Prix A-CT")
+    job.progress, job.status, job.best ; manager.cancel(job.id)
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Job statuses (displayed as is in the app)
+PENDING = "en attente"
+RUNNING = "en cours"
+DONE = "terminé"
+CANCELLED = "annulé"
+FAILED = "erreur"
+
+
+@dataclass
+class Job:
+    """State of one background job, updated by its worker thread."""
+
+    id: str
+    label: str
+    kind: str = "tâche"
+    status: str = PENDING
+    done: int = 0
+    total: int = 0
+    best: Optional[Dict[str, Any]] = None
+    result: Any = None
+    error: str = ""
+    directory: Any = None
+    # Sweeps: objective column and swept columns of the result files
+    objective: str = ""
+    columns: List[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+
+class JobContext:
+    """What a job function receives to report progress and check for cancellation."""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def progress(self, done: int, total: int, best: Optional[Dict[str, Any]] = None) -> None:
+        self.job.done, self.job.total = done, total
+        if best is not None:
+            self.job.best = best
+
+    def should_stop(self) -> bool:
+        return self.job.cancel_requested
+
+
+class JobManager:
+    """Thread pool running job functions `fn(ctx) -> result`; keeps the last `keep` jobs."""
+
+    def __init__(self, workers: int = 2, keep: int = 50):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mirage-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[JobContext], Any], label: str, kind: str = "tâche") -> Job:
+        job = Job(id=uuid.uuid4().hex[:12], label=label, kind=kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        self._pool.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[JobContext], Any]) -> None:
+        if job.cancel_requested:
+            job.status, job.finished_at = CANCELLED, time.time()
+            return
+        job.status, job.started_at = RUNNING, time.time()
+        try:
+            job.result = fn(JobContext(job))
+            job.status = CANCELLED if job.cancel_requested else DONE
+        except Exception as e:
+            job.status, job.error = FAILED, str(e)
+        job.finished_at = time.time()
+
+    def submit_sweep(self, spec, label: str, job_id: Optional[str] = None, **kwargs: Any) -> Job:
+        """Run mirage.sweep.run_sweep in the background (resumable through its job ID)."""
+        from pathlib import Path
+
+        from .sweep import DEFAULT_RUNS_DIR, default_job_id, run_sweep
+
+        job_id = job_id or default_job_id(spec)
+        directory = Path(kwargs.get("directory") or DEFAULT_RUNS_DIR) / job_id
+        # The same sweep already running: follow it rather than racing on its files
+        for job in self.jobs():
+            if job.directory == directory and not job.finished:
+                return job
+        sign = 1.0 if spec.maximize else -1.0
+
+        def fn(ctx: JobContext):
+            def progress(done, total, results):
+                # Partial best from the chunk just evaluated (run_sweep keeps the exact one)
+                values = results[spec.objective]
+                i = int((sign * values).argmax())
+                best = ctx.job.best
+                if best is None or sign * values[i] > sign * best["value"]:
+                    best = {"value": float(values[i])}
+                ctx.progress(done, total, best)
+
+            outcome = run_sweep(
+                spec, job_id=job_id, progress=progress, should_stop=ctx.should_stop, **kwargs
+            )
+            ctx.job.best = outcome.best
+            return outcome
+
+        job = self.submit(fn, label, kind=spec.mode)
+        job.total = spec.n_chunks
+        job.directory = directory
+        job.objective = spec.objective
+        job.columns = ["row"] + list(spec.axes) + list(spec.ranges)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        return True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        """Every kept job, newest first."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def running(self) -> bool:
+        return any(not job.finished for job in self.jobs())
+
+    def clear_finished(self) -> int:
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+            for job_id in finished:
+                del self._jobs[job_id]
+        return len(finished)
+
+    def _trim(self) -> None:
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished), key=lambda j: j.created_at
+        )
+        while len(self._jobs) > self.keep and finished:
+            del self._jobs[finished.pop(0).id]
+
+    def shutdown(self) -> None:
+        for job in self.jobs():
+            job._cancel.set()
+        self._pool.shutdown(wait=False)
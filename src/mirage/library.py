@@ -0,0 +1,341 @@
+"""
+Local scenario library: named snapshots with period, tags, metadata and results.
+
+One SQLite file replaces loose JSON saves (data/saved_defaults.json, session
+downloads). Scenarios are stored as binary snapshots (mirage.snapshot) and
+indexed by name, period, tag and creation time, so listing and searching
+never decode a scenario.
+
+    with ScenarioLibrary() as lib:
+        lib.save("Prix agressif", snap, tags=["prix", "p1"])
+        for info in lib.search(tag="prix", period=1): ...
+        snap = lib.load("Prix agressif")
+"""
+
+import base64
+import dataclasses
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from .models import CalculatedResults
+from .schema import schema_for
+from .snapshot import Snapshot, dump_one, load_one
+
+DEFAULT_LIBRARY_PATH = Path(__file__).resolve().parents[2] / "data" / "scenarios.sqlite"
+
+# Name under which the app stores its "Sauver Défaut" values
+DEFAULT_SCENARIO = "Défaut"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    period INTEGER,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    snapshot BLOB NOT NULL,
+    results TEXT
+);
+CREATE INDEX IF NOT EXISTS scenarios_period ON scenarios (period);
+CREATE INDEX IF NOT EXISTS scenarios_created ON scenarios (created_at);
+
+CREATE TABLE IF NOT EXISTS scenario_tags (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (tag, scenario_id)
+);
+CREATE INDEX IF NOT EXISTS scenario_tags_scenario ON scenario_tags (scenario_id);
+"""
+
+_INFO_COLUMNS = (
+    "s.id, s.name, s.period, s.created_at, s.updated_at, s.metadata, s.results IS NOT NULL"
+)
+
+
+@dataclass
+class ScenarioInfo:
+    """Index entry of a scenario (everything but the snapshot itself)."""
+
+    id: int
+    name: str
+    period: Optional[int]
+    created_at: float
+    updated_at: float
+    tags: List[str]
+    metadata: Dict[str, Any]
+    has_results: bool = False
+
+
+def _results_to_json(results: CalculatedResults) -> str:
+    return json.dumps(dataclasses.asdict(results))
+
+
+def _results_from_json(text: str) -> CalculatedResults:
+    return schema_for(CalculatedResults).from_flat(json.loads(text))
+
+
+class ScenarioLibrary:
+    """Scenarios indexed by name (unique), period, tags and creation time."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_LIBRARY_PATH):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ScenarioLibrary":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Écriture
+    # -------------------------------------------------------------------------
+
+    def save(
+        self,
+        name: str,
+        snapshot: Snapshot,
+        tags: Iterable[str] = (),
+        metadata: Optional[Mapping[str, Any]] = None,
+        results: Optional[CalculatedResults] = None,
+        created_at: Optional[float] = None,
+    ) -> int:
+        """Insert or replace the scenario `name`. Returns its id."""
+        with self.conn:
+            return self._save(name, snapshot, tags, metadata, results, created_at)
+
+    def _save(self, name, snapshot, tags, metadata, results, created_at) -> int:
+        now = time.time()
+        row = self.conn.execute(
+            "SELECT id, created_at FROM scenarios WHERE name = ?", (name,)
+        ).fetchone()
+        values = (
+            snapshot.state.period_num,
+            now,
+            json.dumps(dict(metadata or {}), ensure_ascii=False),
+            dump_one(snapshot),
+            _results_to_json(results) if results is not None else None,
+        )
+        if row is None:
+            cur = self.conn.execute(
+                "INSERT INTO scenarios"
+                " (name, period, created_at, updated_at, metadata, snapshot, results)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, values[0], created_at or now) + values[1:],
+            )
+            scenario_id = cur.lastrowid
+        else:
+            scenario_id = row[0]
+            self.conn.execute(
+                "UPDATE scenarios SET period = ?, updated_at = ?, metadata = ?, snapshot = ?,"
+                " results = ? WHERE id = ?",
+                values + (scenario_id,),
+            )
+            self.conn.execute("DELETE FROM scenario_tags WHERE scenario_id = ?", (scenario_id,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO scenario_tags (scenario_id, tag) VALUES (?, ?)",
+            [(scenario_id, tag.strip().lower()) for tag in tags if tag.strip()],
+        )
+        return scenario_id
+
+    def set_results(self, name: str, results: CalculatedResults) -> None:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE scenarios SET results = ? WHERE name = ?", (_results_to_json(results), name)
+            )
+
+    def delete(self, name: str) -> bool:
+        with self.conn:
+            return self.conn.execute("DELETE FROM scenarios WHERE name = ?", (name,)).rowcount > 0
+
+    # -------------------------------------------------------------------------
+    # Lecture
+    # -------------------------------------------------------------------------
+
+    def __contains__(self, name: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM scenarios WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def load(self, name: str) -> Snapshot:
+        row = self.conn.execute("SELECT snapshot FROM scenarios WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"Scénario inconnu: {name}")
+        return load_one(row[0])
+
+    def results(self, name: str) -> Optional[CalculatedResults]:
+        row = self.conn.execute("SELECT results FROM scenarios WHERE name = ?", (name,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return _results_from_json(row[0])
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        period: Optional[int] = None,
+        tag: Union[str, Sequence[str], None] = None,
+        since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[ScenarioInfo]:
+        """
+        Scenarios matching every given filter, newest first: `text` in the name,
+        `period`, all of the `tag`s, created at or after `since`.
+        """
+        clauses, params = [], []
+        if text:
+            clauses.append("s.name LIKE ? ESCAPE '\\'")
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if period is not None:
+            clauses.append("s.period = ?")
+            params.append(period)
+        if since is not None:
+            clauses.append("s.created_at >= ?")
+            params.append(since)
+        tags = [tag] if isinstance(tag, str) else list(tag or [])
+        for t in tags:
+            clauses.append("s.id IN (SELECT scenario_id FROM scenario_tags WHERE tag = ?)")
+            params.append(t.strip().lower())
+        sql = f"SELECT {_INFO_COLUMNS} FROM scenarios s"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY s.created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self.conn.execute(sql, params).fetchall()
+        return self._infos(rows)
+
+    def list(self, limit: Optional[int] = None) -> List[ScenarioInfo]:
+        return self.search(limit=limit)
+
+    def info(self, name: str) -> Optional[ScenarioInfo]:
+        rows = self.conn.execute(
+            f"SELECT {_INFO_COLUMNS} FROM scenarios s WHERE s.name = ?", (name,)
+        ).fetchall()
+        infos = self._infos(rows)
+        return infos[0] if infos else None
+
+    def tags(self) -> List[str]:
+        rows = self.conn.execute("SELECT DISTINCT tag FROM scenario_tags ORDER BY tag")
+        return [row[0] for row in rows]
+
+    def _tags_of(self, ids: List[int]) -> Dict[int, List[str]]:
+        tags: Dict[int, List[str]] = {i: [] for i in ids}
+        # Chunks stay under SQLite's bound-variable limit
+        for start in range(0, len(ids), 900):
+            chunk = ids[start:start + 900]
+            placeholders = ", ".join("?" * len(chunk))
+            for scenario_id, tag in self.conn.execute(
+                "SELECT scenario_id, tag FROM scenario_tags"
+                f" WHERE scenario_id IN ({placeholders}) ORDER BY tag",
+                chunk,
+            ):
+                tags[scenario_id].append(tag)
+        return tags
+
+    def _infos(self, rows) -> List[ScenarioInfo]:
+        tags = self._tags_of([row[0] for row in rows])
+        return [
+            ScenarioInfo(
+                id=row[0],
+                name=row[1],
+                period=row[2],
+                created_at=row[3],
+                updated_at=row[4],
+                tags=tags[row[0]],
+                metadata=json.loads(row[5]),
+                has_results=bool(row[6]),
+            )
+            for row in rows
+        ]
+
+    # -------------------------------------------------------------------------
+    # Export / import
+    # -------------------------------------------------------------------------
+
+    def export(self, path: Union[str, Path], names: Optional[Iterable[str]] = None) -> int:
+        """
+        Write scenarios (all, or `names`) as JSON Lines: one object per scenario
+        with its index fields and the snapshot in base64. Returns the count.
+        """
+        sql = "SELECT id, name, created_at, metadata, snapshot, results FROM scenarios"
+        params: List[Any] = []
+        if names is not None:
+            names = list(names)
+            sql += f" WHERE name IN ({', '.join('?' * len(names))})"
+            params = names
+        rows = self.conn.execute(sql + " ORDER BY created_at", params).fetchall()
+        tags = self._tags_of([row[0] for row in rows])
+        with open(path, "w", encoding="utf-8") as f:
+            for scenario_id, name, created_at, metadata, blob, results in rows:
+                f.write(json.dumps({
+                    "name": name,
+                    "created_at": created_at,
+                    "tags": tags[scenario_id],
+                    "metadata": json.loads(metadata),
+                    "snapshot": base64.b64encode(blob).decode("ascii"),
+                    "results": json.loads(results) if results else None,
+                }, ensure_ascii=False) + "\n")
+        return len(rows)
+
+    def import_file(self, path: Union[str, Path], replace: bool = False) -> int:
+        """Load a file written by export(); existing names are skipped unless `replace`."""
+        count = 0
+        with open(path, "r", encoding="utf-8") as f, self.conn:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if not replace and item["name"] in self:
+                    continue
+                results = item.get("results")
+                self._save(
+                    item["name"],
+                    load_one(base64.b64decode(item["snapshot"])),
+                    item.get("tags", []),
+                    item.get("metadata"),
+                    _results_from_json(json.dumps(results)) if results else None,
+                    item.get("created_at"),
+                )
+                count += 1
+        return count
+
+    def import_session_json(
+        self, path: Union[str, Path], name: str, tags: Iterable[str] = ()
+    ) -> int:
+        """Import a legacy flat widget-key JSON (saved_defaults.json, session download)."""
+        from .snapshot import snapshot_from_session
+        from .utils import deserialize_simulation_state
+
+        with open(path, "r", encoding="utf-8") as f:
+            session = deserialize_simulation_state(f.read())
+        metadata = {"source": Path(path).name}
+        if session.get("user_notes"):
+            metadata["notes"] = session["user_notes"]
+        return self.save(name, snapshot_from_session(session), tags, metadata)
+
+
+_default_library: Optional[ScenarioLibrary] = None
+
+
+def get_default_library() -> ScenarioLibrary:
+    global _default_library
+    if _default_library is None:
+        _default_library = ScenarioLibrary()
+    return _default_library
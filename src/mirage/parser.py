@@ -1,9 +1,14 @@
 """Parser for Mirage simulation markdown files."""
 
+import bisect
 import re
-from typing import Optional, List, Dict, Tuple, Any
+from typing import Optional, List, Dict, Tuple, Any, Union, Iterable
 from .models import PeriodState
 
+# Bump whenever the parsed output changes shape or content: cached parses
+# (see cache.py) are keyed on it and silently dropped on mismatch.
+PARSER_VERSION = 1
+
 
 def clean_markdown_cell(cell: str) -> str:
     """Clean markdown artifacts from a cell string."""
@@ -43,85 +48,200 @@ def parse_number(value: str) -> float:
         return 0.0
 
 
+# Characters parse_number drops from a plain cell. Cells holding "K" (K€/KE
+# units), "(" (negative parentheses) or the separators \x1c-\x1f (stripped by
+# str.strip but not by float) keep the parse_number path.
+_NUMBER_TRANSLATION = str.maketrans({"*": None, "_": None, "€": None, "E": None,
+                                     "%": None, " ": None, ",": "."})
+_SLOW_NUMBER_CHARS = re.compile("[K(\x1c-\x1f]")
+_COLUMN_SEPARATOR = "\x00"
+
+
+def _parse_translated(value: str) -> float:
+    if not value or _SLOW_NUMBER_CHARS.search(value):
+        return parse_number(value)
+    try:
+        return float(value.translate(_NUMBER_TRANSLATION) or "0")
+    except ValueError:
+        return 0.0
+
+
+def parse_number_column(values: Iterable[str]) -> List[float]:
+    """
+    Parse a whole column of cells, with exactly the semantics of parse_number.
+
+    The column is joined and translated in one str.translate call, then split
+    and converted; only columns holding units, parentheses or text fall back
+    to converting cell by cell.
+    """
+    values = list(values)
+    if not values:
+        return []
+    joined = _COLUMN_SEPARATOR.join(values)
+    if (
+        not _SLOW_NUMBER_CHARS.search(joined)
+        and joined.count(_COLUMN_SEPARATOR) == len(values) - 1
+    ):
+        parts = joined.translate(_NUMBER_TRANSLATION).split(_COLUMN_SEPARATOR)
+        try:
+            # A cell reduced to nothing ("", "€", "**") is 0.0, as in parse_number
+            return [float(part or "0") for part in parts]
+        except ValueError:
+            pass
+    return [_parse_translated(value) for value in values]
+
+
 def parse_int(value: str) -> int:
     """Parse an integer from string."""
     return int(parse_number(value))
 
 
-def parse_markdown_table(content: str, table_headers: List[str]) -> List[List[str]]:
+# Section aliases used by parse_mirage_markdown, keyed by result name.
+SECTION_ALIASES: Dict[str, List[str]] = {
+    "stocks": ["Stocks"],
+    "balance_sheet": ["Balance Sheet", "Bilan"],
+    "general_info": ["General Infos", "Infos Générales", "Informations Générales"],
+    "cash_situation": ["Cash situation", "Trésorerie"],
+    "raw_materials": ["Raw Materials", "Mat. Premières", "Matières Premières"],
+}
+
+# Regex to recognize table separater lines like |---|---| or |:---|
+SEPARATOR_PATTERN = re.compile(r"^\|?[\s\:\-\|]+\|?$")
+
+
+def normalize_header(line: str) -> str:
+    """Normalize a header line for alias lookup ('## Bilan ' -> 'bilan')."""
+    return line.strip().lower().lstrip("#").strip()
+
+
+def split_table_row(stripped_line: str) -> Optional[List[str]]:
     """
-    Parse a markdown table by looking for one of the provided headers.
-    Returns a list of rows, where each row is a list of cell strings.
-    Unlike previous version, this does NOT return a dict to support duplicate keys and preserving order.
+    Split a markdown table line into cleaned cells.
+    Returns None for separator lines and rows without content.
     """
-    lines = content.split("\n")
-    in_table = False
-    rows = []
+    # Remove leading/trailing pipes if they exist
+    parts = stripped_line.split("|")
+    if stripped_line.startswith("|"):
+        parts = parts[1:]
+    if stripped_line.endswith("|"):
+        parts = parts[:-1]
 
-    # Regex to recognize table separater lines like |---|---| or |:---|
-    separator_pattern = re.compile(r"^\|?[\s\:\-\|]+\|?$")
+    cells = [clean_markdown_cell(p) for p in parts]
 
-    for line in lines:
-        stripped_line = line.strip()
-        
-        # Detect table start via header
-        # We look for lines starting with #..# HeaderName
-        if not in_table:
-            for header in table_headers:
-                if stripped_line.lower().lstrip("#").strip() == header.lower():
-                    in_table = True
-                    break
-            continue
-
-        # Inside table
-        if in_table:
-            # Stop if we hit a new section
-            if stripped_line.startswith("#") and not any(h.lower() in stripped_line.lower() for h in table_headers):
-                break
-                
-            # Process table row
+    # Check for separator line
+    is_separator = SEPARATOR_PATTERN.match(stripped_line) or all(
+        c == "" or set(c) <= set("-: ") for c in cells
+    )
+    if is_separator or not any(cells):
+        return None
+    return cells
+
+
+class SectionIndex:
+    """
+    One-pass index of a markdown report.
+
+    The content is split once; every header line ('#' lines, and the rare bare
+    lines that could match a section name) is recorded with its normalized text,
+    so any number of tables can be extracted later without rescanning the document.
+    """
+
+    def __init__(self, content: str):
+        self.lines = content.split("\n")
+        # Line numbers of '#' headers, in document order, with their lowercased text and level
+        self.header_lines: List[int] = []
+        self.header_text: List[str] = []
+        self.header_level: List[int] = []
+        # Normalized text -> first line number (any line without a table pipe)
+        self.first_line: Dict[str, int] = {}
+
+        for i, line in enumerate(self.lines):
+            stripped_line = line.strip()
+            if not stripped_line:
+                continue
+            if stripped_line.startswith("#"):
+                self.header_lines.append(i)
+                self.header_text.append(stripped_line.lower())
+                self.header_level.append(len(stripped_line) - len(stripped_line.lstrip("#")))
+            # Table rows can never equal a section name
             if "|" in stripped_line:
-                # Remove leading/trailing pipes if they exist
-                parts = stripped_line.split("|")
-                if stripped_line.startswith("|"):
-                    parts = parts[1:]
-                if stripped_line.endswith("|"):
-                    parts = parts[:-1]
-                    
-                cells = [clean_markdown_cell(p) for p in parts]
-                
-                # Check for separator line
-                is_separator = separator_pattern.match(stripped_line) or all(c == "" or set(c) <= set("-: ") for c in cells)
-                if is_separator:
-                    continue
-                
-                # Add row if it has content
-                if any(cells):
+                continue
+            key = normalize_header(stripped_line)
+            if key not in self.first_line:
+                self.first_line[key] = i
+
+    def find(self, table_headers: List[str], nested: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        Return the (start, end) line range of the first section matching one of the headers.
+        The range excludes the header line itself and stops at the next header that does not
+        mention one of the aliases (same rule as the historical line-by-line scan).
+        With nested=True it stops at the next header of the same or a higher level instead,
+        so sub-sections ('### Inventory Status') stay part of their parent.
+        """
+        aliases = [h.lower() for h in table_headers]
+        starts = [self.first_line[a] for a in aliases if a in self.first_line]
+        if not starts:
+            return None
+        start = min(starts)
+
+        first = bisect.bisect_right(self.header_lines, start)
+        # Level of the matched header (a bare line behaves like the deepest level)
+        level = 7
+        if first > 0 and self.header_lines[first - 1] == start:
+            level = self.header_level[first - 1]
+
+        end = len(self.lines)
+        for pos in range(first, len(self.header_lines)):
+            if nested:
+                stop = self.header_level[pos] <= level
+            else:
+                stop = not any(a in self.header_text[pos] for a in aliases)
+            if stop:
+                end = self.header_lines[pos]
+                break
+        return start + 1, end
+
+    def table(
+        self, table_headers: List[str], nested: bool = False, bullets: bool = False
+    ) -> List[List[str]]:
+        """
+        Extract the rows of the section matching one of the headers.
+        With bullets=True, '- **Label**: value' list items are returned as [label, value] rows
+        (some exports write short sections as lists instead of tables).
+        """
+        span = self.find(table_headers, nested=nested)
+        if span is None:
+            return []
+
+        rows = []
+        for line in self.lines[span[0]:span[1]]:
+            if "|" in line:
+                cells = split_table_row(line.strip())
+                if cells is not None:
                     rows.append(cells)
+            elif bullets:
+                stripped_line = line.strip()
+                if stripped_line.startswith(("- ", "* ")) and ":" in stripped_line:
+                    label, _, value = stripped_line[2:].rpartition(":")
+                    rows.append([clean_markdown_cell(label), clean_markdown_cell(value)])
+        return rows
 
-    return rows
 
+def parse_markdown_table(content: str, table_headers: List[str]) -> List[List[str]]:
+    """
+    Parse a markdown table by looking for one of the provided headers.
+    Returns a list of rows, where each row is a list of cell strings.
+    Unlike previous version, this does NOT return a dict to support duplicate keys and preserving order.
 
-def parse_mirage_markdown(content: str) -> dict:
-    """Parse a Mirage simulation markdown file and extract all data."""
-    result = {}
+    Builds a throwaway SectionIndex; use SectionIndex directly to extract several tables.
+    """
+    return SectionIndex(content).table(table_headers)
 
-    # Stocks
-    result["stocks"] = parse_markdown_table(content, ["Stocks"])
-    
-    # Balance Sheet
-    result["balance_sheet"] = parse_markdown_table(content, ["Balance Sheet", "Bilan"])
-    
-    # General Info
-    result["general_info"] = parse_markdown_table(content, ["General Infos", "Infos Générales", "Informations Générales"])
-    
-    # Cash / Treasury
-    result["cash_situation"] = parse_markdown_table(content, ["Cash situation", "Trésorerie"])
-    
-    # Raw Materials
-    result["raw_materials"] = parse_markdown_table(content, ["Raw Materials", "Mat. Premières", "Matières Premières"])
-    
-    return result
+
+def parse_mirage_markdown(content: Union[str, SectionIndex]) -> dict:
+    """Parse a Mirage simulation markdown file and extract all data."""
+    index = content if isinstance(content, SectionIndex) else SectionIndex(content)
+    return {name: index.table(headers) for name, headers in SECTION_ALIASES.items()}
 
 
 def extract_period_state(parsed_data: dict) -> PeriodState:
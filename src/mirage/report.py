@@ -0,0 +1,832 @@
+"""Typed models for every section of a Mirage report, parsed lazily on access."""
+
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List, Optional, Union
+
+from .models import PeriodState
+from .parser import (
+    SectionIndex,
+    clean_markdown_cell,
+    extract_period_state,
+    parse_mirage_markdown,
+    parse_number,
+    parse_number_column,
+)
+
+# Section aliases (French export, English export) for the typed sections.
+REPORT_SECTION_ALIASES: Dict[str, List[str]] = {
+    "charges": ["Charges", "Expenses"],
+    "compte_resultat": ["Compte de Résultat", "Income Statement"],
+    "bilan": ["Bilan", "Balance Sheet"],
+    "detail_bilan": ["Détail Bilan", "Detail of Balance Sheet"],
+    "produits": ["Produits", "Incomes"],
+    "rse": ["RSE", "CSR"],
+    "messages": ["Messages"],
+    "bourse": ["Bourse", "Stock Market"],
+    "etudes": ["Etudes + ABC", "Études + ABC", "Studies + ABC"],
+    "concurrence": ["Concurrence", "Competition"],
+    "exploitation_produit": ["Exploitation/produit", "Operating/Product"],
+    "resultat_produit": ["Résultat/produit", "Profit/Product"],
+}
+
+
+# =============================================================================
+# MODÈLES
+# =============================================================================
+
+
+@dataclass
+class ProductLine:
+    """Une ligne ventilée par produit (colonnes A-CT ... C-GS + Total)."""
+
+    a_ct: float = 0.0
+    b_ct: float = 0.0
+    c_ct: float = 0.0
+    a_gs: float = 0.0
+    b_gs: float = 0.0
+    c_gs: float = 0.0
+    total: float = 0.0
+
+
+@dataclass
+class Charges:
+    """Détail des charges (K€)."""
+
+    charges_exploitation: float = 0.0
+    matieres_premieres_consommees: float = 0.0
+    achats_mp: float = 0.0
+    variation_stock_mp: float = 0.0
+    achats_externes_pf: float = 0.0
+    autres_charges: float = 0.0
+    services_techniques: float = 0.0
+    services_administratifs: float = 0.0
+    transports_deplacements: float = 0.0
+    frais_personnel: float = 0.0
+    salaires: float = 0.0
+    charges_sociales: float = 0.0
+    dotation_conges: float = 0.0
+    reprise_conges: float = 0.0
+    amortissements: float = 0.0
+    amortissement_machines: float = 0.0
+    amortissement_rd: float = 0.0
+    autres_amortissements: float = 0.0
+    charges_exceptionnelles: float = 0.0
+    creances_irrecouvrables: float = 0.0
+    autres_charges_gestion: float = 0.0
+    frais_emission: float = 0.0
+    cession_immobilisations: float = 0.0
+
+
+@dataclass
+class CompteResultat:
+    """Compte de résultat de la période (K€)."""
+
+    mp_consommees: float = 0.0
+    achats_externes_pf: float = 0.0
+    autres_charges: float = 0.0
+    impots_taxes: float = 0.0
+    frais_personnel: float = 0.0
+    amortissements: float = 0.0
+    charges_exploitation: float = 0.0
+    charges_financieres: float = 0.0
+    charges_exceptionnelles: float = 0.0
+    impot_societes: float = 0.0
+    total_charges: float = 0.0
+
+    chiffre_affaires_ht: float = 0.0
+    variation_stock: float = 0.0
+    produits_exploitation: float = 0.0
+    produits_financiers: float = 0.0
+    produits_exceptionnels: float = 0.0
+    remboursement_impots: float = 0.0
+    total_produits: float = 0.0
+
+    benefice: float = 0.0
+    perte: float = 0.0
+
+    @property
+    def resultat_net(self) -> float:
+        """Bénéfice (positif) ou perte (négatif) de la période."""
+        return self.benefice - self.perte
+
+
+@dataclass
+class Bilan:
+    """Bilan de fin de période (K€)."""
+
+    # Actif
+    immobilisations_corporelles: float = 0.0
+    immobilisations_financieres: float = 0.0
+    immobilisations_incorporelles: float = 0.0
+    actif_immobilise: float = 0.0
+    stock_mp: float = 0.0
+    stock_pf: float = 0.0
+    creances: float = 0.0
+    disponibilites: float = 0.0
+    actif_circulant: float = 0.0
+    total_actif: float = 0.0
+
+    # Passif
+    capital_reserves: float = 0.0
+    resultat_periode: float = 0.0
+    capitaux_propres: float = 0.0
+    emprunt_lt: float = 0.0
+    emprunt_ct: float = 0.0
+    dettes_fournisseurs_fiscales: float = 0.0
+    decouvert: float = 0.0
+    dettes: float = 0.0
+    total_passif: float = 0.0
+
+
+@dataclass
+class Immobilisation:
+    """Valeurs brute, amortissements cumulés et nette d'une immobilisation (K€)."""
+
+    brut: float = 0.0
+    amortissements: float = 0.0
+    net: float = 0.0
+
+
+@dataclass
+class DetailBilan:
+    """Détail du bilan (K€)."""
+
+    terrain: Immobilisation = field(default_factory=Immobilisation)
+    constructions: Immobilisation = field(default_factory=Immobilisation)
+    materiel: Immobilisation = field(default_factory=Immobilisation)
+    autres_immobilisations: Immobilisation = field(default_factory=Immobilisation)
+    incorporelles: Immobilisation = field(default_factory=Immobilisation)
+
+    titres_participation: float = 0.0
+    prets_long_terme: float = 0.0
+
+    capital: float = 0.0
+    prime_emission: float = 0.0
+    reserves: float = 0.0
+
+    creances_clients: float = 0.0
+    creances_contrats: float = 0.0
+    debiteurs_divers: float = 0.0
+
+    dettes_fournisseurs: float = 0.0
+    tva: float = 0.0
+    provision_conges: float = 0.0
+
+
+@dataclass
+class Produits:
+    """Détail des produits (K€)."""
+
+    produits_exploitation: float = 0.0
+    chiffre_affaires_ht: float = 0.0
+    ventes_normales: float = 0.0
+    ristournes: float = 0.0
+    ventes_solde: float = 0.0
+    ventes_contrats: float = 0.0
+    variation_stock_pf: float = 0.0
+    stock_initial_pf: float = 0.0
+    stock_final_pf: float = 0.0
+    produits_financiers: float = 0.0
+    dividendes_percus: float = 0.0
+    autres_produits_financiers: float = 0.0
+    produits_exceptionnels: float = 0.0
+
+
+@dataclass
+class RSE:
+    """Indicateurs RSE (notes sur 100)."""
+
+    impact_ecologique: float = 0.0
+    ethique_rh: float = 0.0
+    ethique_financiere: float = 0.0
+    gestion_dechets: float = 0.0
+    amenagements: float = 0.0
+    indicateur_rse: float = 0.0
+    indicateur_rd: float = 0.0
+    autorise_produire_c: bool = False
+    label_ecocert: bool = False
+
+
+@dataclass
+class Messages:
+    """Capacités d'emprunt (K€) et ratios de qualité de gestion (%)."""
+
+    possibilite_emprunt_ct: float = 0.0
+    possibilite_emprunt_lt: float = 0.0
+    emprunt_lt_a_recevoir: float = 0.0
+    ratio_capitaux_propres: float = 0.0
+    circulation_stocks_pf: float = 0.0
+    qualite_prev_encaissements: float = 0.0
+    qualite_prev_decaissements: float = 0.0
+    coefficient_bonus_malus: float = 0.0
+
+
+@dataclass
+class CotationFirme:
+    """Cotation boursière d'une firme."""
+
+    cours_precedent: float = 0.0  # €
+    cours: float = 0.0  # €
+    indice_perf: float = 0.0
+    dividende: float = 0.0  # €/action
+    capital_social: float = 0.0  # K€
+    nb_actions_proposees: float = 0.0
+    prix_emission: float = 0.0  # €
+
+
+@dataclass
+class LignePortefeuille:
+    """Titres d'une firme détenus en portefeuille."""
+
+    stock_initial_u: float = 0.0
+    achats_u: float = 0.0
+    ventes_u: float = 0.0
+    stock_final_u: float = 0.0
+    stock_initial_ke: float = 0.0
+    achats_ke: float = 0.0
+    ventes_ke: float = 0.0
+    stock_final_ke: float = 0.0
+
+
+@dataclass
+class Bourse:
+    """Cours des six firmes et portefeuille de titres, indexés par firme ('F1' ... 'F6')."""
+
+    cotations: Dict[str, CotationFirme] = field(default_factory=dict)
+    portefeuille: Dict[str, LignePortefeuille] = field(default_factory=dict)
+
+
+@dataclass
+class Etudes:
+    """Études gratuites et payantes A/B/C : une valeur par firme (index 0 = firme 1)."""
+
+    firmes: List[str] = field(default_factory=list)
+    nb_ouvriers: List[float] = field(default_factory=list)
+    remuneration_ouvriers: List[float] = field(default_factory=list)
+    charges_sociales: List[float] = field(default_factory=list)
+    nb_vendeurs_ct: List[float] = field(default_factory=list)
+    nb_vendeurs_gs: List[float] = field(default_factory=list)
+    remuneration_vendeurs_ct: List[float] = field(default_factory=list)
+    remuneration_vendeurs_gs: List[float] = field(default_factory=list)
+    publicite_ct: List[float] = field(default_factory=list)
+    publicite_gs: List[float] = field(default_factory=list)
+    # Qualité / emballage recyclé par produit ('A-CT' -> ['100 -N-', ...])
+    qualite: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class OffreConcurrence:
+    """Prix, promotion et ventes d'un produit-marché : une valeur par firme puis l'importateur."""
+
+    prix: List[float] = field(default_factory=list)
+    promotion: List[float] = field(default_factory=list)
+    ventes: List[float] = field(default_factory=list)
+
+
+@dataclass
+class Concurrence:
+    """Offres concurrentes indexées par produit-marché ('A-CT' ... 'C-GS')."""
+
+    firmes: List[str] = field(default_factory=list)
+    offres: Dict[str, OffreConcurrence] = field(default_factory=dict)
+
+
+@dataclass
+class ExploitationProduit:
+    """Coûts d'exploitation par produit (€/U par produit, K€ en total)."""
+
+    matieres_premieres: ProductLine = field(default_factory=ProductLine)
+    main_oeuvre: ProductLine = field(default_factory=ProductLine)
+    autres_couts_directs: ProductLine = field(default_factory=ProductLine)
+    amortissement_materiel: ProductLine = field(default_factory=ProductLine)
+    maintenance: ProductLine = field(default_factory=ProductLine)
+    couts_production: ProductLine = field(default_factory=ProductLine)
+    promotion: ProductLine = field(default_factory=ProductLine)
+    salaires_commerciaux: ProductLine = field(default_factory=ProductLine)
+    autres_frais_commerciaux: ProductLine = field(default_factory=ProductLine)
+    publicite: ProductLine = field(default_factory=ProductLine)
+    couts_commerciaux: ProductLine = field(default_factory=ProductLine)
+
+    # Totaux uniquement (K€)
+    salaires_administratifs: float = 0.0
+    impots_taxes: float = 0.0
+    emballages_recycles: float = 0.0
+    couts_stockage: float = 0.0
+    autres_frais_administratifs: float = 0.0
+    frais_administratifs: float = 0.0
+    recherche_dev: float = 0.0
+    charges_exploitation: float = 0.0
+
+
+@dataclass
+class ResultatProduit:
+    """Marges et résultat d'exploitation par produit (€/U par produit, K€ en total)."""
+
+    ventes_marche: ProductLine = field(default_factory=ProductLine)
+    commercialisation: ProductLine = field(default_factory=ProductLine)
+    marge_marche: ProductLine = field(default_factory=ProductLine)
+    ventes_contrats: ProductLine = field(default_factory=ProductLine)
+    cout_transport_contrats: ProductLine = field(default_factory=ProductLine)
+    marge_contrats: ProductLine = field(default_factory=ProductLine)
+    ventes_soldes: ProductLine = field(default_factory=ProductLine)
+    marge_soldes: ProductLine = field(default_factory=ProductLine)
+    marge_moyenne: ProductLine = field(default_factory=ProductLine)
+    frais_administratifs: ProductLine = field(default_factory=ProductLine)
+    emballages_recycles: ProductLine = field(default_factory=ProductLine)
+    recherche_dev: ProductLine = field(default_factory=ProductLine)
+    resultat_exploitation: ProductLine = field(default_factory=ProductLine)
+    resultat_exploitation_ke: ProductLine = field(default_factory=ProductLine)
+
+
+# =============================================================================
+# EXTRACTION
+# =============================================================================
+
+
+def normalize_label(label: str) -> str:
+    """Normalize a row label for exact lookups ('**Stock Final (U)** :' -> 'stock final (u)')."""
+    s = clean_markdown_cell(label).rstrip(":").strip().lower()
+    return " ".join(s.split())
+
+
+def parse_flag(value: str) -> bool:
+    """Parse a report yes/no flag ('-N-', '-O-', 'Y', 'Oui'...)."""
+    return clean_markdown_cell(value).strip("- ").lower() in ("o", "y", "oui", "yes")
+
+
+class _Labels:
+    """Label -> cells lookup over the rows of a section (first occurrence wins)."""
+
+    def __init__(self, rows: List[List[str]], pairs: bool = True):
+        self.rows: Dict[str, List[str]] = {}
+        self.values: Dict[str, str] = {}
+        for row in rows:
+            label = normalize_label(row[0])
+            self.rows.setdefault(label, row[1:])
+            if pairs:
+                # Two label/value pairs per row in the ACTIF | PASSIF layouts
+                for i in range(0, len(row) - 1, 2):
+                    self.values.setdefault(normalize_label(row[i]), row[i + 1])
+
+    def number(self, *aliases: str) -> float:
+        for alias in aliases:
+            if alias in self.values:
+                return parse_number(self.values[alias])
+        return 0.0
+
+    def text(self, *aliases: str) -> str:
+        for alias in aliases:
+            if alias in self.values:
+                return self.values[alias]
+        return ""
+
+    def cells(self, *aliases: str) -> Optional[List[str]]:
+        for alias in aliases:
+            if alias in self.rows:
+                return self.rows[alias]
+        return None
+
+    def numbers(self, *aliases: str) -> List[float]:
+        cells = self.cells(*aliases)
+        return parse_number_column(cells) if cells else []
+
+    def product_line(self, *aliases: str) -> ProductLine:
+        values = self.numbers(*aliases)
+        values += [0.0] * (7 - len(values))
+        return ProductLine(*values[:7])
+
+    def total(self, *aliases: str) -> float:
+        """Last column of a product table (only the TOTAL column is filled for overheads)."""
+        cells = self.cells(*aliases)
+        return parse_number(cells[-1]) if cells else 0.0
+
+
+def parse_charges(rows: List[List[str]]) -> Charges:
+    """Build the Charges model from the rows of the 'Charges' section."""
+    t = _Labels(rows)
+    return Charges(
+        charges_exploitation=t.number("charges d'exploitation", "expenses"),
+        matieres_premieres_consommees=t.number(
+            "matieres premieres consommees", "raw materials used"
+        ),
+        achats_mp=t.number("achats", "purchases"),
+        variation_stock_mp=t.number("-variation stock (sf-si)", "-inventory variation (ci-ii)"),
+        achats_externes_pf=t.number(
+            "achats externes de prod. finis", "external purchases of finished products"
+        ),
+        autres_charges=t.number("autres charges", "other expenses"),
+        services_techniques=t.number("services ext. techniques", "technical services purchases"),
+        services_administratifs=t.number(
+            "services ext. administ.", "administrative services purchases"
+        ),
+        transports_deplacements=t.number("transports et déplacements", "transportation"),
+        frais_personnel=t.number("frais de personnel", "personnel expenses"),
+        salaires=t.number("salaires et traitements", "salaries"),
+        charges_sociales=t.number("charges sociales", "health and pensions coverage"),
+        dotation_conges=t.number("dotation provision congés", "to paid vacation account"),
+        reprise_conges=t.number("reprise /provision congés", "from paid vacation account"),
+        amortissements=t.number("amortissements", "depreciation"),
+        amortissement_machines=t.number("amortissement machines", "equipment depreciation"),
+        amortissement_rd=t.number("recherche et développement", "research and development"),
+        autres_amortissements=t.number("autres amortissements", "other depreciation"),
+        charges_exceptionnelles=t.number("charges exceptionnelles", "exceptional expenses"),
+        creances_irrecouvrables=t.number("créances irrecouvrables", "bad debts"),
+        autres_charges_gestion=t.number("autres ch./op.de gestion", "other operating expenses"),
+        frais_emission=t.number("frais d'émission", "new issue expenses"),
+        cession_immobilisations=t.number("cession immobilisations", "sale of assets"),
+    )
+
+
+def parse_compte_resultat(rows: List[List[str]]) -> CompteResultat:
+    """Build the CompteResultat model from the rows of the 'Compte de Résultat' section."""
+    t = _Labels(rows)
+    return CompteResultat(
+        mp_consommees=t.number("mat.prem.consommées", "raw materials used"),
+        achats_externes_pf=t.number("achats externes pf", "external purchases, fp"),
+        autres_charges=t.number("autres charges", "other expenses"),
+        impots_taxes=t.number("impots et taxes", "taxes"),
+        frais_personnel=t.number("frais de personnel", "personnel expenses"),
+        amortissements=t.number("amortissement", "depreciation"),
+        charges_exploitation=t.number("charges d'exploitation", "expenses"),
+        charges_financieres=t.number("charges financières", "financial expenses"),
+        charges_exceptionnelles=t.number("charges exceptionnelles", "exceptional expenses"),
+        impot_societes=t.number("impôt sur les sociétés", "impôts", "income tax or prov."),
+        total_charges=t.number("total charges", "total expenses"),
+        chiffre_affaires_ht=t.number("chiffre affaires h.t.", "sales, exclusive of tax"),
+        variation_stock=t.number("+variation de stock", "+inventory variation"),
+        produits_exploitation=t.number("produits d'exploitation", "revenues"),
+        produits_financiers=t.number("produits financiers", "financial revenues"),
+        produits_exceptionnels=t.number("produits exceptionnels", "exceptional revenues"),
+        remboursement_impots=t.number("remboursement impôts", "tax reimbursement"),
+        total_produits=t.number("total produits", "total revenues"),
+        benefice=t.number("bénéfice période", "profit period"),
+        perte=t.number("perte période", "loss period"),
+    )
+
+
+def parse_bilan(rows: List[List[str]]) -> Bilan:
+    """Build the Bilan model from the rows of the 'Bilan' section."""
+    t = _Labels(rows)
+    return Bilan(
+        immobilisations_corporelles=t.number("immob.corpor.nettes", "tangible assets"),
+        immobilisations_financieres=t.number("immob.financières", "financial assets"),
+        immobilisations_incorporelles=t.number("immob.incorporelles", "intangible assets"),
+        actif_immobilise=t.number("actif immobilisé", "fixed assets"),
+        stock_mp=t.number("stock matières prem.", "raw materials in stock"),
+        stock_pf=t.number("stock produits finis", "finished goods in stock"),
+        creances=t.number("créances", "accounts receivable"),
+        disponibilites=t.number("disponibilités", "cash"),
+        actif_circulant=t.number("actif disp. et réalisable", "circulating assets"),
+        total_actif=t.number("total actif", "total asset"),
+        capital_reserves=t.number("capital et réserves", "cap + reserves"),
+        resultat_periode=t.number("résultat période", "net result"),
+        capitaux_propres=t.number("capitaux propres", "net equity"),
+        emprunt_lt=t.number("emprunt long terme", "long term debt"),
+        emprunt_ct=t.number("emprunt court terme", "short term debt"),
+        dettes_fournisseurs_fiscales=t.number(
+            "dettes fournisseurs fiscales et sociales", "accounts payable, tax and social debts"
+        ),
+        decouvert=t.number("découvert", "overdraft"),
+        dettes=t.number("dettes", "debts"),
+        total_passif=t.number("total passif", "total liabilities"),
+    )
+
+
+def parse_detail_bilan(rows: List[List[str]]) -> DetailBilan:
+    """Build the DetailBilan model from the rows of the 'Détail Bilan' section."""
+    t = _Labels(rows)
+
+    def immobilisation(*aliases: str) -> Immobilisation:
+        values = t.numbers(*aliases)
+        values += [0.0] * (3 - len(values))
+        return Immobilisation(*values[:3])
+
+    return DetailBilan(
+        terrain=immobilisation("terrain", "land"),
+        constructions=immobilisation("constructions", "building"),
+        materiel=immobilisation("installations,matériel,outilllage", "building, material, tools"),
+        autres_immobilisations=immobilisation("autres immobilisations", "other tangible assets"),
+        incorporelles=immobilisation(
+            "immobilisations incorporelles (r et d)", "intangible assets (r and d)"
+        ),
+        titres_participation=t.number("titres de participation", "holding securities"),
+        prets_long_terme=t.number("prêts a long terme", "long-term loans"),
+        capital=t.number("capital"),
+        prime_emission=t.number("prime d'émission", "share issuing premium"),
+        reserves=t.number("réserves", "reserves"),
+        creances_clients=t.number("créances clients", "client receivables"),
+        creances_contrats=t.number("créances sur contrats", "receivables on contract sales"),
+        debiteurs_divers=t.number(
+            "débiteurs divers (tva)", "miscellaneous debts (tva)", "miscelleanous debts (tva)"
+        ),
+        dettes_fournisseurs=t.number("dettes fournisseurs", "supplier debts"),
+        tva=t.number("tva", "vat"),
+        provision_conges=t.number("provision / congés", "provision on paid vacations"),
+    )
+
+
+def parse_produits(rows: List[List[str]]) -> Produits:
+    """Build the Produits model from the rows of the 'Produits' section."""
+    t = _Labels(rows)
+    return Produits(
+        produits_exploitation=t.number("produits d exploitation", "revenues"),
+        chiffre_affaires_ht=t.number("chiffre affaires ht", "sales, exclusive of tax"),
+        ventes_normales=t.number("ventes normales", "regular sales"),
+        ristournes=t.number("ristournes", "discounts on sales"),
+        ventes_solde=t.number("ventes en solde", "clearance sales"),
+        ventes_contrats=t.number("ventes sous contrats", "contract sales"),
+        variation_stock_pf=t.number("variation de stock pf", "fp inventory variation"),
+        stock_initial_pf=t.number("stock initial pf", "fp opening inventory"),
+        stock_final_pf=t.number("stock final pf", "fp closing inventory"),
+        produits_financiers=t.number("produits financiers", "financial revenues"),
+        dividendes_percus=t.number("dividendes percus", "cashed in dividends"),
+        autres_produits_financiers=t.number("autres prod. financiers", "other financial revenues"),
+        produits_exceptionnels=t.number("produits exceptionnels", "exceptional revenues"),
+    )
+
+
+def parse_rse(rows: List[List[str]]) -> RSE:
+    """Build the RSE model from the rows of the 'RSE' section."""
+    t = _Labels(rows)
+    return RSE(
+        impact_ecologique=t.number("impact écologique (machines)", "ecological impact (machines)"),
+        ethique_rh=t.number(
+            "gestion éthique des ressources humaines", "ethical human resources management"
+        ),
+        ethique_financiere=t.number("ethique financière", "financial ethics"),
+        gestion_dechets=t.number(
+            "gestion des déchets et recyclage", "waste management and recycling"
+        ),
+        amenagements=t.number("aménagements et accessibilité", "facilities and accessibility"),
+        indicateur_rse=t.number("indicateur rse", "csr indicator"),
+        indicateur_rd=t.number("indicateur r&d", "r&d indicator"),
+        autorise_produire_c=parse_flag(t.text(
+            "autorisé à produire c à la prochaine période (o/n)",
+            "authorized to produce c in the next period (y/n)",
+            "authorized to produce c in the next period",
+        )),
+        label_ecocert=parse_flag(t.text(
+            "label mir'ecocert (impact à p+1) (o/n)",
+            "mir'ecocert label (impact at p+1) (y/n)",
+            "mir'ecocert label (impact at p+1)",
+        )),
+    )
+
+
+def parse_messages(rows: List[List[str]]) -> Messages:
+    """Build the Messages model from the rows of the 'Messages' section."""
+    t = _Labels(rows)
+    return Messages(
+        possibilite_emprunt_ct=t.number(
+            "possibilité emprunt ct en t+1 (ke)", "st loan capacity in t+1 (ke)"
+        ),
+        possibilite_emprunt_lt=t.number(
+            "possibilité emprunt lt en t+1 pour réception en t+2",
+            "loan capacity in t+1 to be received in t+2",
+        ),
+        emprunt_lt_a_recevoir=t.number(
+            "emprunt lt demande en t a recevoir t+1", "lt loan requested in t to be received in t+1"
+        ),
+        ratio_capitaux_propres=t.number(
+            "capitaux propres / total passif", "net equity / total liabilities"
+        ),
+        circulation_stocks_pf=t.number(
+            "circulation stocks de produits finis", "stocks of finished products"
+        ),
+        qualite_prev_encaissements=t.number(
+            "qualité prévisions encaissements", "quality of cash in forecasts"
+        ),
+        qualite_prev_decaissements=t.number(
+            "qualité prévisions decaissements", "quality of cash out forecasts"
+        ),
+        coefficient_bonus_malus=t.number(
+            "coefficient bonus malus sur tauxprochains emprunts",
+            "bonus / penalty coefficient on future loans rate",
+        ),
+    )
+
+
+_FIRM_PATTERN = re.compile(r"^f\d+$")
+
+
+def parse_bourse(rows: List[List[str]]) -> Bourse:
+    """Build the Bourse model: 8-cell firm rows are quotes, 9-cell firm rows the portfolio."""
+    bourse = Bourse()
+    for row in rows:
+        firm = normalize_label(row[0])
+        if not _FIRM_PATTERN.match(firm):
+            continue
+        values = parse_number_column(row[1:])
+        if len(values) >= 8:
+            bourse.portefeuille[firm.upper()] = LignePortefeuille(*values[:8])
+        elif len(values) >= 7:
+            bourse.cotations[firm.upper()] = CotationFirme(*values[:7])
+    return bourse
+
+
+_PRODUCT_MARKET = re.compile(r"([abc])[- ]?(ct|gs|to|mr)$")
+_MARKET_CODES = {"ct": "CT", "to": "CT", "gs": "GS", "mr": "GS"}
+
+
+def parse_etudes(rows: List[List[str]]) -> Etudes:
+    """Build the Etudes model from the rows of the 'Etudes + ABC' section."""
+    if not rows:
+        return Etudes()
+    t = _Labels(rows, pairs=False)
+    etudes = Etudes(
+        firmes=[c for c in rows[0][1:]],
+        nb_ouvriers=t.numbers("nombre ouvriers", "number of workers"),
+        remuneration_ouvriers=t.numbers(
+            "rem. moy. ouv. hors hs",
+            "av. wage of workers",
+            "av. wage of workers (excluding overtime)",
+        ),
+        charges_sociales=t.numbers("charges + avges soc.", "expenses + soc. avtges"),
+        nb_vendeurs_ct=t.numbers("nb vendeurs ct", "to salesforce nb"),
+        nb_vendeurs_gs=t.numbers("nb vendeurs gs", "mr salesforce nb"),
+        remuneration_vendeurs_ct=t.numbers("remuner. vendeurs ct", "to salesforce wage"),
+        remuneration_vendeurs_gs=t.numbers("remuner. vendeurs gs", "mr salesforce wage"),
+        publicite_ct=t.numbers("publicité ct", "advertising to"),
+        publicite_gs=t.numbers("publicité gs", "advertising mr"),
+    )
+    for label, cells in t.rows.items():
+        if label.startswith(("qualite/", "quality/")):
+            m = _PRODUCT_MARKET.search(label)
+            if m:
+                code = f"{m.group(1).upper()}-{_MARKET_CODES[m.group(2)]}"
+                etudes.qualite[code] = cells
+    return etudes
+
+
+# Row label (without the 'A : ' product prefix) -> (market, attribute)
+_CONCURRENCE_ROWS = {
+    "prix ct": ("CT", "prix"),
+    "to price": ("CT", "prix"),
+    "promotion ct": ("CT", "promotion"),
+    "to promotion": ("CT", "promotion"),
+    "ventes ct": ("CT", "ventes"),
+    "to sales": ("CT", "ventes"),
+    "prix net gs": ("GS", "prix"),
+    "mr net price": ("GS", "prix"),
+    "promotion gs": ("GS", "promotion"),
+    "mr promotion": ("GS", "promotion"),
+    "ventes gs": ("GS", "ventes"),
+    "mr sales": ("GS", "ventes"),
+}
+_PRODUCT_PREFIX = re.compile(r"^(?:produit\s+)?([abc])(?:\s*:\s*|$)")
+
+
+def parse_concurrence(rows: List[List[str]]) -> Concurrence:
+    """Build the Concurrence model; rows are grouped under 'Produit A' / 'A : ...' markers."""
+    if not rows:
+        return Concurrence()
+    concurrence = Concurrence(firmes=[c for c in rows[0][1:]])
+    product = ""
+    for row in rows[1:]:
+        label = normalize_label(row[0])
+        m = _PRODUCT_PREFIX.match(label)
+        if m:
+            product = m.group(1).upper()
+            label = label[m.end():]
+        if not product or label not in _CONCURRENCE_ROWS:
+            continue
+        market, attribute = _CONCURRENCE_ROWS[label]
+        offre = concurrence.offres.setdefault(f"{product}-{market}", OffreConcurrence())
+        setattr(offre, attribute, parse_number_column(row[1:]))
+    return concurrence
+
+
+def parse_exploitation_produit(rows: List[List[str]]) -> ExploitationProduit:
+    """Build the ExploitationProduit model from the rows of the 'Exploitation/produit' section."""
+    t = _Labels(rows, pairs=False)
+    return ExploitationProduit(
+        matieres_premieres=t.product_line("matières premières", "raw materials"),
+        main_oeuvre=t.product_line("main oeuvre directe", "direct labor"),
+        autres_couts_directs=t.product_line("autres coûts directs", "other direct costs"),
+        amortissement_materiel=t.product_line("amortissement matériel", "equipment depreciation"),
+        maintenance=t.product_line("maintenance"),
+        couts_production=t.product_line("coûts de production", "production costs"),
+        promotion=t.product_line("promotion", "sales promotion"),
+        salaires_commerciaux=t.product_line("salaires dpt com.", "sales dept. salaries"),
+        autres_frais_commerciaux=t.product_line("autre frais comm.", "other commercial expenses"),
+        publicite=t.product_line("publicité", "advertising"),
+        couts_commerciaux=t.product_line("coûts commerciaux", "marketing and selling"),
+        salaires_administratifs=t.total("salaires administratifs", "administrative salaries"),
+        impots_taxes=t.total("impots et taxes", "taxes"),
+        emballages_recycles=t.total("emballages recyclés", "recycled packaging"),
+        couts_stockage=t.total("coûts de stockage", "storage costs"),
+        autres_frais_administratifs=t.total(
+            "autres frais administratifs", "other administrative overhead expenses"
+        ),
+        frais_administratifs=t.total("frais administratifs", "administrative costs"),
+        recherche_dev=t.total("recherche et développement", "research and development"),
+        charges_exploitation=t.total("charges d'exploitation", "expenses"),
+    )
+
+
+def parse_resultat_produit(rows: List[List[str]]) -> ResultatProduit:
+    """Build the ResultatProduit model from the rows of the 'Résultat/produit' section."""
+    t = _Labels(rows, pairs=False)
+    return ResultatProduit(
+        ventes_marche=t.product_line("ventes / marche", "sales / market"),
+        commercialisation=t.product_line("-commercialisation", "-marketing and selling"),
+        marge_marche=t.product_line("marge / marche", "margin / market"),
+        ventes_contrats=t.product_line("ventes / contrats", "sales / contracts"),
+        cout_transport_contrats=t.product_line("-coût de transport", "-shipping cost"),
+        marge_contrats=t.product_line("marge / contrats", "margin / contracts"),
+        ventes_soldes=t.product_line("ventes en solde", "clearance sales"),
+        marge_soldes=t.product_line("marge / soldes", "margin / clearance sales"),
+        marge_moyenne=t.product_line("marge moyenne", "average margin"),
+        frais_administratifs=t.product_line("-frais administ.", "-administ. expenses"),
+        emballages_recycles=t.product_line("-emb.recycl.", "-recycl.pack."),
+        recherche_dev=t.product_line("-recherche et développement", "-research and development"),
+        resultat_exploitation=t.product_line("résultat exploit.", "operating result"),
+        resultat_exploitation_ke=t.product_line("res. exploit.(ke)", "operating res.(ke)"),
+    )
+
+
+# =============================================================================
+# RAPPORT
+# =============================================================================
+
+
+class Report:
+    """
+    A parsed Mirage report.
+
+    The document is indexed once; each section is parsed the first time it is
+    accessed and then kept. Callers that only need `period_state` never pay for
+    the other sections.
+    """
+
+    def __init__(self, content: Union[str, SectionIndex]):
+        self.index = content if isinstance(content, SectionIndex) else SectionIndex(content)
+
+    def section_rows(self, name: str) -> List[List[str]]:
+        """Raw rows of a typed section (sub-sections and list items included)."""
+        return self.index.table(REPORT_SECTION_ALIASES[name], nested=True, bullets=True)
+
+    def frames(self, name: str) -> list:
+        """The tables of a typed section as DataFrames indexed by row label (needs pandas)."""
+        from .frames import section_frames
+
+        return section_frames(self.index, REPORT_SECTION_ALIASES[name], nested=True)
+
+    @cached_property
+    def tables(self) -> dict:
+        """The raw tables returned by parse_mirage_markdown."""
+        return parse_mirage_markdown(self.index)
+
+    @cached_property
+    def period_state(self) -> PeriodState:
+        return extract_period_state(self.tables)
+
+    @cached_property
+    def charges(self) -> Charges:
+        return parse_charges(self.section_rows("charges"))
+
+    @cached_property
+    def compte_resultat(self) -> CompteResultat:
+        return parse_compte_resultat(self.section_rows("compte_resultat"))
+
+    @cached_property
+    def bilan(self) -> Bilan:
+        return parse_bilan(self.section_rows("bilan"))
+
+    @cached_property
+    def detail_bilan(self) -> DetailBilan:
+        return parse_detail_bilan(self.section_rows("detail_bilan"))
+
+    @cached_property
+    def produits(self) -> Produits:
+        return parse_produits(self.section_rows("produits"))
+
+    @cached_property
+    def rse(self) -> RSE:
+        return parse_rse(self.section_rows("rse"))
+
+    @cached_property
+    def messages(self) -> Messages:
+        return parse_messages(self.section_rows("messages"))
+
+    @cached_property
+    def bourse(self) -> Bourse:
+        return parse_bourse(self.section_rows("bourse"))
+
+    @cached_property
+    def etudes(self) -> Etudes:
+        return parse_etudes(self.section_rows("etudes"))
+
+    @cached_property
+    def concurrence(self) -> Concurrence:
+        return parse_concurrence(self.section_rows("concurrence"))
+
+    @cached_property
+    def exploitation_produit(self) -> ExploitationProduit:
+        return parse_exploitation_produit(self.section_rows("exploitation_produit"))
+
+    @cached_property
+    def resultat_produit(self) -> ResultatProduit:
+        return parse_resultat_produit(self.section_rows("resultat_produit"))
@@ -0,0 +1,254 @@
+"""
+Field-path schema of the models: every leaf field addressed by a dotted path.
+
+    schema = schema_for(AllDecisions)
+    spec = schema["produit_a_ct.prix_tarif"]   # type, unit, bounds, default
+    spec.get(decisions); spec.set(decisions, 21.5)
+
+Paths double as column names in DecisionBatch / ResultBatch.
+"""
+
+import dataclasses
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .models import AllDecisions, CalculatedResults, PeriodState
+
+# Unit and bounds of each leaf, keyed by field name (the same name means the same
+# thing in every product / section). Bounds follow the input widgets of app/main.py.
+# name: (unit, min, max)
+FIELD_META: Dict[str, Tuple[str, Optional[float], Optional[float]]] = {
+    # ProductDecision
+    "prix_tarif": ("€/U", 0.0, None),
+    "promotion": ("€/U", 0.0, None),
+    "ristourne": ("%", 0.0, 20.0),
+    "production": ("KU", 0, None),
+    "qualite": ("%", 0, 100),
+    "emballage_recycle": ("O/N", None, None),
+    "ventes_contrat": ("U", 0, None),
+    "achats_contrat": ("U", 0, None),
+    # MarketingDecision
+    "vendeurs_ct": ("vendeurs", 0, None),
+    "commission_ct": ("% CA", 0.0, 5.0),
+    "vendeurs_gs": ("vendeurs", 0, None),
+    "prime_trimestre_gs": ("€/vendeur", 0.0, None),
+    "publicite_ct": ("K€", 0.0, None),
+    "publicite_gs": ("K€", 0.0, None),
+    "etudes_abcd": ("codes", None, None),
+    "etudes_efgh": ("codes", None, None),
+    # ApprovisionnementDecision
+    "commandes_mp_n": ("KU/per", 0, None),
+    "duree_contrat_n": ("périodes", 0, 4),
+    "commandes_mp_s": ("KU/per", 0, None),
+    "duree_contrat_s": ("périodes", 0, 4),
+    "maintenance": ("O/N", None, None),
+    "achat_spot_n": ("KU", 0, None),
+    "achat_spot_s": ("KU", 0, None),
+    # ProductionDecision
+    "machines_m1_actives": ("machines", 0, None),
+    "machines_m2_actives": ("machines", 0, None),
+    "ventes_m1": ("machines", 0, None),
+    "ventes_m2": ("machines", 0, None),
+    "achats_m1": ("machines", 0, None),
+    "achats_m2": ("machines", 0, None),
+    "emb_deb_ouvriers": ("ouvriers", None, None),
+    "variation_pouvoir_achat": ("%", None, None),
+    # RSEDecision
+    "budget_recyclage": ("K€", 0.0, None),
+    "amenagements_adaptes": ("K€", 0.0, None),
+    "recherche_dev": ("K€", 0.0, None),
+    # FinanceDecision
+    "emprunt_lt": ("K€", 0.0, None),
+    "duree_emprunt_lt": ("trimestres", 0, 8),
+    "effort_social": ("%", 0.0, 10.0),
+    "emprunt_ct": ("K€", 0.0, None),
+    "effets_escomptes": ("K€", 0.0, None),
+    "escompte_paiement_cpt": ("%", 0.0, 10.0),
+    "dividendes": ("K€", 0.0, None),
+    "rembt_dernier_emprunt": ("O/N", None, None),
+    "nb_actions_nouvelles": ("KU", 0, None),
+    "prix_emission": ("€", 0.0, None),
+    # PeriodState
+    "period_num": ("", 1, 4),
+    "stock_mp_n": ("U", 0, None),
+    "stock_mp_s": ("U", 0, None),
+    "nb_ouvriers": ("ouvriers", 0, None),
+    "nb_machines_m1": ("machines", 0, None),
+    "nb_machines_m2": ("machines", 0, None),
+    "cash": ("K€", None, None),
+    "dette_lt": ("K€", 0.0, None),
+    "dette_ct": ("K€", 0.0, None),
+    "reserves": ("K€", None, None),
+    "resultat_n_1": ("K€", None, None),
+    "report_a_nouveau": ("K€", None, None),
+    "indice_prix": ("indice", 0.0, None),
+    "indice_salaire": ("indice", 0.0, None),
+}
+
+# Field-name prefixes for the families of fields not listed one by one
+PREFIX_META: List[Tuple[str, Tuple[str, Optional[float], Optional[float]]]] = [
+    ("actions_f", ("actions", None, None)),
+    ("stock_", ("U", 0, None)),
+    ("capacite_", ("U", None, None)),
+    ("mp_", ("U", None, None)),
+    ("prix_net_", ("€/U", 0.0, None)),
+    ("ouvriers_", ("ouvriers", 0, None)),
+]
+
+
+def _meta(name: str, typ: type) -> Tuple[str, Optional[float], Optional[float]]:
+    if name in FIELD_META:
+        return FIELD_META[name]
+    for prefix, meta in PREFIX_META:
+        if name.startswith(prefix):
+            return meta
+    # CalculatedResults amounts are K€ unless stated otherwise (cout_prod_* are
+    # per-product totals, not unit costs)
+    return ("K€" if typ is float else "", None, None)
+
+
+def _compile_setter(path: str) -> Callable[[Any, Any], None]:
+    parent_path, _, name = path.rpartition(".")
+    if not parent_path:
+        return lambda obj, value: setattr(obj, name, value)
+    get_parent = attrgetter(parent_path)
+    return lambda obj, value: setattr(get_parent(obj), name, value)
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """One leaf field: dotted path, Python type, unit, bounds and precompiled accessors."""
+
+    path: str
+    type: type
+    default: Any
+    unit: str = ""
+    min: Optional[float] = None
+    max: Optional[float] = None
+    get: Callable[[Any], Any] = dataclasses.field(default=None, repr=False, compare=False)
+    set: Callable[[Any, Any], None] = dataclasses.field(default=None, repr=False, compare=False)
+
+    @property
+    def name(self) -> str:
+        return self.path.rpartition(".")[2]
+
+    @property
+    def column(self) -> str:
+        """Column of this field in DecisionBatch / ResultBatch."""
+        return self.path
+
+    def clip(self, value: Any) -> Any:
+        """Bring a numeric value inside the bounds (bools and strings untouched)."""
+        if self.type in (bool, str):
+            return value
+        if self.min is not None and value < self.min:
+            value = self.min
+        if self.max is not None and value > self.max:
+            value = self.max
+        return self.type(value)
+
+
+class Schema:
+    """All leaf fields of a (nested) model dataclass, in declaration order."""
+
+    def __init__(self, model: type):
+        self.model = model
+        self.fields: Dict[str, FieldSpec] = {}
+        self._collect(model, model(), "")
+
+    def _collect(self, model: type, default_instance: Any, prefix: str) -> None:
+        for f in dataclasses.fields(model):
+            path = f"{prefix}{f.name}"
+            value = getattr(default_instance, f.name)
+            if dataclasses.is_dataclass(f.type):
+                self._collect(f.type, value, path + ".")
+                continue
+            unit, low, high = _meta(f.name, f.type)
+            self.fields[path] = FieldSpec(
+                path=path,
+                type=f.type,
+                default=value,
+                unit=unit,
+                min=low,
+                max=high,
+                get=attrgetter(path),
+                set=_compile_setter(path),
+            )
+
+    def __getitem__(self, path: str) -> FieldSpec:
+        return self.fields[path]
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.fields
+
+    def __iter__(self) -> Iterator[FieldSpec]:
+        return iter(self.fields.values())
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def paths(self) -> List[str]:
+        return list(self.fields)
+
+    def get(self, obj: Any, path: str) -> Any:
+        return self.fields[path].get(obj)
+
+    def set(self, obj: Any, path: str, value: Any) -> None:
+        self.fields[path].set(obj, value)
+
+    def to_flat(self, obj: Any) -> Dict[str, Any]:
+        """{path: value} for every leaf of obj."""
+        return {path: spec.get(obj) for path, spec in self.fields.items()}
+
+    def from_flat(self, values: Dict[str, Any], base: Any = None) -> Any:
+        """New model instance: defaults (or a deep copy of `base`) updated with `values`."""
+        obj = self.model() if base is None else _deepcopy_dataclass(base)
+        fields = self.fields
+        for path, value in values.items():
+            spec = fields.get(path)
+            if spec is not None:
+                spec.set(obj, value)
+        return obj
+
+    def validate(self, obj: Any) -> List[str]:
+        """Out-of-bounds fields, as readable messages."""
+        errors = []
+        for spec in self.fields.values():
+            if spec.type in (bool, str):
+                continue
+            value = spec.get(obj)
+            if spec.min is not None and value < spec.min:
+                errors.append(f"{spec.path} = {value} < {spec.min} {spec.unit}".rstrip())
+            if spec.max is not None and value > spec.max:
+                errors.append(f"{spec.path} = {value} > {spec.max} {spec.unit}".rstrip())
+        return errors
+
+
+def _deepcopy_dataclass(obj: Any) -> Any:
+    """Copy of a nested dataclass of scalars (lists are copied too)."""
+    values = {}
+    for f in dataclasses.fields(obj):
+        value = getattr(obj, f.name)
+        if dataclasses.is_dataclass(value):
+            value = _deepcopy_dataclass(value)
+        elif isinstance(value, list):
+            value = list(value)
+        values[f.name] = value
+    return type(obj)(**values)
+
+
+_SCHEMAS: Dict[type, Schema] = {}
+
+
+def schema_for(model: type) -> Schema:
+    """The (cached) schema of a model class."""
+    schema = _SCHEMAS.get(model)
+    if schema is None:
+        schema = _SCHEMAS[model] = Schema(model)
+    return schema
+
+
+DECISIONS_SCHEMA = schema_for(AllDecisions)
+STATE_SCHEMA = schema_for(PeriodState)
+RESULTS_SCHEMA = schema_for(CalculatedResults)
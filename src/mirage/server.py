@@ -0,0 +1,460 @@
+"""
+Local JSON-over-HTTP evaluation service: `mirage-server` (or `python -m mirage.server`).
+
+    mirage-server --report "Simulation Md des données year -2.md" --port 8765 --workers 4
+
+    POST /evaluate  {"decisions": {...}, "state": {...}, "forecasts": {...}, "fields": [...]}
+                    -> {"results": {...}}
+    POST /batch     {"items": [{"decisions": {...}, "forecasts": {...}}, ...],
+                     "state": {...}, "fields": [...]}
+                    -> {"results": [{...}, ...]}
+    POST /sweep     {"decisions": {...}, "axes": {"produit_a_ct.prix_tarif": [19, 20, 21]
+                                                or {"low": 18, "high": 24, "points": 7}},
+                     "objective": "resultat_net", "maximize": true, "fields": [...], "top": 20}
+                    -> {"rows": n, "best": {...}, "top": [...]}
+    GET  /metrics   latency percentiles, throughput, batch sizes
+    GET  /health
+
+Decisions and state accept the forms of mirage.cli (nested, flat schema paths
+or app widget keys) and are partial: missing fields come from the server's
+initial state/decisions (--report / --session), or the defaults.
+
+Concurrent /evaluate calls are coalesced: a batcher thread waits at most
+`--max-wait` ms for more requests (up to `--max-batch`) and evaluates them
+together, spread over a process pool created once at startup (workers stay
+warm between calls). With `--workers 0` everything runs in the batcher thread.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .calculator import calculate_all
+from .cli import decisions_from_dict, load_state, result_values, state_from_dict
+from .models import AllDecisions, CalculatedResults, PeriodState
+from .schema import DECISIONS_SCHEMA, RESULTS_SCHEMA
+
+DEFAULT_PORT = 8765
+MAX_SWEEP_ROWS = 250_000
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+# (decisions, state, forecasts)
+Work = Tuple[AllDecisions, PeriodState, Optional[Dict[str, int]]]
+
+
+def _evaluate_chunk(work: List[Work]) -> List[CalculatedResults]:
+    return [calculate_all(d, s, forecast_sales=f) for d, s, f in work]
+
+
+def _warm_up(_: int = 0) -> int:
+    calculate_all(AllDecisions(), PeriodState())
+    return os.getpid()
+
+
+# =============================================================================
+# Évaluation par lots
+# =============================================================================
+
+class Evaluator:
+    """
+    Evaluates lists of work items, in a process pool kept alive for the life
+    of the server (or inline with workers=0). Lists shorter than `min_split`
+    stay in one process: below that, pickling costs more than it saves.
+    """
+
+    def __init__(self, workers: int = 0, min_split: int = 64):
+        self.workers = workers
+        self.min_split = min_split
+        self._pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        if self._pool is not None:
+            # Start every worker now and import the calculator there
+            list(self._pool.map(_warm_up, range(workers)))
+
+    def evaluate(self, work: List[Work]) -> List[CalculatedResults]:
+        if self._pool is None or len(work) < self.min_split:
+            return _evaluate_chunk(work)
+        size = max(self.min_split // 2, math.ceil(len(work) / (self.workers * 4)))
+        chunks = [work[i:i + size] for i in range(0, len(work), size)]
+        return [r for part in self._pool.map(_evaluate_chunk, chunks) for r in part]
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class MicroBatcher:
+    """
+    Coalesces single evaluations submitted from many threads: the first
+    pending request opens a window of `max_wait` seconds (or until `max_batch`
+    requests are queued), then the whole batch goes to the evaluator at once.
+    """
+
+    def __init__(self, evaluator: Evaluator, metrics: "Metrics",
+                 max_batch: int = 256, max_wait: float = 0.002):
+        self.evaluator = evaluator
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[Tuple[Work, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="mirage-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, work: Work) -> Future:
+        future: Future = Future()
+        self._queue.put((work, future))
+        return future
+
+    def _loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._run(batch)
+
+    def _run(self, batch: List[Tuple[Work, Future]]) -> None:
+        try:
+            results = self.evaluator.evaluate([work for work, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.metrics.batch(len(batch))
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=1.0)
+
+
+# =============================================================================
+# Métriques
+# =============================================================================
+
+def _percentile(values: Sequence[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Metrics:
+    """Per-endpoint request counts and latencies (last `window` requests), rows evaluated."""
+
+    def __init__(self, window: int = 2048):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._window = window
+        self._latency: Dict[str, Deque[float]] = {}
+        self._count: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        # (timestamp, rows) of recent evaluations, for the current throughput
+        self._recent: Deque[Tuple[float, int]] = deque(maxlen=4096)
+        self.rows = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.max_batch_seen = 0
+
+    def request(self, endpoint: str, seconds: float, rows: int, ok: bool = True) -> None:
+        with self._lock:
+            self._count[endpoint] = self._count.get(endpoint, 0) + 1
+            if not ok:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+                return
+            self._latency.setdefault(endpoint, deque(maxlen=self._window)).append(seconds)
+            self.rows += rows
+            self._recent.append((time.time(), rows))
+
+    def batch(self, size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += size
+            self.max_batch_seen = max(self.max_batch_seen, size)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            uptime = now - self.started
+            recent = sum(rows for t, rows in self._recent if now - t <= 60.0)
+            endpoints = {}
+            for name, count in self._count.items():
+                latency = list(self._latency.get(name, ()))
+                endpoints[name] = {
+                    "requests": count,
+                    "errors": self._errors.get(name, 0),
+                    "latency_ms": {
+                        key: (round(v * 1000, 3) if v is not None else None)
+                        for key, v in (
+                            ("p50", _percentile(latency, 0.50)),
+                            ("p95", _percentile(latency, 0.95)),
+                            ("p99", _percentile(latency, 0.99)),
+                            ("max", max(latency) if latency else None),
+                        )
+                    },
+                }
+            return {
+                "uptime_s": round(uptime, 1),
+                "rows_evaluated": self.rows,
+                "rows_per_s": round(self.rows / uptime, 1) if uptime else 0.0,
+                "rows_per_s_last_60s": round(recent / min(60.0, uptime), 1) if uptime else 0.0,
+                "batches": self.batches,
+                "mean_batch_size": (
+                    round(self.batched_requests / self.batches, 2) if self.batches else 0.0
+                ),
+                "max_batch_size": self.max_batch_seen,
+                "endpoints": endpoints,
+            }
+
+
+# =============================================================================
+# Service
+# =============================================================================
+
+def _axis(path: str, spec: Any) -> List[Any]:
+    if path not in DECISIONS_SCHEMA:
+        raise ValueError(f"Champ de décision inconnu: {path}")
+    if isinstance(spec, dict):
+        low, high = float(spec["low"]), float(spec["high"])
+        points = int(spec.get("points", 11))
+        if points < 1:
+            raise ValueError(f"Nombre de points invalide pour {path}")
+        values = [low + (high - low) * i / max(1, points - 1) for i in range(points)]
+        if DECISIONS_SCHEMA[path].type is int:
+            return sorted({int(round(v)) for v in values})
+        return values
+    if not isinstance(spec, list) or not spec:
+        raise ValueError(f"Axe vide pour {path}")
+    return spec
+
+
+def _fields(payload: Dict[str, Any]) -> Optional[List[str]]:
+    fields = payload.get("fields")
+    if fields is None:
+        return None
+    unknown = [name for name in fields if name not in RESULTS_SCHEMA]
+    if unknown:
+        raise ValueError(f"Résultats inconnus: {', '.join(unknown)}")
+    return list(fields)
+
+
+class EvaluationService:
+    """The request handlers' logic, independent from HTTP."""
+
+    def __init__(
+        self,
+        state: Optional[PeriodState] = None,
+        decisions: Optional[AllDecisions] = None,
+        workers: int = 0,
+        max_batch: int = 256,
+        max_wait: float = 0.002,
+    ):
+        self.state = state or PeriodState()
+        self.decisions = decisions or AllDecisions()
+        self.metrics = Metrics()
+        self.evaluator = Evaluator(workers)
+        self.batcher = MicroBatcher(self.evaluator, self.metrics, max_batch, max_wait)
+
+    def _work(self, item: Dict[str, Any], state: PeriodState) -> Work:
+        decisions = decisions_from_dict(item.get("decisions") or {}, self.decisions)
+        return decisions, state, item.get("forecasts")
+
+    def _state(self, payload: Dict[str, Any]) -> PeriodState:
+        if not payload.get("state"):
+            return self.state
+        return state_from_dict(payload["state"], self.state)
+
+    def evaluate(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        fields = _fields(payload)
+        result = self.batcher.submit(self._work(payload, self._state(payload))).result()
+        return {"results": result_values(result, fields)}, 1
+
+    def batch(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        fields = _fields(payload)
+        state = self._state(payload)
+        items = payload.get("items")
+        if not isinstance(items, list):
+            raise ValueError("'items' doit être une liste")
+        results = self.evaluator.evaluate([self._work(item, state) for item in items])
+        self.metrics.batch(len(items))
+        return {"results": [result_values(r, fields) for r in results]}, len(items)
+
+    def sweep(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        fields = _fields(payload)
+        state = self._state(payload)
+        axes = {path: _axis(path, spec) for path, spec in (payload.get("axes") or {}).items()}
+        if not axes:
+            raise ValueError("'axes' est vide")
+        rows = math.prod(len(values) for values in axes.values())
+        if rows > MAX_SWEEP_ROWS:
+            raise ValueError(f"Grille trop grande: {rows} lignes (max {MAX_SWEEP_ROWS})")
+        objective = payload.get("objective", "resultat_net")
+        if objective not in RESULTS_SCHEMA:
+            raise ValueError(f"Résultat inconnu: {objective}")
+        sign = 1.0 if payload.get("maximize", True) else -1.0
+        top = int(payload.get("top", 20))
+
+        base = decisions_from_dict(payload.get("decisions") or {}, self.decisions)
+        forecasts = payload.get("forecasts")
+        setters = [DECISIONS_SCHEMA[path].set for path in axes]
+        points = list(itertools.product(*axes.values()))
+        work = []
+        for point in points:
+            decisions = DECISIONS_SCHEMA.from_flat({}, base=base)
+            for setter, value in zip(setters, point):
+                setter(decisions, value)
+            work.append((decisions, state, forecasts))
+        results = self.evaluator.evaluate(work)
+        self.metrics.batch(len(work))
+
+        order = sorted(
+            range(len(results)),
+            key=lambda i: sign * RESULTS_SCHEMA.get(results[i], objective),
+            reverse=True,
+        )
+        out_fields = fields or [objective]
+
+        def row(i: int) -> Dict[str, Any]:
+            return {**dict(zip(axes, points[i])), **result_values(results[i], out_fields)}
+
+        return {
+            "rows": rows,
+            "objective": objective,
+            "best": row(order[0]),
+            "top": [row(i) for i in order[:top]],
+        }, rows
+
+    def close(self) -> None:
+        self.batcher.close()
+        self.evaluator.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: EvaluationService
+    protocol_version = "HTTP/1.1"
+
+    routes = {"/evaluate": "evaluate", "/batch": "batch", "/sweep": "sweep"}
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            self._send(200, self.service.metrics.snapshot())
+        elif self.path == "/health":
+            self._send(200, {"status": "ok", "workers": self.service.evaluator.workers})
+        else:
+            self._send(404, {"error": f"Route inconnue: {self.path}"})
+
+    def do_POST(self) -> None:
+        name = self.routes.get(self.path)
+        if name is None:
+            self._send(404, {"error": f"Route inconnue: {self.path}"})
+            return
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                raise ValueError("Requête trop volumineuse")
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Le corps doit être un objet JSON")
+            body, rows = getattr(self.service, name)(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            self.service.metrics.request(self.path, time.perf_counter() - start, 0, ok=False)
+            self._send(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self.service.metrics.request(self.path, time.perf_counter() - start, 0, ok=False)
+            self._send(500, {"error": str(e)})
+            return
+        self.service.metrics.request(self.path, time.perf_counter() - start, rows)
+        self._send(200, body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many clients connect at once (that is what makes batching pay off)
+    request_queue_size = 256
+
+
+def make_server(
+    service: EvaluationService, host: str = "127.0.0.1", port: int = DEFAULT_PORT
+) -> ThreadingHTTPServer:
+    """HTTP server bound to `service` (call serve_forever(); port 0 picks a free port)."""
+    handler = type("Handler", (_Handler,), {"service": service})
+    return _Server((host, port), handler)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="mirage-server", description="Service local d'évaluation JSON/HTTP."
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--report", help="Rapport markdown donnant l'état initial")
+    source.add_argument("--session", help="Session sauvegardée (.json ou .mrsn)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processus de calcul (0: dans le serveur)")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait", type=float, default=2.0, help="Fenêtre de regroupement (ms)")
+    args = parser.parse_args(argv)
+
+    try:
+        state, scenarios = load_state(args.report, args.session)
+    except (OSError, ValueError) as e:
+        print(f"mirage-server: {e}", file=sys.stderr)
+        return 1
+    service = EvaluationService(
+        state=state,
+        decisions=scenarios[0][1] if scenarios else None,
+        workers=max(0, args.workers),
+        max_batch=args.max_batch,
+        max_wait=args.max_wait / 1000.0,
+    )
+    server = make_server(service, args.host, args.port)
+    print(f"mirage-server: http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
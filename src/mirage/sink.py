@@ -0,0 +1,261 @@
+"""
+Streaming result sinks for sweeps and Monte Carlo runs.
+
+An engine writes column batches as they come; the sink buffers at most
+`chunk_rows` rows and flushes them as one part file, so memory stays bounded
+whatever the size of the run.
+
+    with open_sink("data/runs/sweep-42") as sink:     # Parquet parts if pyarrow, else CSV
+        for decisions, results in engine:
+            sink.write(results)                        # ResultBatch, DataFrame or {col: array}
+    frame = read_results("data/runs/sweep-42", columns=["resultat_net"])
+
+A directory sink writes `part-000000.parquet` (or .csv) files atomically
+(temporary file + rename): readers see every completed chunk while the run is
+still going, never a half-written one. XlsxSink streams rows into a single
+openpyxl write-only workbook instead; that file is only readable once closed.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional: fall back to CSV parts
+    pa = None
+    pq = None
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+_PART_PREFIX = "part-"
+_FORMATS = ("parquet", "csv")
+
+
+def _columns_of(data: Any) -> Dict[str, np.ndarray]:
+    """{column: 1-D array} from a DecisionBatch/ResultBatch, a DataFrame or a mapping."""
+    if hasattr(data, "columns") and isinstance(data.columns, dict):
+        columns = data.columns
+    elif hasattr(data, "to_dict") and hasattr(data, "iloc"):
+        columns = {str(name): data[name].to_numpy() for name in data.columns}
+    else:
+        columns = {name: np.asarray(values) for name, values in data.items()}
+    out = {}
+    for name, values in columns.items():
+        if values.dtype == object and len(values) and isinstance(values[0], (tuple, list)):
+            # ResultBatch.warnings: tuples of messages become one text cell
+            values = np.array(["; ".join(v) for v in values], dtype=object)
+        out[name] = values
+    return out
+
+
+def _atomic_write(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ResultSink:
+    """
+    Chunked writer to a directory of part files (Parquet, or CSV without pyarrow).
+
+    `write(data, chunk_id=...)` lets an engine name its chunks: a resumed run
+    rewrites the same part instead of duplicating it (see completed_chunks()).
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        format: Optional[str] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ):
+        if format is None:
+            format = "parquet" if pq is not None else "csv"
+        if format not in _FORMATS:
+            raise ValueError(f"Format inconnu: {format} (attendu: {', '.join(_FORMATS)})")
+        if format == "parquet" and pq is None:
+            raise ImportError("Le format parquet nécessite pyarrow")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._buffer: List[Dict[str, np.ndarray]] = []
+        self._buffered = 0
+        existing = completed_chunks(self.directory)
+        self._next_chunk = existing[-1] + 1 if existing else 0
+        self._closed = False
+
+    # -------------------------------------------------------------------------
+    # Écriture
+    # -------------------------------------------------------------------------
+
+    def write(self, data: Any, chunk_id: Optional[int] = None) -> None:
+        """
+        Append a batch. With `chunk_id` the batch is written at once as that
+        chunk (after flushing the buffer); otherwise it is buffered.
+        """
+        if self._closed:
+            raise ValueError("Sink fermé")
+        columns = _columns_of(data)
+        n = len(next(iter(columns.values()))) if columns else 0
+        if chunk_id is not None:
+            self.flush()
+            self._write_part(chunk_id, columns, n)
+            return
+        self._buffer.append(columns)
+        self._buffered += n
+        if self._buffered >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as the next part."""
+        if not self._buffered:
+            self._buffer.clear()
+            return
+        names = list(self._buffer[0])
+        columns = {name: np.concatenate([b[name] for b in self._buffer]) for name in names}
+        n = self._buffered
+        self._buffer.clear()
+        self._buffered = 0
+        self._write_part(self._next_chunk, columns, n)
+
+    def _write_part(self, chunk_id: int, columns: Dict[str, np.ndarray], n: int) -> None:
+        path = self.directory / f"{_PART_PREFIX}{chunk_id:06d}.{self.format}"
+        if self.format == "parquet":
+            table = pa.table(columns)
+            _atomic_write(path, lambda tmp: pq.write_table(table, tmp))
+        else:
+            import pandas as pd
+
+            frame = pd.DataFrame(columns, copy=False)
+            _atomic_write(path, lambda tmp: frame.to_csv(tmp, index=False))
+        self.rows_written += n
+        self._next_chunk = max(self._next_chunk, chunk_id + 1)
+
+    def close(self) -> None:
+        if not self._closed:
+            self.flush()
+            self._closed = True
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class XlsxSink:
+    """
+    Rows streamed into one .xlsx with openpyxl's write-only mode (constant memory).
+    The workbook is only valid after close().
+    """
+
+    def __init__(self, path: Union[str, Path], sheet: str = "Résultats"):
+        from openpyxl import Workbook
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet)
+        self._header: Optional[List[str]] = None
+        self.rows_written = 0
+
+    def write(self, data: Any, chunk_id: Optional[int] = None) -> None:
+        columns = _columns_of(data)
+        if self._header is None:
+            self._header = list(columns)
+            self._sheet.append(self._header)
+        # .tolist() gives Python scalars, which openpyxl accepts (not NumPy ones)
+        lists = [columns[name].tolist() for name in self._header]
+        for row in zip(*lists):
+            self._sheet.append(row)
+            self.rows_written += 1
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._workbook is not None:
+            _atomic_write(self.path, self._workbook.save)
+            self._workbook = None
+
+    def __enter__(self) -> "XlsxSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_sink(
+    path: Union[str, Path], format: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Union[ResultSink, XlsxSink]:
+    """XlsxSink for a .xlsx path (or format='xlsx'), else a ResultSink directory."""
+    if format == "xlsx" or str(path).lower().endswith(".xlsx"):
+        return XlsxSink(path)
+    return ResultSink(path, format, chunk_rows)
+
+
+# =============================================================================
+# Lecture (y compris pendant un run)
+# =============================================================================
+
+def _parts(directory: Union[str, Path]) -> List[Tuple[int, Path]]:
+    parts = []
+    for path in Path(directory).glob(f"{_PART_PREFIX}*"):
+        stem, _, ext = path.name.partition(".")
+        if ext in _FORMATS:
+            try:
+                parts.append((int(stem[len(_PART_PREFIX):]), path))
+            except ValueError:
+                continue
+    parts.sort()
+    return parts
+
+
+def completed_chunks(directory: Union[str, Path]) -> List[int]:
+    """Ids of the chunks fully written so far, sorted."""
+    return [chunk_id for chunk_id, _ in _parts(directory)]
+
+
+def _read_part(path: Path, columns: Optional[Sequence[str]]):
+    import pandas as pd
+
+    if path.suffix == ".parquet":
+        if pq is None:
+            raise ImportError("Lire des parts parquet nécessite pyarrow")
+        return pq.read_table(path, columns=list(columns) if columns else None).to_pandas()
+    return pd.read_csv(path, usecols=list(columns) if columns else None)
+
+
+def iter_chunks(
+    directory: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    start: int = 0,
+) -> Iterator[Tuple[int, Any]]:
+    """(chunk_id, DataFrame) of each completed chunk with id >= start."""
+    for chunk_id, path in _parts(directory):
+        if chunk_id >= start:
+            yield chunk_id, _read_part(path, columns)
+
+
+def read_results(directory: Union[str, Path], columns: Optional[Sequence[str]] = None):
+    """Every completed chunk concatenated (partial while the run is in progress)."""
+    import pandas as pd
+
+    frames = [frame for _, frame in iter_chunks(directory, columns)]
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns else None)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,284 @@
+"""
+Compact, versioned binary snapshots of decisions + initial state + forecasts.
+
+File layout (little-endian):
+
+    MAGIC "MRSN" | u16 version | u8 flags | body          (body zlib-compressed if flags & 1)
+    body   = u16 field count | fields | u32 record count | records
+    field  = u8 type code (q int, d float, ? bool, s str) | u8 name length | name (UTF-8)
+    record = one struct block of the non-str fields | each str field as u16 length + UTF-8
+
+The field table is written once per file, so a file describes itself: a reader
+matches fields by name, gives fields missing from the file their model default,
+and collects the fields it does not know in `Snapshot.extra` (sorted by name)
+instead of failing. A forecast that was not given is written as -1 and read
+back as absent: calculate_all treats a missing forecast (sell what is
+available) differently from a forecast of 0. Semantic changes between
+versions (renames, unit changes) go through MIGRATIONS, applied to each
+record of an older file before it is built.
+"""
+
+import os
+import struct
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple, Union
+
+from .models import AllDecisions, PeriodState
+from .schema import schema_for
+
+SNAPSHOT_VERSION = 2
+
+_MAGIC = b"MRSN"
+_HEADER = struct.Struct("<4sHB")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_FLAG_ZLIB = 1
+
+_TYPE_CODES = {int: "q", float: "d", bool: "?", str: "s"}
+_CASTS = {"q": int, "d": float, "?": bool, "s": str}
+
+# Forecast sales volumes (U) of the "Prévisions" block
+FORECAST_KEYS = ("A-CT", "A-GS", "B-CT", "B-GS", "C-CT", "C-GS")
+# Stored value of a forecast that was not given (volumes are never negative)
+_NO_FORECAST = -1
+
+
+def _v1_absent_forecasts(record: Dict[str, Any]) -> Dict[str, Any]:
+    # Version 1 wrote 0 for missing forecasts, and the app never passed any:
+    # six zeros mean "no forecasts", not "sell nothing".
+    names = [f"forecasts.{key}" for key in FORECAST_KEYS]
+    if all(record.get(name, 0) == 0 for name in names):
+        record.update(dict.fromkeys(names, _NO_FORECAST))
+    return record
+
+
+# version -> function upgrading one record ({name: value}) from that version to the next
+MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    1: _v1_absent_forecasts,
+}
+
+
+class SnapshotError(ValueError):
+    """Unreadable snapshot data (bad magic, truncated or corrupted content)."""
+
+
+@dataclass
+class Snapshot:
+    """What is needed to replay a scenario: decisions, initial state and sales forecasts."""
+
+    decisions: AllDecisions = field(default_factory=AllDecisions)
+    state: PeriodState = field(default_factory=PeriodState)
+    forecasts: Dict[str, int] = field(default_factory=dict)
+    # Fields found in the file but unknown to this version, by name
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def _current_layout() -> List[Tuple[str, str]]:
+    """(name, type code) of every field written by this version."""
+    layout = []
+    for prefix, model in (("decisions", AllDecisions), ("state", PeriodState)):
+        for spec in schema_for(model):
+            layout.append((f"{prefix}.{spec.path}", _TYPE_CODES[spec.type]))
+    layout += [(f"forecasts.{key}", "q") for key in FORECAST_KEYS]
+    return layout
+
+
+_LAYOUT = _current_layout()
+
+
+class _Codec:
+    """Precompiled packing for one field table."""
+
+    def __init__(self, layout: Sequence[Tuple[str, str]]):
+        self.layout = list(layout)
+        self.numeric = [(i, code) for i, (_, code) in enumerate(self.layout) if code != "s"]
+        self.strings = [i for i, (_, code) in enumerate(self.layout) if code == "s"]
+        self.block = struct.Struct("<" + "".join(code for _, code in self.layout if code != "s"))
+
+    def pack(self, values: Sequence[Any]) -> bytes:
+        parts = [self.block.pack(*[_CASTS[code](values[i]) for i, code in self.numeric])]
+        for i in self.strings:
+            raw = str(values[i]).encode("utf-8")
+            parts.append(_U16.pack(len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+
+    def unpack(self, data: memoryview, offset: int) -> Tuple[List[Any], int]:
+        values: List[Any] = [None] * len(self.layout)
+        for (i, _), value in zip(self.numeric, self.block.unpack_from(data, offset)):
+            values[i] = value
+        offset += self.block.size
+        for i in self.strings:
+            (length,) = _U16.unpack_from(data, offset)
+            offset += 2
+            values[i] = bytes(data[offset:offset + length]).decode("utf-8")
+            offset += length
+        return values, offset
+
+
+_CODEC = _Codec(_LAYOUT)
+
+
+def _flatten(snapshot: Snapshot) -> List[Any]:
+    decisions = schema_for(AllDecisions).to_flat(snapshot.decisions)
+    state = schema_for(PeriodState).to_flat(snapshot.state)
+    values = list(decisions.values()) + list(state.values())
+    values += [snapshot.forecasts.get(key, _NO_FORECAST) for key in FORECAST_KEYS]
+    return values
+
+
+def _build(record: Dict[str, Any]) -> Snapshot:
+    decisions, state, forecasts, extra = {}, {}, {}, {}
+    decision_schema = schema_for(AllDecisions)
+    state_schema = schema_for(PeriodState)
+    for name, value in record.items():
+        section, _, path = name.partition(".")
+        if section == "decisions" and path in decision_schema:
+            decisions[path] = value
+        elif section == "state" and path in state_schema:
+            state[path] = value
+        elif section == "forecasts" and path in FORECAST_KEYS:
+            if value is not None and value >= 0:
+                forecasts[path] = value
+        else:
+            extra[name] = value
+    return Snapshot(
+        decisions=decision_schema.from_flat(decisions),
+        state=state_schema.from_flat(state),
+        forecasts=forecasts,
+        extra=dict(sorted(extra.items())),
+    )
+
+
+# =============================================================================
+# Encodage
+# =============================================================================
+
+def dumps(snapshots: Sequence[Snapshot], compress: bool = True) -> bytes:
+    """Encode snapshots into one self-describing binary blob."""
+    parts = [_U16.pack(len(_LAYOUT))]
+    for name, code in _LAYOUT:
+        raw = name.encode("utf-8")
+        parts += [code.encode("ascii"), _U8.pack(len(raw)), raw]
+    parts.append(_U32.pack(len(snapshots)))
+    parts += [_CODEC.pack(_flatten(s)) for s in snapshots]
+    body = b"".join(parts)
+    flags = 0
+    if compress:
+        body, flags = zlib.compress(body), _FLAG_ZLIB
+    return _HEADER.pack(_MAGIC, SNAPSHOT_VERSION, flags) + body
+
+
+def loads(data: bytes) -> List[Snapshot]:
+    """Decode a blob written by dumps() (by this or any other version)."""
+    if len(data) < _HEADER.size:
+        raise SnapshotError("Snapshot tronqué")
+    magic, version, flags = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise SnapshotError("Ce fichier n'est pas un snapshot Mirage")
+    body = data[_HEADER.size:]
+    try:
+        if flags & _FLAG_ZLIB:
+            body = zlib.decompress(body)
+        view = memoryview(body)
+        (n_fields,) = _U16.unpack_from(view, 0)
+        offset = 2
+        layout = []
+        for _ in range(n_fields):
+            code = chr(view[offset])
+            length = view[offset + 1]
+            name = bytes(view[offset + 2:offset + 2 + length]).decode("utf-8")
+            offset += 2 + length
+            if code not in _CASTS:
+                raise SnapshotError(f"Type de champ inconnu: {code!r}")
+            layout.append((name, code))
+        codec = _CODEC if layout == _LAYOUT else _Codec(layout)
+        names = [name for name, _ in layout]
+        (count,) = _U32.unpack_from(view, offset)
+        offset += 4
+        snapshots = []
+        for _ in range(count):
+            values, offset = codec.unpack(view, offset)
+            record = dict(zip(names, values))
+            for v in range(version, SNAPSHOT_VERSION):
+                if v in MIGRATIONS:
+                    record = MIGRATIONS[v](record)
+            snapshots.append(_build(record))
+    except SnapshotError:
+        raise
+    except (struct.error, zlib.error, UnicodeDecodeError, IndexError) as e:
+        raise SnapshotError(f"Snapshot corrompu: {e}") from e
+    return snapshots
+
+
+def dump_one(snapshot: Snapshot, compress: bool = True) -> bytes:
+    return dumps([snapshot], compress)
+
+
+def load_one(data: bytes) -> Snapshot:
+    snapshots = loads(data)
+    if len(snapshots) != 1:
+        raise SnapshotError(f"{len(snapshots)} snapshots trouvés, 1 attendu")
+    return snapshots[0]
+
+
+# =============================================================================
+# Fichiers
+# =============================================================================
+
+def save(path: Union[str, Path], snapshots: Sequence[Snapshot]) -> None:
+    """Write snapshots atomically (temporary file + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps(snapshots))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load(path: Union[str, Path]) -> List[Snapshot]:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# =============================================================================
+# Session Streamlit
+# =============================================================================
+
+def snapshot_from_session(
+    session: Mapping[str, Any], forecasts: Mapping[str, int] = None
+) -> Snapshot:
+    """Snapshot of the bound widgets of a session (see mirage.binding)."""
+    from .binding import DECISION_BINDINGS, STATE_BINDINGS
+
+    state = session.get("state")
+    state = STATE_BINDINGS.build(session, base=state if isinstance(state, PeriodState) else None)
+    if "period_selector_val" in session:
+        state.period_num = session["period_selector_val"]
+    return Snapshot(
+        decisions=DECISION_BINDINGS.build(session),
+        state=state,
+        forecasts=dict(forecasts or {}),
+    )
+
+
+def session_values(snapshot: Snapshot) -> Dict[str, Any]:
+    """{widget key: value} restoring a snapshot into a session."""
+    from .binding import DECISION_BINDINGS, STATE_BINDINGS
+
+    values = DECISION_BINDINGS.widget_values(snapshot.decisions)
+    values.update(STATE_BINDINGS.widget_values(snapshot.state))
+    values["state"] = snapshot.state
+    values["period_selector_val"] = snapshot.state.period_num
+    return values
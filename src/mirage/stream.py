@@ -0,0 +1,117 @@
+"""Streaming parser for large bundles of concatenated Mirage reports."""
+
+import mmap
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .parser import SECTION_ALIASES, clean_markdown_cell, normalize_header, split_table_row
+from .report import REPORT_SECTION_ALIASES
+
+# Explicit report boundary written when bundling exports: <!-- mirage-report: <id> -->
+REPORT_MARKER = re.compile(r"^<!--\s*mirage-report:\s*(.*?)\s*-->$")
+
+
+def _section_lookup() -> Dict[str, str]:
+    """Normalized header -> section name (typed names first, then the legacy-only ones)."""
+    lookup: Dict[str, str] = {}
+    for name, aliases in list(REPORT_SECTION_ALIASES.items()) + list(SECTION_ALIASES.items()):
+        for alias in aliases:
+            lookup.setdefault(alias.lower(), name)
+    return lookup
+
+
+SECTION_LOOKUP = _section_lookup()
+
+
+def iter_lines(path: Union[str, Path]) -> Iterator[str]:
+    """
+    Yield the decoded lines of a file without loading it as one string.
+    Uses mmap when possible, buffered reads otherwise (empty files, pipes).
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mm = None
+        if mm is None:
+            for raw in f:
+                yield raw.decode("utf-8").rstrip("\r\n")
+            return
+        with mm:
+            for raw in iter(mm.readline, b""):
+                yield raw.decode("utf-8").rstrip("\r\n")
+
+
+def stream_tables(
+    source: Union[str, Path], default_id: Optional[str] = None
+) -> Iterator[Tuple[str, str, List[List[str]]]]:
+    """
+    Yield (report_id, section, rows) for every known section of every report in a bundle.
+
+    A new report starts at a '<!-- mirage-report: id -->' marker, or when a section
+    that the current report already contained shows up again (unmarked
+    concatenations get ids '<default_id>#1', '#2', ...). Only the table being
+    read is held in memory. Rows follow the typed-section rules of Report:
+    sub-headers stay inside their section and '- label: value' items are rows.
+    """
+    base = default_id or Path(source).stem
+    counter = 0
+    report_id = ""
+    explicit = False
+    seen: set = set()
+
+    section: Optional[str] = None
+    level = 0
+    rows: List[List[str]] = []
+
+    def new_report_id() -> str:
+        nonlocal counter
+        counter += 1
+        return f"{base}#{counter}"
+
+    for line in iter_lines(source):
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        marker = REPORT_MARKER.match(stripped)
+        if marker:
+            if section is not None:
+                yield report_id, section, rows
+            section, rows = None, []
+            report_id, explicit, seen = marker.group(1), True, set()
+            continue
+
+        if stripped.startswith("#") and "|" not in stripped:
+            header_level = len(stripped) - len(stripped.lstrip("#"))
+            name = SECTION_LOOKUP.get(normalize_header(stripped))
+            if name is None and (section is None or header_level > level):
+                # Unknown sub-header: part of the current section
+                continue
+            if section is not None:
+                yield report_id, section, rows
+            section, rows = None, []
+            if name is None:
+                continue
+            if not report_id or (name in seen and not explicit):
+                report_id, seen = new_report_id(), set()
+            elif name in seen:
+                # Repeated section inside a marked report: treat it as the next report
+                report_id, explicit, seen = new_report_id(), False, set()
+            seen.add(name)
+            section, level = name, header_level
+            continue
+
+        if section is None:
+            continue
+        if "|" in stripped:
+            cells = split_table_row(stripped)
+            if cells is not None:
+                rows.append(cells)
+        elif stripped.startswith(("- ", "* ")) and ":" in stripped:
+            label, _, value = stripped[2:].rpartition(":")
+            rows.append([clean_markdown_cell(label), clean_markdown_cell(value)])
+
+    if section is not None:
+        yield report_id, section, rows
@@ -0,0 +1,218 @@
+"""
+Dense 2-D decision surfaces: every (x, y) of two decision fields evaluated in
+one batch, for heatmaps.
+
+    surface = evaluate_surface(decisions, state,
+                               "produit_a_ct.prix_tarif", axis_values(..., 200),
+                               "produit_a_ct.production", axis_values(..., 200))
+    surface["resultat_net"]           # (len(y), len(x)) array
+    surface.feasible, surface.best("resultat_net", feasible_only=True)
+
+Unlike mirage.sweep, which streams arbitrary grids to disk, a surface stays in
+memory and keeps only the fields a heatmap needs: the objectives plus what the
+feasibility overlays are computed from (workers, raw materials, warnings).
+Cells are evaluated in place on one working copy of the decisions (two field
+writes per cell, no per-row dataclass copies), and rows of the grid can be
+spread over a process pool. If the pool fails (broken workers, arguments
+that cannot be pickled), the grid is evaluated in this process instead.
+"""
+
+import math
+import pickle
+import time
+from concurrent.futures import BrokenExecutor, Executor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calculator import calculate_all
+from .models import AllDecisions, PeriodState
+from .schema import DECISIONS_SCHEMA, RESULTS_SCHEMA, _deepcopy_dataclass
+
+SURFACE_OBJECTIVES = ("resultat_net", "tresorerie_estimee")
+
+# Results behind the feasibility overlays
+_OVERLAY_FIELDS = (
+    "ouvriers_necessaires", "ouvriers_disponibles", "mp_n_apres_prod", "mp_s_apres_prod"
+)
+ALERTS = "alertes"  # number of "⚠️" warnings of a cell
+
+
+def axis_range(
+    decisions: AllDecisions, state: PeriodState, path: str, spread: float = 0.5
+) -> Tuple[float, float]:
+    """
+    Default (low, high) of a heatmap axis: the current value ± `spread`,
+    machines over the fleet available at the start of the period, hires and
+    layoffs around the current decision. Clipped to the schema bounds.
+    """
+    spec = DECISIONS_SCHEMA[path]
+    value = float(spec.get(decisions))
+    if path.startswith("production.machines_m"):
+        fleet = state.nb_machines_m1 if "_m1_" in path else state.nb_machines_m2
+        low, high = 0.0, float(max(fleet, value, 1))
+    elif path == "production.emb_deb_ouvriers":
+        low, high = value - 100.0, value + 100.0
+    elif value:
+        low, high = sorted((value * (1 - spread), value * (1 + spread)))
+    else:
+        low, high = 0.0, float(spec.max) if spec.max is not None else 100.0
+    if spec.min is not None:
+        low = max(low, float(spec.min))
+    if spec.max is not None:
+        high = min(high, float(spec.max))
+    return low, max(low, high)
+
+
+def _surface_rows(
+    base: AllDecisions,
+    state: PeriodState,
+    forecasts: Optional[Dict[str, int]],
+    x_path: str,
+    x_values: Sequence,
+    y_path: str,
+    y_values: Sequence,
+    fields: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    """{field: (len(y_values), len(x_values)) array} (also runs in pool workers)."""
+    decisions = _deepcopy_dataclass(base)
+    set_x, set_y = DECISIONS_SCHEMA[x_path].set, DECISIONS_SCHEMA[y_path].set
+    getters = [RESULTS_SCHEMA[name].get for name in fields]
+    shape = (len(y_values), len(x_values))
+    out = [np.empty(shape) for _ in fields]
+    alerts = np.zeros(shape, dtype=np.int16)
+    for i, y in enumerate(y_values):
+        set_y(decisions, y)
+        for j, x in enumerate(x_values):
+            set_x(decisions, x)
+            result = calculate_all(decisions, state, forecast_sales=forecasts)
+            for array, get in zip(out, getters):
+                array[i, j] = get(result)
+            alerts[i, j] = sum(1 for w in result.warnings if w.startswith("⚠️"))
+    values = dict(zip(fields, out))
+    values[ALERTS] = alerts
+    return values
+
+
+def _pooled_rows(
+    pool: Executor,
+    workers: int,
+    base: AllDecisions,
+    state: PeriodState,
+    forecasts: Optional[Dict[str, int]],
+    x_path: str,
+    x_values: Sequence,
+    y_path: str,
+    y_values: Sequence,
+    fields: Sequence[str],
+) -> Optional[Dict[str, np.ndarray]]:
+    """_surface_rows over blocks of rows in `pool`; None if the pool cannot do the work."""
+    size = math.ceil(len(y_values) / (workers * 2))
+    blocks = [y_values[i:i + size] for i in range(0, len(y_values), size)]
+    args = (base, state, forecasts, x_path, x_values, y_path)
+    futures = []
+    try:
+        futures = [pool.submit(_surface_rows, *args, block, fields) for block in blocks]
+        parts = [f.result() for f in futures]
+    except (BrokenExecutor, RuntimeError, OSError, pickle.PicklingError, AttributeError, TypeError):
+        # Broken or shut-down pool, or arguments the workers cannot receive
+        for f in futures:
+            f.cancel()
+        return None
+    return {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+
+
+@dataclass
+class Surface:
+    """Values of result fields over the grid x_values × y_values (arrays indexed [y, x])."""
+
+    x_path: str
+    y_path: str
+    x: np.ndarray
+    y: np.ndarray
+    values: Dict[str, np.ndarray] = field(default_factory=dict)
+    seconds: float = 0.0
+    workers: int = 1  # processes actually used (1 after a fallback)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[name]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.y), len(self.x)
+
+    @property
+    def workers_short(self) -> np.ndarray:
+        """Cells needing more workers than present (seasonal workers hired)."""
+        return self["ouvriers_necessaires"] > self["ouvriers_disponibles"]
+
+    @property
+    def mp_short(self) -> np.ndarray:
+        """Cells where raw materials N or S run out."""
+        return (self["mp_n_apres_prod"] < 0) | (self["mp_s_apres_prod"] < 0)
+
+    @property
+    def feasible(self) -> np.ndarray:
+        return ~(self.workers_short | self.mp_short)
+
+    def best(
+        self, name: str, maximize: bool = True, feasible_only: bool = False
+    ) -> Optional[Dict[str, float]]:
+        """{x, y, value} of the best cell (None if no cell qualifies)."""
+        values = np.where(self.feasible, self[name], np.nan) if feasible_only else self[name]
+        if np.isnan(values).all():
+            return None
+        i, j = np.unravel_index(
+            np.nanargmax(values) if maximize else np.nanargmin(values), values.shape
+        )
+        return {"x": self.x[j].item(), "y": self.y[i].item(), "value": float(values[i, j])}
+
+
+def evaluate_surface(
+    base: AllDecisions,
+    state: PeriodState,
+    x_path: str,
+    x_values: Sequence,
+    y_path: str,
+    y_values: Sequence,
+    forecasts: Optional[Dict[str, int]] = None,
+    objectives: Sequence[str] = SURFACE_OBJECTIVES,
+    pool: Optional[Executor] = None,
+    workers: int = 1,
+) -> Surface:
+    """
+    calculate_all on every cell of x_values × y_values applied to `base`.
+    With a `pool` (of `workers` processes), blocks of rows are evaluated in
+    parallel; otherwise, or if the pool fails, in this thread.
+    """
+    for path in (x_path, y_path):
+        if path not in DECISIONS_SCHEMA:
+            raise ValueError(f"Champ de décision inconnu: {path}")
+    if x_path == y_path:
+        raise ValueError("Les deux axes doivent être des champs différents")
+    for name in objectives:
+        if name not in RESULTS_SCHEMA:
+            raise ValueError(f"Résultat inconnu: {name}")
+    fields = list(dict.fromkeys(list(objectives) + list(_OVERLAY_FIELDS)))
+    x_values, y_values = list(x_values), list(y_values)
+
+    start = time.perf_counter()
+    values = None
+    if pool is not None and workers > 1 and len(y_values) >= 2:
+        values = _pooled_rows(
+            pool, workers, base, state, forecasts, x_path, x_values, y_path, y_values, fields
+        )
+    if values is None:
+        workers = 1
+        values = _surface_rows(base, state, forecasts, x_path, x_values, y_path, y_values, fields)
+
+    return Surface(
+        x_path=x_path,
+        y_path=y_path,
+        x=np.asarray(x_values),
+        y=np.asarray(y_values),
+        values=values,
+        seconds=time.perf_counter() - start,
+        workers=workers,
+    )
@@ -0,0 +1,268 @@
+"""
+Chunked sweeps over decision fields: full grids and Monte Carlo sampling.
+
+    spec = SweepSpec(base=decisions, state=state,
+                     axes={"produit_a_ct.prix_tarif": [19, 20, 21],
+                           "marketing.publicite_ct": [200, 400, 600]})
+    outcome = run_sweep(spec, job_id="prix-pub")    # resumable, see mirage.checkpoint
+
+Rows are evaluated chunk by chunk (DecisionBatch -> calculate_all -> ResultBatch)
+and streamed to a result sink, so a sweep never holds more than one chunk in
+memory. Paths are those of mirage.schema.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch import DecisionBatch, ResultBatch
+from .calculator import calculate_all
+from .checkpoint import Checkpoint, Checkpointer, CheckpointStore
+from .models import AllDecisions, PeriodState
+from .schema import DECISIONS_SCHEMA, RESULTS_SCHEMA
+
+DEFAULT_RUNS_DIR = Path(__file__).resolve().parents[2] / "data" / "runs"
+
+
+def evaluate_batch(
+    decisions: DecisionBatch, state: PeriodState, forecasts: Optional[Dict[str, int]] = None
+) -> ResultBatch:
+    """calculate_all for every row of a batch, with the same initial state."""
+    return ResultBatch.from_dataclasses(
+        calculate_all(d, state, forecast_sales=forecasts) for d in decisions.to_dataclasses()
+    )
+
+
+def grid_chunk(
+    base: AllDecisions, axes: Dict[str, Sequence[Any]], start: int, stop: int
+) -> DecisionBatch:
+    """
+    Rows [start, stop) of the cartesian product of `axes` (first axis varies
+    slowest) applied to `base`, without materializing the whole grid.
+    """
+    shape = tuple(len(values) for values in axes.values())
+    index = np.arange(start, stop)
+    batch = DecisionBatch.repeat(base, len(index))
+    for (path, values), positions in zip(axes.items(), np.unravel_index(index, shape)):
+        batch[path] = np.asarray(values)[positions]
+    return batch
+
+
+def sample_chunk(
+    base: AllDecisions,
+    ranges: Dict[str, Tuple[float, float]],
+    n: int,
+    rng: np.random.Generator,
+) -> DecisionBatch:
+    """`n` decisions with each path drawn uniformly in its (low, high) range (ints inclusive)."""
+    batch = DecisionBatch.repeat(base, n)
+    for path, (low, high) in ranges.items():
+        if DECISIONS_SCHEMA[path].type is int:
+            batch[path] = rng.integers(int(low), int(high), size=n, endpoint=True)
+        else:
+            batch[path] = rng.uniform(low, high, size=n)
+    return batch
+
+
+def ranges_around(
+    decisions: AllDecisions, paths: Sequence[str], spread: float = 0.2
+) -> Dict[str, Tuple[float, float]]:
+    """
+    (low, high) of each path: current value ± `spread` (a fraction), clipped to
+    the schema bounds. A zero value gets [0, 1] scaled by the field's upper bound
+    if it has one.
+    """
+    ranges = {}
+    for path in paths:
+        spec = DECISIONS_SCHEMA[path]
+        value = float(spec.get(decisions))
+        if value:
+            low, high = sorted((value * (1 - spread), value * (1 + spread)))
+        else:
+            low, high = 0.0, float(spec.max) if spec.max is not None else 1.0
+        if spec.min is not None:
+            low = max(low, float(spec.min))
+        if spec.max is not None:
+            high = min(high, float(spec.max))
+        ranges[path] = (low, max(low, high))
+    return ranges
+
+
+def axis_values(path: str, low: float, high: float, points: int) -> List[Any]:
+    """`points` evenly spaced values of a path (distinct rounded values for int fields)."""
+    values = np.linspace(low, high, points)
+    if DECISIONS_SCHEMA[path].type is int:
+        return sorted({int(round(v)) for v in values})
+    return [float(v) for v in values]
+
+
+@dataclass
+class SweepSpec:
+    """What to evaluate: a grid (`axes`) or `samples` Monte Carlo draws over `ranges`."""
+
+    base: AllDecisions = field(default_factory=AllDecisions)
+    state: PeriodState = field(default_factory=PeriodState)
+    axes: Dict[str, List[Any]] = field(default_factory=dict)
+    ranges: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    samples: int = 0
+    seed: int = 0
+    chunk_size: int = 1_000
+    forecasts: Optional[Dict[str, int]] = None
+    objective: str = "resultat_net"
+    maximize: bool = True
+
+    def __post_init__(self) -> None:
+        if self.axes and self.ranges:
+            raise ValueError("Une étude est soit une grille (axes), soit un tirage (ranges)")
+        for path in list(self.axes) + list(self.ranges):
+            if path not in DECISIONS_SCHEMA:
+                raise ValueError(f"Champ de décision inconnu: {path}")
+        if self.objective not in RESULTS_SCHEMA:
+            raise ValueError(f"Résultat inconnu: {self.objective}")
+
+    @property
+    def mode(self) -> str:
+        return "monte_carlo" if self.ranges else "grid"
+
+    @property
+    def total_rows(self) -> int:
+        if self.mode == "monte_carlo":
+            return self.samples
+        return int(np.prod([len(v) for v in self.axes.values()])) if self.axes else 1
+
+    @property
+    def n_chunks(self) -> int:
+        return -(-self.total_rows // self.chunk_size)
+
+    def chunk_bounds(self, chunk_id: int) -> Tuple[int, int]:
+        start = chunk_id * self.chunk_size
+        return start, min(start + self.chunk_size, self.total_rows)
+
+    def decisions(self, chunk_id: int, rng: Optional[np.random.Generator] = None) -> DecisionBatch:
+        start, stop = self.chunk_bounds(chunk_id)
+        if self.mode == "monte_carlo":
+            return sample_chunk(self.base, self.ranges, stop - start, rng)
+        return grid_chunk(self.base, self.axes, start, stop)
+
+    def params_hash(self) -> str:
+        """Stable digest of everything that changes the output of the run."""
+        return hashlib.sha256(repr((
+            self.base, self.state, sorted(self.axes.items()), sorted(self.ranges.items()),
+            self.samples, self.seed, self.chunk_size,
+            sorted((self.forecasts or {}).items()), self.objective, self.maximize,
+        )).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SweepOutcome:
+    job_id: str
+    directory: Path
+    rows: int
+    completed: List[int]
+    best: Optional[Dict[str, Any]]
+    cancelled: bool = False
+
+
+def default_job_id(spec: SweepSpec) -> str:
+    """Job ID derived from the parameters: the same sweep resumes by default."""
+    return f"sweep-{spec.params_hash()[:16]}"
+
+
+def run_sweep(
+    spec: SweepSpec,
+    job_id: Optional[str] = None,
+    directory: Union[str, Path, None] = None,
+    store: Optional[CheckpointStore] = None,
+    sink_factory: Optional[Callable[[Path], Any]] = None,
+    progress: Optional[Callable[[int, int, ResultBatch], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    checkpoint_every: float = 5.0,
+) -> SweepOutcome:
+    """
+    Evaluate a sweep chunk by chunk into `directory/<job_id>` and checkpoint it.
+
+    Rerunning with the same job ID resumes after the last checkpointed chunk:
+    the RNG is restored to its state at that point, so Monte Carlo draws are
+    identical to an uninterrupted run. Chunks written after the last checkpoint
+    are recomputed and overwrite their part file. `progress(done, total, results)`
+    is called after each chunk; `should_stop()` is polled between chunks.
+    """
+    from .sink import ResultSink
+
+    job_id = job_id or default_job_id(spec)
+    store = store or CheckpointStore()
+    out_dir = Path(directory or DEFAULT_RUNS_DIR) / job_id
+    sink = (sink_factory or ResultSink)(out_dir)
+
+    checkpoint = store.load(job_id)
+    if checkpoint is None:
+        checkpoint = Checkpoint(job_id=job_id, params_hash=spec.params_hash())
+    elif checkpoint.params_hash != spec.params_hash():
+        raise ValueError(f"Le job {job_id} existe déjà avec d'autres paramètres")
+
+    rng = np.random.default_rng(spec.seed)
+    if checkpoint.rng_state is not None:
+        rng.bit_generator.state = checkpoint.rng_state
+    saver = Checkpointer(store, checkpoint, checkpoint_every)
+
+    done = set(checkpoint.completed)
+    total = spec.n_chunks
+    cancelled = False
+    sign = 1.0 if spec.maximize else -1.0
+    try:
+        for chunk_id in range(total):
+            if chunk_id in done:
+                continue
+            if should_stop is not None and should_stop():
+                cancelled = True
+                break
+            start, _ = spec.chunk_bounds(chunk_id)
+            decisions = spec.decisions(chunk_id, rng)
+            results = evaluate_batch(decisions, spec.state, spec.forecasts)
+            sink.write(_rows_frame(spec, decisions, results, start), chunk_id=chunk_id)
+
+            scores = sign * results[spec.objective]
+            i = int(np.argmax(scores))
+            best = checkpoint.best
+            if best is None or scores[i] > sign * best["value"]:
+                checkpoint.best = {
+                    "value": float(results[spec.objective][i]),
+                    "row": start + i,
+                    "decisions": decisions.row(i),
+                }
+
+            done.add(chunk_id)
+            checkpoint.completed = sorted(done)
+            checkpoint.rows += len(results)
+            checkpoint.sampler_state = {"next_chunk": chunk_id + 1}
+            checkpoint.rng_state = rng.bit_generator.state
+            saver.maybe_save()
+            if progress is not None:
+                progress(len(done), total, results)
+        checkpoint.finished = len(done) == total
+    finally:
+        sink.close()
+        saver.maybe_save(force=True)
+
+    return SweepOutcome(
+        job_id=job_id,
+        directory=out_dir,
+        rows=checkpoint.rows,
+        completed=list(checkpoint.completed),
+        best=checkpoint.best,
+        cancelled=cancelled,
+    )
+
+
+def _rows_frame(
+    spec: SweepSpec, decisions: DecisionBatch, results: ResultBatch, start: int
+) -> Dict[str, np.ndarray]:
+    """Output columns of a chunk: row number, the swept decision paths, every result."""
+    columns: Dict[str, np.ndarray] = {"row": np.arange(start, start + len(results))}
+    for path in list(spec.axes) + list(spec.ranges):
+        columns[path] = decisions[path]
+    columns.update(results.columns)
+    return columns
@@ -0,0 +1,441 @@
+"""Synthetic Mirage reports (French export layout) for parser load tests and benchmarks."""
+
+import argparse
+import random
+import sys
+from typing import Iterator, List, Optional, TextIO
+
+PRODUCT_COLUMNS = ["A-CT", "B-CT", "C-CT", "A-GS", "B-GS", "C-GS", "TOTAL"]
+FIRMS = ["1", "2", "3", "4", "5", "6"]
+
+# Row labels of the product tables, in the order of "Simulation - year 0.md".
+# "" marks the blank separator rows of the exports.
+RESULTAT_PRODUIT_ROWS = [
+    "Ventes / Marche", "-Coût des produits", "-Commercialisation", "**Marge / Marche**", "",
+    "Ventes / Contrats", "-Coût des produits", "-Coût de transport", "**Marge / Contrats**", "",
+    "Ventes en Solde", "-Coût des produits", "**Marge / Soldes**", "",
+    "Marge Moyenne", "-Frais Administ.", "-Emb.Recycl.", "-Recherche et Développement",
+    "**Résultat Exploit.**", "**Res. Exploit.(KE)**",
+]
+EXPLOITATION_PRODUIT_ROWS = [
+    "Matières Premières", "Main Oeuvre Directe", "Autres Coûts Directs",
+    "Amortissement Matériel", "Maintenance", "**Coûts de Production**", "",
+    "Promotion", "Salaires Dpt Com.", "Autre Frais Comm.", "Publicité",
+    "**Coûts Commerciaux**", "",
+]
+EXPLOITATION_TOTAL_ROWS = [
+    "Salaires Administratifs", "Impots et Taxes", "Emballages Recyclés", "Coûts de stockage",
+    "Autres Frais Administratifs", "**Frais administratifs**", "",
+    "**Recherche et Développement**", "", "**Charges d'exploitation**",
+]
+STOCK_ROWS = [
+    "Stock Initial (U)", "(KE)", "Production (U)", "(KE)", "Qualité", "Achats Contrats (U)",
+    "(KE)", "Qualité", "Achats Spots (U)", "(KE)", "", "Ventes / Soldes (U)", "(KE)",
+    "Ventes/Contrats (U)", "(KE)", "Ventes/Marche (U)", "(KE)",
+    "**Stock Final (U)**", "**(KE)**", "",
+]
+
+# Two label/value pairs per row
+CHARGES_ROWS = [
+    ("**MATIERES PREMIERES CONSOMMEES**", "Créances irrecouvrables"),
+    ("Achats", "Autres ch./op.de gestion"),
+    ("-Variation Stock (SF-SI)", "Frais d'émission"),
+    ("**ACHATS EXTERNES DE PROD. FINIS**", "Cession Immobilisations"),
+    ("", ""),
+    ("**AUTRES CHARGES**", ""), ("Services ext. techniques", ""),
+    ("Services ext. administ.", ""), ("Transports et Déplacements", ""),
+    ("**FRAIS DE PERSONNEL**", ""), ("Salaires et Traitements", ""), ("Charges Sociales", ""),
+    ("Dotation Provision Congés", ""), ("Reprise /Provision Congés", ""),
+    ("**AMORTISSEMENTS**", ""), ("Amortissement Machines", ""),
+    ("Recherche et Développement", ""), ("Autres Amortissements", ""),
+]
+TRESORERIE_ROWS = [
+    ("Emprunts CT (T)+LT (T-1)", "Remboursement Découvert"),
+    ("C.A. net TTC période T-1", "Remboursement Emprunts"),
+    ("C.A. comptant TTC de T", "Achat Matières Prem. TTC"),
+    ("C.A./Contrats PF de T TTC", "Achats/Contrats PF T TTC"),
+    ("C.A./Contrats PF de T-1 TTC", "Achats/Contrats PF T-1 TTC"),
+    ("C.A. escompte TTC de T", "Personnel"),
+    ("C.A. solde TTC de T", "SEA+Ch.Exc./Oper.Gestion"),
+    ("Récupération TVA / Achats", "TVA sur C.A. T-1"),
+    ("Prod.Fin.+Div.+Droit Sous.", "Dividendes"),
+    ("Vente Machines", "Achats Machines"),
+    ("Remboursement Impôts", "Impôts"),
+    ("Remboursement Bons Caisse", "Frais financiers"),
+    ("Augmentation de Capital", "SET et Transports"),
+    ("", "Recherche et Développement"),
+    ("Revente Titres", "Prise Participations"),
+    ("Prod.Except./Opér.Gestion", "Opérations sur Capital"),
+    ("Remboursement de Prêts", "Prêts"),
+    ("**TOTAL Encaissements**", "**TOTAL Décaissements**"),
+    ("Découvert", "Achats bons de caisse"),
+    ("**Caisse Période T-1**", "**Caisse Période T**"),
+]
+COMPTE_RESULTAT_ROWS = [
+    ("Mat.Prem.Consommées", "Chiffre Affaires H.T."),
+    ("Achats Externes PF", "+Variation de Stock"),
+    ("Autres Charges", "Stock Final"),
+    ("Impots et Taxes", "-Stock Initial"),
+    ("Frais de Personnel", ""), ("Amortissement", ""), ("", ""),
+    ("Charges d'exploitation", "Produits d'exploitation"),
+    ("Charges Financières", "Produits Financiers"),
+    ("Charges Exceptionnelles", "Produits Exceptionnels"),
+    ("", "Remboursement impôts"), ("", ""),
+    ("Total Charges", "Total Produits"), ("", ""),
+    ("**Bénéfice Période**", "**Perte Période**"),
+]
+BILAN_ROWS = [
+    ("Immob.Corpor.nettes", "Capital et Réserves"),
+    ("Immob.Financières", "Résultat Période"),
+    ("Immob.Incorporelles", ""),
+    ("**Actif Immobilisé**", "**Capitaux Propres**"), ("", ""),
+    ("Stock Matières Prem.", "Emprunt Long Terme"),
+    ("Stock Produits Finis", "Emprunt Court Terme"), ("", ""),
+    ("Créances", "Dettes Fournisseurs Fiscales et Sociales"),
+    ("Disponibilités", "Découvert"), ("", ""),
+    ("**Actif Disp. et Réalisable**", "**Dettes**"), ("", ""),
+    ("**TOTAL ACTIF**", "**TOTAL PASSIF**"),
+]
+PRODUITS_ROWS = [
+    "**PRODUITS D EXPLOITATION**", "CHIFFRE AFFAIRES HT", "Ventes normales", "Ristournes",
+    "Ventes en Solde", "Ventes sous Contrats", "VARIATION de STOCK PF", "Stock initial PF",
+    "Stock final PF", "**PRODUITS FINANCIERS**", "Dividendes Percus", "Autres Prod. Financiers",
+    "**PRODUITS EXCEPTIONNELS**", "Sur opération de gestion", "Opérations Mobilières",
+    "Droits de Souscription", "Autres Opér. en Capital",
+]
+RSE_ROWS = [
+    "Impact écologique (machines)", "Gestion éthique des ressources humaines",
+    "Ethique financière", "Gestion des déchets et recyclage", "Aménagements et accessibilité",
+    "**Indicateur RSE**", "Indicateur R&D",
+]
+DETAIL_IMMOBILISATIONS_ROWS = [
+    "Terrain", "Constructions", "Installations,Matériel,Outilllage", "Autres Immobilisations",
+]
+DETAIL_BILAN_ROWS = [
+    ("**IMMOBILISATIONS FINANCIERES**", "**CAPITAUX ET RESERVES**"),
+    ("Titres de Participation", "Capital"), ("", "Prime d'émission"),
+    ("Prêts a Long Terme", "Réserves"), ("", ""),
+    ("**CREANCES**", "**DETTES**"),
+    ("Créances Clients", "Dettes Fournisseurs"), ("Créances sur contrats", "TVA"),
+    ("Débiteurs Divers (TVA)", "Provision / Congés"),
+]
+MESSAGES_PRETS_ROWS = [
+    "Possibilité emprunt CT en T+1 (KE)", "Possibilité emprunt LT en T+1 pour réception en T+2",
+    "Emprunt LT demande en T a recevoir T+1",
+]
+MESSAGES_RATIOS_ROWS = [
+    "Capitaux Propres / Total Passif", "Circulation Stocks de Produits Finis",
+    "Qualité Prévisions Encaissements", "Qualité Prévisions Decaissements",
+]
+ETUDES_ROWS = [
+    "Nb Vendeurs CT", "Nb Vendeurs GS", "Remuner. Vendeurs CT", "Remuner. Vendeurs GS",
+]
+
+
+def fmt_int(value: float) -> str:
+    """1234567 -> '1 234 567' (export thousands separator)."""
+    return f"{round(value):,}".replace(",", " ")
+
+
+def fmt_dec(value: float, decimals: int = 2) -> str:
+    """12.5 -> '12,50' (export decimal comma)."""
+    return f"{value:,.{decimals}f}".replace(",", " ").replace(".", ",")
+
+
+def _row(cells: List[str]) -> str:
+    return "|" + "|".join(cells) + "|"
+
+
+def _bold(label: str, value: str) -> str:
+    return f"**{value}**" if label.startswith("**") and value else value
+
+
+class ReportGenerator:
+    """
+    Builds French-layout reports with the sections and table shapes of
+    'Simulation - year 0.md' and random but plausible values.
+
+    `extra_rows` appends that many synthetic rows to every table, to test
+    parsers on tables of thousands of rows.
+    """
+
+    def __init__(self, seed: int = 0, extra_rows: int = 0):
+        self.rng = random.Random(seed)
+        self.extra_rows = extra_rows
+
+    # --- valeurs ------------------------------------------------------------
+
+    def _ke(self, low: float = 0, high: float = 12000) -> str:
+        return fmt_int(self.rng.uniform(low, high))
+
+    def _unit_cost(self) -> str:
+        return fmt_dec(self.rng.uniform(0, 25))
+
+    def _products(self, total: str, per_unit: bool = True) -> List[str]:
+        cells = [
+            (self._unit_cost() if per_unit else fmt_int(self.rng.uniform(0, 600_000)))
+            if self.rng.random() < 0.6 else ("0,00" if per_unit else "0")
+            for _ in PRODUCT_COLUMNS[:-1]
+        ]
+        return cells + [total]
+
+    def _extra(self, make) -> List[str]:
+        return [_row([f"Ligne synthétique {i + 1}"] + make()) for i in range(self.extra_rows)]
+
+    # --- sections -----------------------------------------------------------
+
+    def _product_table(self, title: str, labels: List[str], per_unit: bool = True) -> List[str]:
+        lines = [f"# {title}", "", _row([""] + [f"**{c}**" for c in PRODUCT_COLUMNS]),
+                 _row(["---"] * 8)]
+        for label in labels:
+            if not label:
+                lines.append(_row([""] * 8))
+                continue
+            cells = self._products(self._ke(-2000, 12000), per_unit)
+            lines.append(_row([label] + [_bold(label, c) for c in cells]))
+        lines += self._extra(lambda: self._products(self._ke(), per_unit))
+        return lines
+
+    def _pair_table(self, title: str, header: List[str], rows) -> List[str]:
+        lines = [f"# {title}", "", _row([f"**{h}**" if h else "" for h in header]),
+                 _row(["---"] * 4)]
+        for left, right in rows:
+            cells = []
+            for label in (left, right):
+                value = self._ke(-1500, 30000) if label else ""
+                cells += [label, _bold(label, value)]
+            lines.append(_row(cells))
+        lines += self._extra(lambda: [self._ke(), f"Ligne {self.rng.randint(1, 99)}",
+                                         self._ke()])
+        return lines
+
+    def _value_table(self, title: str, header: List[str], labels: List[str], value) -> List[str]:
+        lines = [f"# {title}", "", _row([f"**{h}**" for h in header]), _row(["---"] * 2)]
+        lines += [_row([label, _bold(label, value())]) for label in labels]
+        lines += self._extra(lambda: [value()])
+        return lines
+
+    def resultat_produit(self) -> List[str]:
+        return self._product_table("Résultat/produit", RESULTAT_PRODUIT_ROWS)
+
+    def infos_generales(self) -> List[str]:
+        rng = self.rng
+        m1 = rng.randint(10, 20)
+        m2 = rng.randint(0, 5)
+        lines = ["# Infos Générales", "",
+                 _row(["**Libellé**", "**Valeur**", "**Libellé**", "**Valeur**"]),
+                 _row(["---"] * 4)]
+        lines += [
+            _row(["Indice Général des prix fin période", fmt_dec(rng.uniform(100, 130)),
+                  "", ""]),
+            _row(["Indice Salarial de firme fin période", fmt_dec(rng.uniform(100, 130)), "", ""]),
+            _row([""] * 4),
+            _row(["Nombre ouvriers fin période", str(m1 * 20 + m2 * 20 + rng.randint(-40, 40)),
+                  "", ""]),
+            _row(["Cap.Theor.Max./M1 pour", str(m1 + 1), "Chaines (par période)",
+                  fmt_int(rng.uniform(3e5, 7e5))]),
+            _row(["Avec", str(m1), "Chaines en activité", fmt_int(rng.uniform(3e5, 7e5))]),
+            _row(["Cap.Theor.Max./M2 pour", str(m2), "Chaines (par période)",
+                  fmt_int(rng.uniform(0, 3e5))]),
+            _row(["Avec", str(m2), "Chaines en activité", fmt_int(rng.uniform(0, 3e5))]),
+            _row([""] * 4),
+            _row(["Taux d heures supplémentaires", fmt_dec(rng.uniform(0, 10), 1),
+                  "Possib.Emprunt CT (T+1) (KE)", self._ke()]),
+            _row(["Taux de grève", fmt_dec(rng.uniform(0, 5), 1),
+                  "Possib.Emprunt LT (T+2) (KE)", self._ke()]),
+            _row(["Taux de présence (hors greve)", fmt_dec(rng.uniform(85, 99), 1),
+                  "Cours de l'action (E)", fmt_dec(rng.uniform(10, 40))]),
+        ]
+        lines += self._extra(lambda: [self._ke(), "Ligne", self._ke()])
+        return lines
+
+    def charges(self) -> List[str]:
+        return self._pair_table(
+            "Charges",
+            ["CHARGES D'EXPLOITATION", self._ke(), "CHARGES EXCEPTIONNELLES", self._ke(0, 500)],
+            CHARGES_ROWS,
+        )
+
+    def stocks(self) -> List[str]:
+        lines = self._product_table("Stocks", STOCK_ROWS, per_unit=False)
+        lines.append(_row(["Qualité stock (%)"] + [self.rng.choice(["100", "50", "0"])
+                                                   for _ in range(6)] + [""]))
+        lines.append(_row(["Emballages Recyclés"] + [self.rng.choice(["-N-", "-O-"])
+                                                     for _ in range(6)] + [""]))
+        return lines
+
+    def tresorerie(self) -> List[str]:
+        return self._pair_table(
+            "Trésorerie", ["ENCAISSEMENTS", "", "DECAISSEMENTS", ""], TRESORERIE_ROWS
+        )
+
+    def exploitation_produit(self) -> List[str]:
+        lines = self._product_table("Exploitation/produit", EXPLOITATION_PRODUIT_ROWS)
+        for label in EXPLOITATION_TOTAL_ROWS:
+            value = _bold(label, self._ke()) if label else ""
+            lines.append(_row([label] + [""] * 6 + [value]))
+        return lines
+
+    def compte_resultat(self) -> List[str]:
+        return self._pair_table(
+            "Compte de Résultat", ["CHARGES", "", "PRODUITS", ""], COMPTE_RESULTAT_ROWS
+        )
+
+    def bilan(self) -> List[str]:
+        return self._pair_table("Bilan", ["ACTIF", "", "PASSIF", ""], BILAN_ROWS)
+
+    def detail_bilan(self) -> List[str]:
+        lines = ["# Détail Bilan", "",
+                 _row(["**IMMOBILISATIONS CORPORELLES**", "**Brut**",
+                       "**Amortissements Cumulés**", "**Net**"]),
+                 _row(["---"] * 4)]
+        for label in DETAIL_IMMOBILISATIONS_ROWS:
+            brut = self.rng.uniform(0, 10000)
+            amort = self.rng.uniform(0, brut)
+            lines.append(_row([label, fmt_int(brut), fmt_int(amort), fmt_int(brut - amort)]))
+        lines.append(_row([""] * 4))
+        for left, right in DETAIL_BILAN_ROWS:
+            cells = []
+            for label in (left, right):
+                plain = label and not label.startswith("**")
+                cells += [label, self._ke(0, 15000) if plain else ""]
+            lines.append(_row(cells))
+        return lines
+
+    def messages(self) -> List[str]:
+        lines = self._value_table(
+            "Messages", ["Prêts et Emprunts", "Valeur"], MESSAGES_PRETS_ROWS, self._ke
+        )
+        lines += ["", _row(["**RATIOS de QUALITE DE GESTION (en pourcentages)**", "**Valeur**"]),
+                  _row(["---"] * 2)]
+        lines += [_row([label, fmt_dec(self.rng.uniform(50, 110)) + " %"])
+                  for label in MESSAGES_RATIOS_ROWS]
+        lines.append(_row(["Coefficient Bonus Malus sur tauxprochains emprunts",
+                           fmt_dec(self.rng.uniform(0.9, 1.1))]))
+        return lines
+
+    def produits(self) -> List[str]:
+        return self._value_table("Produits", ["Libellé", "Valeur"], PRODUITS_ROWS, self._ke)
+
+    def rse(self) -> List[str]:
+        lines = self._value_table(
+            "RSE", ["Indicateur", "Valeur"], RSE_ROWS,
+            lambda: fmt_dec(self.rng.uniform(0, 100)),
+        )
+        lines.append(_row(["Autorisé à produire C à la prochaine période (O/N) :",
+                           self.rng.choice(["-N-", "-O-"])]))
+        lines.append(_row(["Label Mir'EcoCert (impact à P+1) (O/N) :",
+                           self.rng.choice(["-N-", "-O-"])]))
+        return lines
+
+    def bourse(self) -> List[str]:
+        rng = self.rng
+        lines = ["# Bourse", "",
+                 _row(["**Entreprise**", "**Cours T-1**", "**Cours T**", "**Indice Perf.**",
+                       "**Dividende Distribué**", "**Capital Social**", "**Nb Act. Propos.**",
+                       "**Prix Emis.**"]),
+                 _row(["---"] * 8)]
+        for firm in FIRMS:
+            lines.append(_row([f"F{firm}", fmt_dec(rng.uniform(15, 40)),
+                               fmt_dec(rng.uniform(15, 40)), fmt_dec(rng.uniform(-5, 5)),
+                               fmt_dec(rng.uniform(0, 1)), "15 000", "0", "0,00"]))
+        return lines
+
+    def etudes(self) -> List[str]:
+        rng = self.rng
+        lines = ["# Etudes + ABC", "",
+                 _row(["**Firmes :**"] + [f"**{f}**" for f in FIRMS]), _row(["---"] * 7),
+                 _row(["Nombre Ouvriers"] + [str(rng.randint(400, 700)) for _ in FIRMS])]
+        for label in ETUDES_ROWS:
+            lines.append(_row([label] + [fmt_int(rng.uniform(0, 3000)) for _ in FIRMS]))
+        for product in PRODUCT_COLUMNS[:-1]:
+            lines.append(_row([f"Qualite/Emb.Recycl. {product}"]
+                              + [f"{rng.choice([0, 50, 100])} {rng.choice(['-N-', '-O-'])}"
+                                 for _ in FIRMS]))
+        lines += self._extra(lambda: [fmt_int(rng.uniform(0, 3000)) for _ in FIRMS])
+        return lines
+
+    def concurrence(self) -> List[str]:
+        rng = self.rng
+        lines = ["# Concurrence", "",
+                 _row(["**Firmes :**"] + [f"**{f}**" for f in FIRMS] + ["**IMPOR**"]),
+                 _row(["---"] * 8)]
+        for product in "ABC":
+            lines.append(_row([f"**Produit {product}**"] + [""] * 7))
+            for label, make in (
+                (f"{product} : Prix CT", lambda: fmt_dec(rng.uniform(15, 60))),
+                ("Promotion CT", lambda: fmt_dec(rng.uniform(0, 1))),
+                ("Ventes CT", lambda: fmt_int(rng.uniform(0, 600_000))),
+                ("Prix Net GS", lambda: fmt_dec(rng.uniform(15, 60))),
+                ("Promotion GS", lambda: fmt_dec(rng.uniform(0, 1))),
+                ("Ventes GS", lambda: fmt_int(rng.uniform(0, 200_000))),
+            ):
+                lines.append(_row([label] + [make() for _ in range(7)]))
+        return lines
+
+    def matieres_premieres(self) -> List[str]:
+        lines = ["# Mat. Premières", "",
+                 _row(["**MATIERES PREMIERES**", "**N (UNITES)**", "**S (UNITES)**",
+                       "**N (VALEUR)**", "**S (VALEUR)**"]),
+                 _row(["---"] * 5)]
+        for label in ("Stock Initial", "Achats", "Consommation", "Stock Final"):
+            lines.append(_row([label, fmt_int(self.rng.uniform(0, 5e6)),
+                               fmt_int(self.rng.uniform(0, 5e6)), self._ke(0, 4000),
+                               self._ke(0, 4000)]))
+        lines += self._extra(lambda: [self._ke() for _ in range(4)])
+        return lines
+
+    def report(self) -> str:
+        """One complete report."""
+        sections = [
+            self.resultat_produit(), self.infos_generales(), self.charges(), self.stocks(),
+            self.tresorerie(), self.exploitation_produit(), self.compte_resultat(),
+            self.bilan(), self.detail_bilan(), self.produits(), self.rse(), self.messages(),
+            self.bourse(), self.etudes(),
+            self.concurrence(), self.matieres_premieres(),
+        ]
+        out = ["", "", "---", ""]
+        for lines in sections:
+            out += lines + ["", "---", ""]
+        return "\n".join(out)
+
+
+def generate_report(seed: int = 0, extra_rows: int = 0) -> str:
+    """A single synthetic report; the same seed always gives the same text."""
+    return ReportGenerator(seed, extra_rows).report()
+
+
+def iter_bundle(count: int, seed: int = 0, extra_rows: int = 0) -> Iterator[str]:
+    """Yield `count` reports, each preceded by its '<!-- mirage-report: id -->' marker."""
+    generator = ReportGenerator(seed, extra_rows)
+    for i in range(count):
+        yield f"<!-- mirage-report: synthetic-{seed}-{i + 1} -->\n" + generator.report() + "\n"
+
+
+def write_bundle(
+    out: TextIO, count: int, seed: int = 0, extra_rows: int = 0
+) -> None:
+    """Write a bundle report by report (never holds more than one in memory)."""
+    for chunk in iter_bundle(count, seed, extra_rows):
+        out.write(chunk)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Génère des rapports Mirage synthétiques.")
+    parser.add_argument("-n", "--count", type=int, default=1, help="Nombre de rapports")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--extra-rows", type=int, default=0,
+                        help="Lignes synthétiques ajoutées à chaque tableau")
+    parser.add_argument("-o", "--output", help="Fichier de sortie (stdout par défaut)")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            write_bundle(f, args.count, args.seed, args.extra_rows)
+    else:
+        write_bundle(sys.stdout, args.count, args.seed, args.extra_rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
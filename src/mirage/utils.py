@@ -1,19 +1,28 @@
 import json
 import dataclasses
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
 from .models import PeriodState
 
-def serialize_simulation_state(session_state_dict: Dict[str, Any]) -> str:
+def serialize_simulation_state(
+    session_state_dict: Dict[str, Any], keys: Optional[Iterable[str]] = None
+) -> str:
     """
     Serializes relevant parts of the session state to a JSON string.
     Specifically handles the PeriodState object and primitive types.
+    If `keys` is given (e.g. mirage.binding.SESSION_KEYS), only those keys are
+    looked at instead of the whole session.
     """
     export_data = {}
     
     # Keys to definitely exclude from export (buttons, session triggers)
     EXCLUDED_KEYS = {"reset_btn", "auto_app_n", "auto_app_s", "FormSubmitter"}
 
-    for key, value in session_state_dict.items():
+    if keys is None:
+        items = session_state_dict.items()
+    else:
+        items = [(key, session_state_dict[key]) for key in keys if key in session_state_dict]
+
+    for key, value in items:
         if key in EXCLUDED_KEYS:
             continue
             
@@ -0,0 +1,367 @@
+"""SQLite warehouse of parsed reports, period states, decisions and results."""
+
+import dataclasses
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from .cache import content_hash
+from .ingest import period_from_name, report_records
+from .models import AllDecisions, CalculatedResults, PeriodState
+from .report import Report
+
+DEFAULT_WAREHOUSE_PATH = Path(__file__).resolve().parents[2] / "data" / "warehouse.sqlite"
+
+# Numeric columns of the wide state/result tables, derived from the dataclasses
+STATE_FIELDS = [f.name for f in dataclasses.fields(PeriodState)]
+RESULT_FIELDS = [f.name for f in dataclasses.fields(CalculatedResults) if f.name != "warnings"]
+
+# Report-level keys shared by every table: one row per (firm, period, scenario)
+_KEY_COLUMNS = "firm TEXT NOT NULL, period INTEGER NOT NULL, scenario TEXT NOT NULL"
+
+
+def _schema() -> str:
+    state_cols = ", ".join(f"{name} REAL" for name in STATE_FIELDS if name != "period_num")
+    result_cols = ", ".join(f"{name} REAL" for name in RESULT_FIELDS)
+    return f"""
+    CREATE TABLE IF NOT EXISTS reports (
+        id INTEGER PRIMARY KEY,
+        hash TEXT NOT NULL,
+        source TEXT,
+        ingested_at REAL,
+        {_KEY_COLUMNS},
+        UNIQUE (firm, period, scenario)
+    );
+    CREATE INDEX IF NOT EXISTS reports_hash ON reports (hash);
+
+    CREATE TABLE IF NOT EXISTS facts (
+        report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+        section TEXT NOT NULL,
+        row_label TEXT NOT NULL,
+        col TEXT NOT NULL,
+        value REAL
+    );
+    CREATE INDEX IF NOT EXISTS facts_lookup ON facts (section, row_label, col);
+    CREATE INDEX IF NOT EXISTS facts_report ON facts (report_id);
+
+    CREATE TABLE IF NOT EXISTS competition (
+        report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+        product TEXT NOT NULL,
+        competitor TEXT NOT NULL,
+        prix REAL,
+        promotion REAL,
+        ventes REAL
+    );
+    CREATE INDEX IF NOT EXISTS competition_lookup ON competition (product, competitor);
+
+    CREATE TABLE IF NOT EXISTS states (
+        {_KEY_COLUMNS},
+        period_num INTEGER,
+        {state_cols},
+        PRIMARY KEY (firm, period, scenario)
+    );
+
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        created_at REAL,
+        {_KEY_COLUMNS},
+        decisions TEXT,
+        warnings TEXT,
+        {result_cols}
+    );
+    CREATE INDEX IF NOT EXISTS runs_key ON runs (firm, period, scenario);
+    """
+
+
+def _where(**filters: Any) -> tuple:
+    """Build a WHERE clause from the non-None filters (lists become IN)."""
+    clauses, params = [], []
+    for column, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _check_fields(fields: Iterable[str], allowed: List[str]) -> List[str]:
+    fields = list(fields)
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValueError(f"Champs inconnus: {', '.join(unknown)}")
+    return fields
+
+
+class Warehouse:
+    """
+    Historical store indexed by firm, period and scenario.
+
+    Reports are stored once per (firm, period, scenario). Re-adding the same
+    report under its key is a no-op; storing a different report under an
+    occupied key needs replace=True. Query methods return DataFrames so
+    multi-period analyses read indexed rows instead of reparsing markdown.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_WAREHOUSE_PATH):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_schema())
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "Warehouse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Écriture
+    # -------------------------------------------------------------------------
+
+    def add_report(
+        self,
+        report: Union[Report, str],
+        firm: str = "",
+        period: Optional[int] = None,
+        scenario: str = "reel",
+        source: Optional[str] = None,
+        replace: bool = False,
+    ) -> int:
+        """
+        Store a report's tidy facts, competition table and PeriodState. Returns its id.
+
+        Reports do not state their period: pass `period`, or a `source` file
+        name it can be read from ('... year -2.md'). A different report
+        already stored under (firm, period, scenario) is only overwritten with
+        replace=True.
+        """
+        if period is None and source:
+            period = period_from_name(source)
+        if period is None:
+            raise ValueError(
+                "Période inconnue : passer period= (le rapport ne l'indique pas)"
+            )
+        if isinstance(report, str):
+            digest = content_hash(report)
+            report = Report(report)
+        else:
+            digest = content_hash("\n".join(report.index.lines))
+        state = report.period_state
+
+        existing = self.conn.execute(
+            "SELECT id, hash FROM reports WHERE firm = ? AND period = ? AND scenario = ?",
+            (firm, period, scenario),
+        ).fetchone()
+        if existing is not None:
+            if existing[1] == digest:
+                return existing[0]
+            if not replace:
+                raise ValueError(
+                    f"Un autre rapport est déjà enregistré pour ({firm!r}, période {period},"
+                    f" {scenario!r}) : passer replace=True pour le remplacer"
+                )
+
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM reports WHERE firm = ? AND period = ? AND scenario = ?",
+                (firm, period, scenario),
+            )
+            cur = self.conn.execute(
+                "INSERT INTO reports (hash, source, ingested_at, firm, period, scenario)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, source, time.time(), firm, period, scenario),
+            )
+            report_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO facts (report_id, section, row_label, col, value)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    (report_id, section, label, column, value)
+                    for _, _, _, section, label, column, value in report_records(
+                        report, source or "", digest, period
+                    )
+                ),
+            )
+            concurrence = report.concurrence
+            rows = []
+            for product, offre in concurrence.offres.items():
+                for i, competitor in enumerate(concurrence.firmes):
+                    rows.append((
+                        report_id,
+                        product,
+                        competitor,
+                        offre.prix[i] if i < len(offre.prix) else None,
+                        offre.promotion[i] if i < len(offre.promotion) else None,
+                        offre.ventes[i] if i < len(offre.ventes) else None,
+                    ))
+            self.conn.executemany(
+                "INSERT INTO competition (report_id, product, competitor, prix, promotion, ventes)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._put_state(state, firm, period, scenario)
+        return report_id
+
+    def add_state(
+        self, state: PeriodState, firm: str = "", period: Optional[int] = None,
+        scenario: str = "reel",
+    ) -> None:
+        # period_num is 1 unless set by hand: it cannot tell stored periods apart
+        if period is None:
+            raise ValueError("Période inconnue : passer period=")
+        with self.conn:
+            self._put_state(state, firm, period, scenario)
+
+    def _put_state(self, state: PeriodState, firm: str, period: int, scenario: str) -> None:
+        columns = ["firm", "period", "scenario"] + STATE_FIELDS
+        values = [firm, period, scenario] + [getattr(state, name) for name in STATE_FIELDS]
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO states ({', '.join(columns)})"
+            f" VALUES ({', '.join('?' * len(columns))})",
+            values,
+        )
+
+    def add_run(
+        self,
+        decisions: AllDecisions,
+        results: CalculatedResults,
+        firm: str = "",
+        period: int = 1,
+        scenario: str = "reel",
+    ) -> int:
+        """Store one evaluated set of decisions with its results. Returns the run id."""
+        columns = ["created_at", "firm", "period", "scenario", "decisions", "warnings"]
+        columns += RESULT_FIELDS
+        values = [
+            time.time(),
+            firm,
+            period,
+            scenario,
+            json.dumps(dataclasses.asdict(decisions)),
+            json.dumps(list(results.warnings)),
+        ] + [getattr(results, name) for name in RESULT_FIELDS]
+        with self.conn:
+            cur = self.conn.execute(
+                f"INSERT INTO runs ({', '.join(columns)})"
+                f" VALUES ({', '.join('?' * len(columns))})",
+                values,
+            )
+        return cur.lastrowid
+
+    # -------------------------------------------------------------------------
+    # Lecture
+    # -------------------------------------------------------------------------
+
+    def has_hash(self, digest: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM reports WHERE hash = ? LIMIT 1", (digest,))
+        return row.fetchone() is not None
+
+    def known_hashes(self) -> set:
+        return {h for (h,) in self.conn.execute("SELECT DISTINCT hash FROM reports")}
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self.conn, params=list(params))
+
+    def reports(self, firm=None, period=None, scenario=None) -> pd.DataFrame:
+        where, params = _where(firm=firm, period=period, scenario=scenario)
+        return self.query(f"SELECT * FROM reports{where} ORDER BY firm, scenario, period", params)
+
+    def facts(
+        self, section=None, row_label=None, column=None, firm=None, period=None, scenario=None
+    ) -> pd.DataFrame:
+        """Long-format facts joined with their report keys."""
+        where, params = _where(
+            **{
+                "f.section": section,
+                "f.row_label": row_label,
+                "f.col": column,
+                "r.firm": firm,
+                "r.period": period,
+                "r.scenario": scenario,
+            }
+        )
+        return self.query(
+            "SELECT r.firm, r.period, r.scenario, f.section, f.row_label, f.col AS column,"
+            " f.value FROM facts f JOIN reports r ON r.id = f.report_id"
+            f"{where} ORDER BY r.firm, r.scenario, r.period",
+            params,
+        )
+
+    def competitor_prices(
+        self, product: str, firm=None, scenario=None, competitor=None
+    ) -> pd.DataFrame:
+        """
+        Prices, promotions and sales of every competitor for a product-market
+        ('A-CT'...) across periods, e.g. competitor_prices("A-CT").
+        """
+        where, params = _where(
+            **{"c.product": product, "c.competitor": competitor, "r.firm": firm,
+               "r.scenario": scenario}
+        )
+        return self.query(
+            "SELECT r.firm, r.period, r.scenario, c.competitor, c.prix, c.promotion, c.ventes"
+            " FROM competition c JOIN reports r ON r.id = c.report_id"
+            f"{where} ORDER BY r.firm, r.scenario, r.period, c.competitor",
+            params,
+        )
+
+    def states(self, firm=None, period=None, scenario=None, fields=None) -> pd.DataFrame:
+        """PeriodStates as rows, e.g. states(fields=["cash"]) for our cash by quarter."""
+        columns = "*" if not fields else ", ".join(
+            ["firm", "period", "scenario", *_check_fields(fields, STATE_FIELDS)]
+        )
+        where, params = _where(firm=firm, period=period, scenario=scenario)
+        return self.query(
+            f"SELECT {columns} FROM states{where} ORDER BY firm, scenario, period", params
+        )
+
+    def period_state(self, firm: str = "", period: int = 1, scenario: str = "reel"):
+        """Rebuild a stored PeriodState, or None."""
+        cur = self.conn.execute(
+            f"SELECT {', '.join(STATE_FIELDS)} FROM states"
+            " WHERE firm = ? AND period = ? AND scenario = ?",
+            (firm, period, scenario),
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        types = {f.name: f.type for f in dataclasses.fields(PeriodState)}
+        return PeriodState(**{
+            name: int(value) if types[name] in (int, "int") else value
+            for name, value in zip(STATE_FIELDS, row)
+        })
+
+    def runs(self, firm=None, period=None, scenario=None, fields=None) -> pd.DataFrame:
+        columns = "*" if not fields else ", ".join(
+            ["id", "firm", "period", "scenario", *_check_fields(fields, RESULT_FIELDS)]
+        )
+        where, params = _where(firm=firm, period=period, scenario=scenario)
+        return self.query(
+            f"SELECT {columns} FROM runs{where} ORDER BY firm, scenario, period, id", params
+        )
+
+    def scenarios(self) -> List[str]:
+        cur = self.conn.execute(
+            "SELECT scenario FROM reports UNION SELECT scenario FROM runs ORDER BY 1"
+        )
+        return [s for (s,) in cur]
+
+    def run_decisions(self, run_id: int) -> Dict[str, Any]:
+        row = self.conn.execute("SELECT decisions FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
@@ -0,0 +1,155 @@
+"""Background watcher that keeps the workspace reports parsed and ready."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .cache import ParseCache, content_hash, get_default_cache, parse_report_cached
+from .models import PeriodState
+
+
+@dataclass
+class WatchedReport:
+    """Last known version of a workspace file and, once parsed, its content."""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    digest: str = ""
+    parsed: Optional[dict] = None
+    state: Optional[PeriodState] = None
+    error: str = ""
+
+    @property
+    def ready(self) -> bool:
+        return self.state is not None
+
+
+class WorkspaceWatcher:
+    """
+    Tracks `pattern` files in a directory and parses new or modified ones off the UI thread.
+
+    `scan()` compares mtime/size with the last pass, so unchanged files cost one
+    stat; a changed file is hashed and only reparsed if its content changed.
+    Parsing goes through the on-disk ParseCache. `start()` polls in a daemon
+    thread; readers only ever see fully parsed entries (`get`, `names`).
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        pattern: str = "Simulation*.md",
+        interval: float = 5.0,
+        cache: Optional[ParseCache] = None,
+    ):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.interval = interval
+        self.cache = cache or get_default_cache()
+        self._reports: Dict[str, WatchedReport] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mirage-parse")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------------------------------------------------------
+    # Lecture (thread UI)
+    # -------------------------------------------------------------------------
+
+    def names(self) -> List[str]:
+        """Every tracked file name, parsed or not, sorted."""
+        with self._lock:
+            return sorted(self._reports)
+
+    def get(self, name: str) -> Optional[WatchedReport]:
+        with self._lock:
+            return self._reports.get(name)
+
+    def status(self, name: str) -> str:
+        entry = self.get(name)
+        if entry is None:
+            return "absent"
+        if entry.error:
+            return "erreur"
+        return "prêt" if entry.ready else "en cours"
+
+    # -------------------------------------------------------------------------
+    # Surveillance
+    # -------------------------------------------------------------------------
+
+    def scan(self) -> List[str]:
+        """Detect new, modified and removed files; queue parses. Returns the queued names."""
+        found: Dict[str, Tuple[Path, int, int]] = {}
+        for path in self.directory.glob(self.pattern):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found[path.name] = (path, st.st_mtime_ns, st.st_size)
+
+        queued = []
+        with self._lock:
+            for name in set(self._reports) - set(found):
+                del self._reports[name]
+            for name, (path, mtime_ns, size) in found.items():
+                entry = self._reports.get(name)
+                if entry is not None and (entry.mtime_ns, entry.size) == (mtime_ns, size):
+                    continue
+                if entry is None:
+                    entry = WatchedReport(path, mtime_ns, size)
+                    self._reports[name] = entry
+                else:
+                    # Keep serving the previous parse until the new one is ready
+                    entry.mtime_ns, entry.size = mtime_ns, size
+                queued.append(name)
+
+        for name in queued:
+            self._pool.submit(self._parse, name)
+        return queued
+
+    def _parse(self, name: str) -> None:
+        with self._lock:
+            entry = self._reports.get(name)
+            if entry is None:
+                return
+            path = entry.path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            digest = content_hash(content)
+            if digest == entry.digest and entry.ready:
+                return
+            parsed, state = parse_report_cached(content, self.cache)
+            error = ""
+        except Exception as e:
+            digest, parsed, state, error = "", None, None, str(e)
+
+        with self._lock:
+            # The entry may have been removed or replaced meanwhile
+            if self._reports.get(name) is entry:
+                entry.digest, entry.error = digest, error
+                if parsed is not None:
+                    entry.parsed, entry.state = parsed, state
+
+    def start(self) -> "WorkspaceWatcher":
+        if self._thread is None:
+            self.scan()
+            self._thread = threading.Thread(
+                target=self._run, name="mirage-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._pool.shutdown(wait=False)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.scan()
+            except Exception:
+                # A transient filesystem error must not kill the watcher
+                pass
@@ -0,0 +1,74 @@
+"""Columnar decision and result batches."""
+
+import numpy as np
+import pytest
+
+from mirage.batch import DecisionBatch, ResultBatch
+from mirage.calculator import calculate_all
+from mirage.models import AllDecisions, PeriodState
+
+
+def _decisions(n):
+    items = []
+    for i in range(n):
+        d = AllDecisions()
+        d.produit_a_ct.prix_tarif = 18.0 + i
+        d.produit_b_gs.ristourne = float(i)
+        d.marketing.etudes_abcd = "ABCD"[: i % 4 + 1]
+        items.append(d)
+    return items
+
+
+def test_dataclass_round_trip():
+    items = _decisions(5)
+    batch = DecisionBatch.from_dataclasses(items)
+    assert len(batch) == 5
+    assert batch["produit_a_ct.prix_tarif"].dtype == np.float64
+    np.testing.assert_array_equal(batch["produit_b_gs.ristourne"], [0, 1, 2, 3, 4])
+    assert batch.to_dataclasses() == items
+
+
+def test_row_and_negative_index():
+    items = _decisions(3)
+    batch = DecisionBatch.from_dataclasses(items)
+    assert batch.row(1) == items[1]
+    assert batch[-1] == items[-1]
+    with pytest.raises(IndexError):
+        batch.row(3)
+    with pytest.raises(IndexError):
+        batch.row(-4)
+
+
+def test_slices_are_views_and_masks_copies():
+    batch = DecisionBatch.repeat(n=4)
+    view = batch[1:3]
+    view["produit_a_ct.prix_tarif"] = 99.0
+    assert batch["produit_a_ct.prix_tarif"].tolist()[1:3] == [99.0, 99.0]
+    picked = batch[np.array([True, False, False, False])]
+    picked["produit_a_ct.prix_tarif"] = 1.0
+    assert batch["produit_a_ct.prix_tarif"][0] == AllDecisions().produit_a_ct.prix_tarif
+
+
+def test_frame_round_trip_and_missing_columns():
+    batch = DecisionBatch.from_dataclasses(_decisions(3))
+    frame = batch.to_frame()
+    assert DecisionBatch.from_frame(frame).to_dataclasses() == batch.to_dataclasses()
+    partial = DecisionBatch.from_frame(frame[["produit_a_ct.prix_tarif"]])
+    assert partial.row(2).produit_a_ct.prix_tarif == 20.0
+    assert partial.row(2).produit_b_gs.ristourne == AllDecisions().produit_b_gs.ristourne
+
+
+def test_concat_and_validation():
+    a, b = DecisionBatch.repeat(n=2), DecisionBatch.from_dataclasses(_decisions(3))
+    both = DecisionBatch.concat([a, b])
+    assert len(both) == 5 and both.row(4) == b.row(2)
+    with pytest.raises(ValueError):
+        DecisionBatch({"produit_a_ct.prix_tarif": np.zeros(2)})
+
+
+def test_result_batch_keeps_warnings():
+    state = PeriodState()
+    results = [calculate_all(d, state) for d in _decisions(2)]
+    batch = ResultBatch.from_dataclasses(results)
+    assert batch["warnings"].dtype == object
+    assert batch.to_dataclasses() == results
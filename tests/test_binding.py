@@ -0,0 +1,60 @@
+"""Widget-key bindings: building models from session values and back."""
+
+import pytest
+
+from mirage.binding import DECISION_BINDINGS, SESSION_KEYS, STATE_BINDINGS, BindingSet
+from mirage.models import AllDecisions, PeriodState
+from mirage.schema import DECISIONS_SCHEMA
+from mirage.utils import deserialize_simulation_state, serialize_simulation_state
+
+
+def _decisions() -> AllDecisions:
+    decisions = AllDecisions()
+    decisions.produit_b_gs.ristourne = 4.0
+    decisions.marketing.etudes_abcd = "AC"
+    decisions.finance.emprunt_lt = 1_500.0
+    decisions.titres.actions_f3 = 120
+    return decisions
+
+
+def test_decisions_survive_widget_values_and_build():
+    decisions = _decisions()
+    session = {}
+    DECISION_BINDINGS.push(decisions, session)
+    assert session["b_gs_rist"] == 4.0 and session["mkt_etu_ad"] == "AC"
+    assert DECISION_BINDINGS.build(session) == decisions
+
+
+def test_bindings_target_known_fields_once():
+    paths = [DECISION_BINDINGS.path(key) for key in DECISION_BINDINGS.keys]
+    assert len(set(paths)) == len(paths)
+    assert set(paths) <= set(DECISIONS_SCHEMA.paths())
+
+
+def test_build_keeps_unbound_fields_of_the_base():
+    base = PeriodState(period_num=3, reserves=9_000.0)
+    state = STATE_BINDINGS.build({"s_cash": 250.0, "autre": 1}, base=base)
+    assert state.cash == 250.0
+    assert (state.period_num, state.reserves) == (3, 9_000.0)
+    assert base.cash == PeriodState().cash
+
+
+def test_state_widgets_get_their_cast():
+    values = STATE_BINDINGS.widget_values(PeriodState(stock_a_ct=1_000, cash=12.5))
+    assert values["s_a_ct"] == 1000.0 and isinstance(values["s_a_ct"], float)
+    assert isinstance(values["s_ouvriers"], int)
+
+
+def test_session_download_only_keeps_bound_keys():
+    session = {"a_ct_prix": 21.0, "s_cash": 50.0, "FormSubmitter:x": True, "widget_libre": 1}
+    data = deserialize_simulation_state(serialize_simulation_state(session, SESSION_KEYS))
+    assert data == {"a_ct_prix": 21.0, "s_cash": 50.0}
+
+
+def test_invalid_bindings_are_refused():
+    with pytest.raises(ValueError):
+        BindingSet(AllDecisions, [("k", "produit_a_ct.inconnu")])
+    with pytest.raises(ValueError):
+        BindingSet(
+            AllDecisions, [("k", "produit_a_ct.prix_tarif"), ("k", "produit_b_ct.prix_tarif")]
+        )
@@ -0,0 +1,55 @@
+"""Parsed-report cache: hits, misses and entries that cannot be stored."""
+
+from pathlib import Path
+
+import pytest
+
+from mirage import models
+from mirage.cache import ParseCache, content_hash, parse_report_cached
+from mirage.parser import extract_period_state, parse_mirage_markdown
+
+ROOT = Path(__file__).resolve().parents[1]
+REPORT = ROOT / "Simulation Md des données year -2.md"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "cache")
+
+
+def test_put_then_get_a_parsed_report(cache):
+    content = REPORT.read_text(encoding="utf-8")
+    parsed = parse_mirage_markdown(content)
+    state = extract_period_state(parsed)
+    digest = content_hash(content)
+
+    assert cache.get(digest) is None
+    cache.put(digest, parsed, state)
+    hit = cache.get(digest)
+    assert hit is not None
+    assert hit[1] == state
+    assert extract_period_state(hit[0]) == state
+
+
+def test_parse_report_cached_serves_the_second_call_from_disk(cache):
+    content = REPORT.read_text(encoding="utf-8")
+    first = parse_report_cached(content, cache)
+    assert list(cache.directory.glob("*.bin"))
+    assert parse_report_cached(content, cache)[1] == first[1]
+
+
+def test_unpicklable_entry_is_a_miss(cache):
+    # What a reloaded models module leaves behind: objects of a class that no
+    # longer matches the one importable under its name
+    class PeriodState(models.PeriodState):
+        pass
+
+    cache.put("0" * 64, {}, PeriodState())
+    assert cache.get("0" * 64) is None
+    assert not list(cache.directory.glob("*"))
+
+
+def test_corrupt_entry_is_a_miss(cache):
+    cache.put("1" * 64, {}, models.PeriodState())
+    cache.path_for("1" * 64).write_bytes(b"MRPC1 not zlib")
+    assert cache.get("1" * 64) is None
@@ -0,0 +1,64 @@
+"""mirage-sim: decision files in, one result row per scenario out."""
+
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from mirage.calculator import calculate_all
+from mirage.cli import decisions_from_dict, main
+from mirage.models import AllDecisions, PeriodState
+
+ROOT = Path(__file__).resolve().parents[1]
+FIELDS = "resultat_net,tresorerie_estimee"
+
+
+def _write(path: Path, data) -> str:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_json_list_gives_one_row_per_item(tmp_path, capsys):
+    items = [{"produit_a_ct": {"prix_tarif": 21.0}}, {"a_ct_prix": 23.0}]
+    assert main([_write(tmp_path / "d.json", items), "--fields", FIELDS]) == 0
+
+    rows = json.loads(capsys.readouterr().out)
+    assert [row["source"] for row in rows] == ["d.json#0", "d.json#1"]
+    for row, price in zip(rows, (21.0, 23.0)):
+        decisions = AllDecisions()
+        decisions.produit_a_ct.prix_tarif = price
+        expected = calculate_all(decisions, PeriodState())
+        assert row["resultat_net"] == pytest.approx(expected.resultat_net)
+        assert row["tresorerie_estimee"] == pytest.approx(expected.tresorerie_estimee)
+
+
+def test_csv_output_with_report_state(tmp_path, capsys):
+    report = next(ROOT.glob("Simulation*.md"))
+    path = _write(tmp_path / "d.json", {"produit_a_ct.prix_tarif": 22.0})
+    assert main(["--report", str(report), path, "--format", "csv", "--fields", FIELDS]) == 0
+
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert len(rows) == 1 and list(rows[0]) == ["source", "resultat_net", "tresorerie_estimee"]
+    assert rows[0]["source"] == "d.json"
+
+
+def test_invalid_inputs_are_reported(tmp_path, capsys):
+    assert main([_write(tmp_path / "list.json", [{"a_ct_prix": 21.0}, 3])]) == 1
+    assert "list.json#1: objet JSON attendu, int trouvé" in capsys.readouterr().err
+
+    assert main([_write(tmp_path / "bad.json", {"produit_a_ct": {"inconnu": 1}})]) == 1
+    assert "Champs inconnus pour AllDecisions: produit_a_ct.inconnu" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(["--fields", "pas_un_resultat"])
+
+
+def test_partial_decisions_keep_the_base():
+    base = AllDecisions()
+    base.produit_b_ct.prix_tarif = 30.0
+    decisions = decisions_from_dict({"marketing": {"etudes_abcd": "AB"}}, base)
+    assert decisions.produit_b_ct.prix_tarif == 30.0
+    assert decisions.marketing.etudes_abcd == "AB"
+    assert base.marketing.etudes_abcd == AllDecisions().marketing.etudes_abcd
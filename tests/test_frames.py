@@ -0,0 +1,71 @@
+"""Report tables as DataFrames, checked against the list-of-rows parser."""
+
+import math
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from mirage.frames import parse_mirage_frames, section_frame
+from mirage.parser import parse_mirage_markdown, parse_number
+from mirage.report import Report
+
+ROOT = Path(__file__).resolve().parents[1]
+REPORTS = sorted(ROOT.glob("Simulation*.md"))
+
+
+def _assert_frame_matches_rows(frame: pd.DataFrame, block):
+    """`block` = header row + the rows of the same table, as parse_mirage_markdown gives them."""
+    assert list(frame.index) == [row[0] for row in block[1:]]
+    for j, name in enumerate(frame.columns, start=1):
+        cells = [row[j] if j < len(row) else "" for row in block[1:]]
+        values = frame[name].tolist()
+        if pd.api.types.is_float_dtype(frame[name]):
+            for cell, value in zip(cells, values):
+                if math.isnan(value):
+                    assert not any(ch.isdigit() for ch in cell), (name, cell)
+                else:
+                    assert value == pytest.approx(parse_number(cell)), (name, cell)
+        else:
+            assert values == cells, name
+
+
+@pytest.mark.parametrize("path", REPORTS, ids=lambda p: p.stem)
+def test_frames_match_parse_mirage_markdown(path):
+    content = path.read_text(encoding="utf-8")
+    parsed = parse_mirage_markdown(content)
+    frames = parse_mirage_frames(content)
+    assert set(frames) == set(parsed)
+    for name, frame in frames.items():
+        if not parsed[name]:
+            assert frame is None
+            continue
+        # The frame is the first table of the section; the rows list chains every table
+        _assert_frame_matches_rows(frame, parsed[name][: len(frame) + 1])
+
+
+def test_report_frames_follow_the_typed_sections():
+    report = Report(REPORTS[0].read_text(encoding="utf-8"))
+    [frame] = report.frames("produits")
+    _assert_frame_matches_rows(frame, report.section_rows("produits")[: len(frame) + 1])
+
+
+def test_flags_duplicate_headers_and_text_columns():
+    content = "\n".join([
+        "## Stocks",
+        "| Produit | Valeur | Valeur | Note |",
+        "|---|---|---|---|",
+        "| A | 1 234 | -N- | ok |",
+        "| B | (12) | 3,5 | |",
+        "",
+        "Texte entre deux tables",
+        "| X | Y |",
+        "|---|---|",
+        "| 1 | 2 |",
+    ])
+    frame = section_frame(content, ["Stocks"])
+    assert list(frame.columns) == ["Valeur", "Valeur.1", "Note"]
+    assert frame.loc["A", "Valeur"] == 1234.0 and frame.loc["B", "Valeur"] == -12.0
+    assert math.isnan(frame.loc["A", "Valeur.1"]) and frame.loc["B", "Valeur.1"] == 3.5
+    assert frame["Note"].tolist() == ["ok", ""]
+    assert len(frame) == 2
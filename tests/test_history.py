@@ -0,0 +1,76 @@
+"""Undo/redo history: versions, deltas and cached results."""
+
+from mirage.binding import DECISION_BINDINGS, STATE_BINDINGS
+from mirage.history import EditHistory
+from mirage.models import AllDecisions, PeriodState
+
+
+def _edited(price: float) -> AllDecisions:
+    decisions = AllDecisions()
+    decisions.produit_a_ct.prix_tarif = price
+    return decisions
+
+
+def test_undo_and_redo_restore_the_exact_decisions():
+    history = EditHistory()
+    state = PeriodState(cash=100.0)
+    history.commit(AllDecisions(), state)
+    history.commit(_edited(21.0), state)
+    history.commit(_edited(22.5), state)
+
+    assert history.undo().decisions.thaw() == _edited(21.0)
+    assert history.undo().decisions.thaw() == AllDecisions()
+    assert history.undo() is None
+    assert history.redo().decisions.thaw() == _edited(21.0)
+
+    values = history.widget_values(history.current)
+    assert DECISION_BINDINGS.build(values) == _edited(21.0)
+    assert STATE_BINDINGS.build(values).cash == 100.0
+
+
+def test_unchanged_commit_is_skipped_and_sections_are_shared():
+    history = EditHistory()
+    first = history.commit(AllDecisions(), PeriodState())
+    assert history.commit(AllDecisions(), PeriodState()) is None
+
+    second = history.commit(_edited(21.0), PeriodState())
+    assert second.state is first.state
+    assert second.decisions.marketing is first.decisions.marketing
+    assert second.delta == (
+        ("decisions.produit_a_ct.prix_tarif", AllDecisions().produit_a_ct.prix_tarif, 21.0),
+    )
+    assert history.describe(second).startswith("produit_a_ct.prix_tarif: ")
+    assert history.describe(first) == "initial"
+
+
+def test_commit_after_undo_drops_the_redo_branch():
+    history = EditHistory()
+    history.commit(AllDecisions(), PeriodState())
+    history.commit(_edited(21.0), PeriodState())
+    history.undo()
+    latest = history.commit(_edited(23.0), PeriodState())
+
+    assert len(history) == 2 and not history.can_redo
+    assert history.current is latest
+    assert history.goto(latest.id) is latest
+
+
+def test_results_are_cached_per_version_and_forecasts():
+    history = EditHistory()
+    history.commit(AllDecisions(), PeriodState())
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert history.results(compute, {"a_ct": 100}) == 1
+    assert history.results(compute, {"a_ct": 100}) == 1
+    assert history.results(compute, {"a_ct": 200}) == 2
+    assert history.cached_results({"a_ct": 100}) == 1
+
+    initial = history.current
+    history.commit(_edited(21.0), PeriodState())
+    assert history.cached_results({"a_ct": 100}) is None
+    assert history.results(compute, {"a_ct": 100}, version=initial) == 1
+    assert len(calls) == 2
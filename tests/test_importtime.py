@@ -0,0 +1,16 @@
+"""The light modules must not pull in the heavy packages (mirage.importtime contract)."""
+
+import pytest
+
+from mirage.importtime import BUDGETS, check, measure
+
+
+@pytest.mark.parametrize("budget", BUDGETS, ids=lambda b: b.module)
+def test_forbidden_packages_are_not_imported(budget):
+    # Time budgets depend on the machine; only the forbidden lists are asserted here
+    [(_, m, _)] = check([budget], runs=1)
+    assert m.heavy(budget.forbidden) == []
+
+
+def test_heavy_imports_are_detected():
+    assert "numpy" in measure("mirage.batch", runs=1).heavy()
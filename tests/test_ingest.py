@@ -0,0 +1,62 @@
+"""Bulk ingestion of report directories into a tidy frame."""
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from mirage.ingest import TIDY_COLUMNS, ingest_directory, ingest_files
+from mirage.parser import extract_period_state, parse_mirage_markdown
+
+ROOT = Path(__file__).resolve().parents[1]
+REPORTS = sorted(ROOT.glob("Simulation*.md"))
+
+
+@pytest.fixture
+def reports(tmp_path):
+    for path in REPORTS:
+        shutil.copy(path, tmp_path / path.name)
+    # Same content under another name; different content under a name with no period
+    shutil.copy(REPORTS[0], tmp_path / "copie.md")
+    (tmp_path / "rapport.md").write_text(
+        REPORTS[1].read_text(encoding="utf-8") + "\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def test_ingest_directory(reports):
+    result = ingest_directory(reports, workers=1)
+    names = {Path(p).name for p in result.states}
+    assert names == {p.name for p in REPORTS} | {"rapport.md"}
+    assert [Path(p).name for p in result.skipped] in (["copie.md"], [REPORTS[0].name])
+
+    for path, state in result.states.items():
+        content = Path(path).read_text(encoding="utf-8")
+        assert state == extract_period_state(parse_mirage_markdown(content))
+
+    periods = {Path(p).name: period for p, period in result.periods.items()}
+    assert periods["rapport.md"] is None
+    assert periods["Simulation - year 0.md"] == 0
+    assert list(result.frame.columns) == TIDY_COLUMNS
+    assert set(result.frame["file"]) == set(result.states)
+    assert result.frame["value"].notna().all()
+    unknown = result.frame[result.frame["file"].str.endswith("rapport.md")]
+    assert unknown["period"].isna().all()
+
+
+def test_explicit_periods_and_known_hashes(reports):
+    first = ingest_files([reports / "rapport.md"], periods={"rapport.md": 4}, workers=1)
+    assert list(first.periods.values()) == [4]
+    assert (first.frame["period"] == 4).all()
+
+    again = ingest_files([reports / "rapport.md"], known_hashes=set(first.hashes.values()))
+    assert again.states == {} and len(again.skipped) == 1
+    assert again.frame.empty
+
+
+def test_pool_gives_the_same_frame(reports):
+    paths = sorted(reports.glob("Simulation*.md"))
+    serial = ingest_files(paths, workers=1).frame
+    pooled = ingest_files(paths, workers=2).frame
+    pd.testing.assert_frame_equal(serial, pooled)
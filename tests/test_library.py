@@ -0,0 +1,106 @@
+"""Scenario library: save/load, index queries, results and imports."""
+
+import json
+
+import pytest
+
+from mirage.calculator import calculate_all
+from mirage.library import ScenarioLibrary
+from mirage.models import AllDecisions, PeriodState
+from mirage.snapshot import Snapshot
+
+
+def _snapshot(price: float = 21.5, period: int = 2) -> Snapshot:
+    decisions = AllDecisions()
+    decisions.produit_a_ct.prix_tarif = price
+    decisions.marketing.etudes_abcd = "AB"
+    return Snapshot(decisions=decisions, state=PeriodState(cash=512.0, period_num=period))
+
+
+@pytest.fixture
+def library(tmp_path):
+    with ScenarioLibrary(tmp_path / "scenarios.sqlite") as lib:
+        yield lib
+
+
+def test_save_and_load_round_trip(library):
+    snap = _snapshot()
+    library.save("Prix agressif", snap, tags=["Prix", " p1 ", ""], metadata={"notes": "été"})
+
+    assert "Prix agressif" in library and "Autre" not in library
+    loaded = library.load("Prix agressif")
+    assert loaded.decisions == snap.decisions and loaded.state == snap.state
+
+    info = library.info("Prix agressif")
+    assert (info.period, info.tags, info.metadata) == (2, ["p1", "prix"], {"notes": "été"})
+    assert not info.has_results
+    with pytest.raises(KeyError):
+        library.load("Autre")
+
+
+def test_save_replaces_by_name_and_keeps_creation_time(library):
+    first = library.save("S", _snapshot(21.0), tags=["a"], created_at=100.0)
+    second = library.save("S", _snapshot(22.0, period=3), tags=["b"])
+
+    assert first == second and len(library) == 1
+    info = library.info("S")
+    assert (info.created_at, info.period, info.tags) == (100.0, 3, ["b"])
+    assert library.load("S").decisions.produit_a_ct.prix_tarif == 22.0
+    assert library.tags() == ["b"]
+
+
+def test_search_filters_and_orders_newest_first(library):
+    library.save("Base", _snapshot(period=1), tags=["ref"], created_at=1.0)
+    library.save("Prix 100%", _snapshot(period=1), tags=["prix", "ref"], created_at=2.0)
+    library.save("Prix bas", _snapshot(period=2), tags=["prix"], created_at=3.0)
+
+    assert [i.name for i in library.list()] == ["Prix bas", "Prix 100%", "Base"]
+    assert [i.name for i in library.search(text="Prix")] == ["Prix bas", "Prix 100%"]
+    assert [i.name for i in library.search(text="100%")] == ["Prix 100%"]
+    assert [i.name for i in library.search(tag=["prix", "ref"])] == ["Prix 100%"]
+    assert [i.name for i in library.search(period=1, since=1.5)] == ["Prix 100%"]
+    assert [i.name for i in library.list(limit=1)] == ["Prix bas"]
+    assert library.delete("Base") and not library.delete("Base")
+
+
+def test_results_are_stored_with_the_scenario(library):
+    snap = _snapshot()
+    results = calculate_all(snap.decisions, snap.state)
+    library.save("Avec résultats", snap, results=results)
+    library.save("Sans", snap)
+
+    assert library.info("Avec résultats").has_results
+    assert library.results("Avec résultats") == results
+    assert library.results("Sans") is None
+
+    library.set_results("Sans", results)
+    assert library.results("Sans") == results
+
+
+def test_export_import_round_trip(library, tmp_path):
+    snap = _snapshot()
+    library.save("S", snap, tags=["x"], metadata={"k": 1}, created_at=5.0)
+    path = tmp_path / "export.jsonl"
+    assert library.export(path) == 1
+
+    with ScenarioLibrary(":memory:") as other:
+        assert other.import_file(path) == 1
+        info = other.info("S")
+        assert (info.created_at, info.tags, info.metadata) == (5.0, ["x"], {"k": 1})
+        assert other.load("S").decisions == snap.decisions
+
+        other.save("S", _snapshot(30.0))
+        assert other.import_file(path) == 0
+        assert other.load("S").decisions.produit_a_ct.prix_tarif == 30.0
+        assert other.import_file(path, replace=True) == 1
+        assert other.load("S").decisions == snap.decisions
+
+
+def test_import_session_json(library, tmp_path):
+    path = tmp_path / "saved_defaults.json"
+    path.write_text(json.dumps({"a_ct_prix": 23.0, "s_cash": 80.0, "user_notes": "note"}))
+
+    library.import_session_json(path, "Défaut", tags=["import"])
+    snap = library.load("Défaut")
+    assert snap.decisions.produit_a_ct.prix_tarif == 23.0 and snap.state.cash == 80.0
+    assert library.info("Défaut").metadata == {"source": "saved_defaults.json", "notes": "note"}
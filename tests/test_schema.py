@@ -0,0 +1,61 @@
+"""Field-path schema: paths, units, bounds and flat round trips."""
+
+import dataclasses
+
+import pytest
+
+from mirage.models import AllDecisions, CalculatedResults, PeriodState
+from mirage.schema import DECISIONS_SCHEMA, RESULTS_SCHEMA, STATE_SCHEMA, schema_for
+
+
+def _leaf_count(model) -> int:
+    return sum(
+        _leaf_count(f.type) if dataclasses.is_dataclass(f.type) else 1
+        for f in dataclasses.fields(model)
+    )
+
+
+@pytest.mark.parametrize("model", [AllDecisions, PeriodState, CalculatedResults])
+def test_every_leaf_has_a_path(model):
+    schema = schema_for(model)
+    assert schema is schema_for(model)
+    assert len(schema) == _leaf_count(model)
+    defaults = model()
+    for spec in schema:
+        assert spec.get(defaults) == spec.default
+
+
+def test_flat_round_trip_does_not_touch_the_base():
+    base = AllDecisions()
+    base.produit_c_gs.ristourne = 5.0
+    flat = DECISIONS_SCHEMA.to_flat(base)
+    assert DECISIONS_SCHEMA.from_flat(flat) == base
+
+    changed = DECISIONS_SCHEMA.from_flat({"produit_a_ct.prix_tarif": 23.0, "inconnu": 1}, base=base)
+    assert changed.produit_a_ct.prix_tarif == 23.0
+    assert changed.produit_c_gs.ristourne == 5.0
+    assert base.produit_a_ct.prix_tarif == AllDecisions().produit_a_ct.prix_tarif
+
+
+def test_units():
+    assert DECISIONS_SCHEMA["produit_a_ct.prix_tarif"].unit == "€/U"
+    assert DECISIONS_SCHEMA["produit_a_gs.ristourne"].unit == "%"
+    assert STATE_SCHEMA["nb_ouvriers"].unit == "ouvriers"
+    assert RESULTS_SCHEMA["prix_net_b_gs"].unit == "€/U"
+    assert RESULTS_SCHEMA["ouvriers_necessaires"].unit == "ouvriers"
+    assert RESULTS_SCHEMA["stock_dispo_a_ct"].unit == "U"
+    assert RESULTS_SCHEMA["resultat_net"].unit == "K€"
+    # Per-product totals, not unit costs
+    assert RESULTS_SCHEMA["cout_prod_a"].unit == "K€"
+
+
+def test_bounds_clip_and_validate():
+    spec = DECISIONS_SCHEMA["produit_a_gs.ristourne"]
+    assert (spec.min, spec.max) == (0.0, 20.0)
+    assert spec.clip(35.0) == 20.0 and spec.clip(-1.0) == 0.0
+    assert DECISIONS_SCHEMA["marketing.etudes_abcd"].clip("AB") == "AB"
+
+    decisions = AllDecisions()
+    assert DECISIONS_SCHEMA.validate(decisions) == []
+    decisions.produit_a_gs.ristourne = 35.0
+    assert DECISIONS_SCHEMA.validate(decisions) == ["produit_a_gs.ristourne = 35.0 > 20.0 %"]
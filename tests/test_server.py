@@ -0,0 +1,93 @@
+"""Evaluation service: evaluate, batch and sweep, in-process and over HTTP."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from mirage.calculator import calculate_all
+from mirage.models import AllDecisions, PeriodState
+from mirage.server import EvaluationService, make_server
+
+
+@pytest.fixture
+def service():
+    service = EvaluationService(state=PeriodState(cash=300.0), workers=0)
+    yield service
+    service.close()
+
+
+def _expected(price: float) -> float:
+    decisions = AllDecisions()
+    decisions.produit_a_ct.prix_tarif = price
+    return calculate_all(decisions, PeriodState(cash=300.0)).resultat_net
+
+
+def test_evaluate_uses_the_server_state(service):
+    body, rows = service.evaluate({
+        "decisions": {"a_ct_prix": 21.0}, "fields": ["resultat_net"],
+    })
+    assert rows == 1
+    assert body == {"results": {"resultat_net": pytest.approx(_expected(21.0))}}
+    with pytest.raises(ValueError):
+        service.evaluate({"fields": ["pas_un_resultat"]})
+
+
+def test_batch_matches_single_evaluations(service):
+    items = [{"decisions": {"produit_a_ct": {"prix_tarif": p}}} for p in (20.0, 22.0)]
+    body, rows = service.batch({"items": items, "fields": ["resultat_net"]})
+    assert rows == 2
+    assert [r["resultat_net"] for r in body["results"]] == pytest.approx(
+        [_expected(20.0), _expected(22.0)]
+    )
+    with pytest.raises(ValueError):
+        service.batch({"items": {}})
+
+
+def test_sweep_ranks_the_grid(service):
+    prices = [19.0, 21.0, 23.0, 25.0]
+    body, rows = service.sweep({
+        "axes": {"produit_a_ct.prix_tarif": prices, "produit_a_ct.production": {
+            "low": 100, "high": 110, "points": 3}},
+        "top": 2,
+    })
+    assert rows == body["rows"] == 12
+    assert len(body["top"]) == 2 and body["top"][0] == body["best"]
+    values = [row["resultat_net"] for row in body["top"]]
+    assert values == sorted(values, reverse=True)
+    assert body["best"]["produit_a_ct.production"] in (100, 105, 110)
+
+    worst, _ = service.sweep({
+        "axes": {"produit_a_ct.prix_tarif": prices}, "maximize": False, "top": 1,
+    })
+    assert worst["best"]["resultat_net"] == pytest.approx(min(_expected(p) for p in prices))
+    with pytest.raises(ValueError):
+        service.sweep({"axes": {"produit_a_ct.inconnu": [1]}})
+
+
+def test_http_routes(service):
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def post(path, payload):
+        request = urllib.request.Request(url + path, data=json.dumps(payload).encode("utf-8"))
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    try:
+        body = post("/evaluate", {"decisions": {"a_ct_prix": 21.0}, "fields": ["resultat_net"]})
+        assert body["results"]["resultat_net"] == pytest.approx(_expected(21.0))
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post("/batch", {"items": 3})
+        assert error.value.code == 400
+
+        with urllib.request.urlopen(url + "/metrics") as response:
+            metrics = json.loads(response.read())
+        assert metrics["endpoints"]["/evaluate"]["requests"] == 1
+        assert metrics["endpoints"]["/batch"]["errors"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
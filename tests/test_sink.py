@@ -0,0 +1,62 @@
+"""Chunked result sinks: part files, resumable chunk ids and reading back."""
+
+import numpy as np
+import pytest
+
+from mirage.batch import ResultBatch
+from mirage.calculator import calculate_all
+from mirage.models import AllDecisions, PeriodState
+from mirage.sink import ResultSink, completed_chunks, iter_chunks, open_sink, read_results
+
+
+def _columns(start: int, n: int):
+    return {"i": np.arange(start, start + n), "x": np.arange(start, start + n) * 0.5}
+
+
+def test_buffered_rows_are_flushed_in_chunks(tmp_path):
+    with ResultSink(tmp_path / "run", format="csv", chunk_rows=4) as sink:
+        sink.write(_columns(0, 3))
+        assert completed_chunks(sink.directory) == []
+        sink.write(_columns(3, 3))
+        assert completed_chunks(sink.directory) == [0]
+        sink.write(_columns(6, 1))
+    assert sink.rows_written == 7
+    assert completed_chunks(tmp_path / "run") == [0, 1]
+
+    frame = read_results(tmp_path / "run")
+    assert frame["i"].tolist() == list(range(7))
+    assert frame["x"].tolist() == [i * 0.5 for i in range(7)]
+    assert read_results(tmp_path / "run", columns=["x"]).columns.tolist() == ["x"]
+    with pytest.raises(ValueError):
+        sink.write(_columns(0, 1))
+
+
+def test_named_chunks_are_rewritten_on_resume(tmp_path):
+    with ResultSink(tmp_path, format="csv") as sink:
+        sink.write(_columns(0, 2), chunk_id=0)
+        sink.write(_columns(2, 2), chunk_id=1)
+    with ResultSink(tmp_path, format="csv") as sink:
+        sink.write(_columns(10, 2), chunk_id=1)
+        sink.write(_columns(20, 1))
+
+    chunks = {chunk_id: frame["i"].tolist() for chunk_id, frame in iter_chunks(tmp_path)}
+    assert chunks == {0: [0, 1], 1: [10, 11], 2: [20]}
+    assert [chunk_id for chunk_id, _ in iter_chunks(tmp_path, start=1)] == [1, 2]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_result_batch_warnings_become_text(tmp_path):
+    results = calculate_all(AllDecisions(), PeriodState())
+    results.warnings = ["stock négatif", "trésorerie"]
+    with open_sink(tmp_path / "run", format="csv") as sink:
+        sink.write(ResultBatch.from_dataclasses([results, results]))
+
+    frame = read_results(tmp_path / "run", columns=["warnings", "resultat_net"])
+    assert frame["warnings"].tolist() == ["stock négatif; trésorerie"] * 2
+    assert frame["resultat_net"].tolist() == pytest.approx([results.resultat_net] * 2)
+
+
+def test_empty_or_unknown(tmp_path):
+    assert read_results(tmp_path, columns=["a"]).columns.tolist() == ["a"]
+    with pytest.raises(ValueError):
+        ResultSink(tmp_path, format="json")
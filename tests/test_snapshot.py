@@ -0,0 +1,91 @@
+"""Binary snapshot round-trips, forward compatibility and migrations."""
+
+import struct
+import zlib
+
+import pytest
+
+from mirage import snapshot
+from mirage.calculator import calculate_all
+from mirage.models import AllDecisions, PeriodState
+from mirage.snapshot import FORECAST_KEYS, Snapshot, SnapshotError
+
+
+def _scenario(forecasts=None) -> Snapshot:
+    decisions = AllDecisions()
+    decisions.produit_a_ct.prix_tarif = 21.5
+    decisions.produit_a_ct.production = 120
+    decisions.marketing.etudes_abcd = "AB"
+    decisions.marketing.etudes_efgh = "EG"
+    state = PeriodState(stock_a_ct=40_000, cash=512.0, nb_ouvriers=480, period_num=3)
+    return Snapshot(decisions=decisions, state=state, forecasts=dict(forecasts or {}))
+
+
+def _encode(layout, records, version=snapshot.SNAPSHOT_VERSION) -> bytes:
+    """A blob with an arbitrary field table, as another version would write it."""
+    parts = [struct.pack("<H", len(layout))]
+    for name, code in layout:
+        raw = name.encode("utf-8")
+        parts += [code.encode("ascii"), struct.pack("<B", len(raw)), raw]
+    parts.append(struct.pack("<I", len(records)))
+    codec = snapshot._Codec(layout)
+    parts += [codec.pack(values) for values in records]
+    return struct.pack("<4sHB", b"MRSN", version, 1) + zlib.compress(b"".join(parts))
+
+
+def test_round_trip():
+    original = _scenario({"A-CT": 30_000, "B-GS": 0})
+    [loaded] = snapshot.loads(snapshot.dumps([original]))
+    assert loaded.decisions == original.decisions
+    assert (loaded.decisions.marketing.etudes_abcd, loaded.decisions.marketing.etudes_efgh) == (
+        "AB", "EG"
+    )
+    assert loaded.state == original.state
+    assert loaded.forecasts == {"A-CT": 30_000, "B-GS": 0}
+    assert loaded.extra == {}
+
+
+def test_missing_forecasts_stay_missing():
+    original = _scenario()
+    loaded = snapshot.load_one(snapshot.dump_one(original))
+    assert loaded.forecasts == {}
+    expected = calculate_all(original.decisions, original.state, forecast_sales=None)
+    forecasts = loaded.forecasts or None
+    replayed = calculate_all(loaded.decisions, loaded.state, forecast_sales=forecasts)
+    assert replayed.resultat_net == expected.resultat_net
+
+
+def test_unknown_fields_go_to_extra_and_missing_fields_get_defaults():
+    layout = [
+        ("decisions.produit_a_ct.prix_tarif", "d"),
+        ("decisions.futur_champ", "q"),
+        ("state.cash", "d"),
+        ("zz.note", "s"),
+    ]
+    [loaded] = snapshot.loads(_encode(layout, [[19.0, 7, 100.0, "ok"]]))
+    assert loaded.decisions.produit_a_ct.prix_tarif == 19.0
+    assert loaded.decisions.produit_a_ct.production == AllDecisions().produit_a_ct.production
+    assert loaded.state.cash == 100.0
+    assert loaded.forecasts == {}
+    assert loaded.extra == {"decisions.futur_champ": 7, "zz.note": "ok"}
+
+
+def test_version_1_zero_forecasts_read_as_absent():
+    layout = [("state.cash", "d")] + [(f"forecasts.{key}", "q") for key in FORECAST_KEYS]
+    blob = _encode(layout, [[10.0] + [0] * 6, [10.0, 500, 0, 0, 0, 0, 0]], version=1)
+    absent, given = snapshot.loads(blob)
+    assert absent.forecasts == {}
+    assert given.forecasts == dict(zip(FORECAST_KEYS, [500, 0, 0, 0, 0, 0]))
+
+
+def test_file_round_trip(tmp_path):
+    path = tmp_path / "scenarios.mrsn"
+    snapshot.save(path, [_scenario(), _scenario({"C-GS": 1})])
+    loaded = snapshot.load(path)
+    assert [s.forecasts for s in loaded] == [{}, {"C-GS": 1}]
+
+
+@pytest.mark.parametrize("data", [b"", b"NOPE\x01\x00\x01", b"MRSN\x02\x00\x01garbage"])
+def test_corrupt_data_raises(data):
+    with pytest.raises(SnapshotError):
+        snapshot.loads(data)
@@ -0,0 +1,64 @@
+"""2-D decision surfaces: values against calculate_all, pool and fallback paths."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from mirage.calculator import calculate_all
+from mirage.models import AllDecisions, PeriodState
+from mirage.schema import DECISIONS_SCHEMA
+from mirage.surface import evaluate_surface
+
+X, Y = "produit_a_ct.prix_tarif", "produit_a_ct.production"
+XS, YS = [18.0, 21.0, 24.0], [0, 50_000, 100_000, 150_000]
+
+
+def _expected(decisions, state):
+    z = np.empty((len(YS), len(XS)))
+    for i, y in enumerate(YS):
+        for j, x in enumerate(XS):
+            cell = DECISIONS_SCHEMA.from_flat({X: x, Y: y}, base=decisions)
+            z[i, j] = calculate_all(cell, state).resultat_net
+    return z
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_surface_matches_calculate_all():
+    decisions, state = AllDecisions(), PeriodState()
+    surface = evaluate_surface(decisions, state, X, XS, Y, YS)
+    assert surface.shape == (len(YS), len(XS))
+    assert surface.workers == 1
+    np.testing.assert_allclose(surface["resultat_net"], _expected(decisions, state))
+
+
+def test_pool_gives_the_same_surface(pool):
+    decisions, state = AllDecisions(), PeriodState()
+    surface = evaluate_surface(decisions, state, X, XS, Y, YS, pool=pool, workers=2)
+    assert surface.workers == 2
+    np.testing.assert_allclose(surface["resultat_net"], _expected(decisions, state))
+
+
+def test_unpicklable_arguments_fall_back_to_this_process(pool):
+    class Decisions(AllDecisions):  # local class: cannot be sent to a worker
+        pass
+
+    decisions, state = Decisions(), PeriodState()
+    surface = evaluate_surface(decisions, state, X, XS, Y, YS, pool=pool, workers=2)
+    assert surface.workers == 1
+    np.testing.assert_allclose(surface["resultat_net"], _expected(decisions, state))
+
+
+def test_shut_down_pool_falls_back_to_this_process():
+    executor = ProcessPoolExecutor(max_workers=2)
+    executor.shutdown()
+    surface = evaluate_surface(
+        AllDecisions(), PeriodState(), X, XS, Y, YS, pool=executor, workers=2
+    )
+    assert surface.workers == 1
+    assert np.isfinite(surface["resultat_net"]).all()
@@ -0,0 +1,75 @@
+"""Resuming an interrupted sweep gives the same output as an uninterrupted run."""
+
+import pandas as pd
+import pytest
+
+from mirage.checkpoint import CheckpointStore
+from mirage.sink import read_results
+from mirage.sweep import SweepSpec, axis_values, run_sweep
+
+SPECS = {
+    "monte_carlo": lambda: SweepSpec(
+        ranges={"produit_a_ct.prix_tarif": (15.0, 30.0), "produit_a_ct.production": (0, 200_000)},
+        samples=230, seed=7, chunk_size=40,
+    ),
+    "grid": lambda: SweepSpec(
+        axes={
+            "produit_a_ct.prix_tarif": axis_values("produit_a_ct.prix_tarif", 15.0, 30.0, 12),
+            "produit_b_ct.prix_tarif": axis_values("produit_b_ct.prix_tarif", 20.0, 40.0, 15),
+        },
+        chunk_size=25,
+    ),
+}
+
+
+def _run(tmp_path, name, spec, **kwargs):
+    store = CheckpointStore(tmp_path / name / "checkpoints")
+    return run_sweep(spec, job_id="job", directory=tmp_path / name, store=store,
+                     checkpoint_every=0, **kwargs)
+
+
+def _frame(outcome) -> pd.DataFrame:
+    return read_results(outcome.directory).sort_values("row", ignore_index=True)
+
+
+def _stop_after(n):
+    calls = iter(range(10_000))
+    return lambda: next(calls) >= n
+
+
+@pytest.mark.parametrize("mode", sorted(SPECS))
+def test_cancelled_then_resumed_matches_uninterrupted(tmp_path, mode):
+    reference = _run(tmp_path, "reference", SPECS[mode]())
+
+    first = _run(tmp_path, "resumed", SPECS[mode](), should_stop=_stop_after(2))
+    assert first.cancelled and first.completed == [0, 1]
+    resumed = _run(tmp_path, "resumed", SPECS[mode]())
+
+    assert not resumed.cancelled
+    assert resumed.completed == reference.completed
+    assert resumed.rows == reference.rows == SPECS[mode]().total_rows
+    assert resumed.best == reference.best
+    pd.testing.assert_frame_equal(_frame(resumed), _frame(reference))
+
+
+def test_resume_after_a_crash(tmp_path):
+    reference = _run(tmp_path, "reference", SPECS["monte_carlo"]())
+
+    def crash(done, total, results):
+        if done == 3:
+            raise RuntimeError("interrompu")
+
+    with pytest.raises(RuntimeError):
+        _run(tmp_path, "resumed", SPECS["monte_carlo"](), progress=crash)
+    resumed = _run(tmp_path, "resumed", SPECS["monte_carlo"]())
+
+    assert resumed.best == reference.best
+    pd.testing.assert_frame_equal(_frame(resumed), _frame(reference))
+
+
+def test_resume_with_other_parameters_is_refused(tmp_path):
+    _run(tmp_path, "run", SPECS["grid"](), should_stop=_stop_after(1))
+    changed = SPECS["grid"]()
+    changed.chunk_size = 10
+    with pytest.raises(ValueError):
+        _run(tmp_path, "run", changed)
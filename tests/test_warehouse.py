@@ -0,0 +1,73 @@
+"""Warehouse round-trips over the bundled reports."""
+
+from pathlib import Path
+
+import pytest
+
+from mirage.ingest import period_from_name
+from mirage.warehouse import Warehouse
+
+ROOT = Path(__file__).resolve().parents[1]
+REPORTS = sorted(ROOT.glob("Simulation*.md"))
+
+
+@pytest.fixture
+def warehouse():
+    with Warehouse(":memory:") as w:
+        yield w
+
+
+def test_period_from_name():
+    assert period_from_name("Simulation Md des données year -2.md") == -2
+    assert period_from_name("Simulation - Md des données Year -3.md") == -3
+    assert period_from_name("Simulation - year 0.md") == 0
+    assert period_from_name("rapport.md") is None
+
+
+def test_add_several_reports_keeps_each_period(warehouse):
+    assert len(REPORTS) == 3
+    for path in REPORTS:
+        warehouse.add_report(path.read_text(encoding="utf-8"), source=path.name)
+
+    reports = warehouse.reports()
+    assert sorted(reports["period"]) == [-3, -2, 0]
+    cash = warehouse.states(fields=["cash"])
+    assert list(cash["period"]) == [-3, -2, 0]
+    assert cash["cash"].nunique() == 3
+    facts = warehouse.facts()
+    assert set(facts["period"]) == {-3, -2, 0}
+    assert not warehouse.competitor_prices("A-CT").empty
+
+
+def test_add_report_requires_a_period(warehouse):
+    with pytest.raises(ValueError):
+        warehouse.add_report(REPORTS[0].read_text(encoding="utf-8"))
+
+
+def test_same_report_is_idempotent(warehouse):
+    text = REPORTS[0].read_text(encoding="utf-8")
+    first = warehouse.add_report(text, period=1)
+    assert warehouse.add_report(text, period=1) == first
+    assert len(warehouse.reports()) == 1
+
+
+def test_different_report_needs_replace(warehouse):
+    warehouse.add_report(REPORTS[0].read_text(encoding="utf-8"), period=1)
+    other = REPORTS[1].read_text(encoding="utf-8")
+    with pytest.raises(ValueError):
+        warehouse.add_report(other, period=1)
+    warehouse.add_report(other, period=1, replace=True)
+    reports = warehouse.reports()
+    assert len(reports) == 1
+    assert len(warehouse.facts(period=1)) > 0
+
+
+def test_state_round_trip(warehouse):
+    path = REPORTS[0]
+    warehouse.add_report(path.read_text(encoding="utf-8"), source=path.name)
+    period = period_from_name(path.name)
+    state = warehouse.period_state(period=period)
+    assert state is not None
+    assert state.cash == warehouse.states(period=period)["cash"].iloc[0]
+    with pytest.raises(ValueError):
+        warehouse.add_state(state)
@@ -0,0 +1,74 @@
+"""Workspace watcher over a temporary directory."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mirage import cache as cache_module
+from mirage import models
+from mirage.cache import ParseCache
+from mirage.parser import extract_period_state, parse_mirage_markdown
+from mirage.watcher import WorkspaceWatcher
+
+ROOT = Path(__file__).resolve().parents[1]
+REPORTS = sorted(ROOT.glob("Simulation*.md"))
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    directory = tmp_path / "workspace"
+    directory.mkdir()
+    for path in REPORTS[:2]:
+        shutil.copy(path, directory / path.name)
+    watcher = WorkspaceWatcher(directory, cache=ParseCache(tmp_path / "cache"))
+    yield directory, watcher
+    watcher.stop()
+
+
+def _settle(watcher):
+    # One parse worker: a no-op queued after the parses finishes after them
+    watcher._pool.submit(lambda: None).result(timeout=30)
+
+
+def test_scan_parses_new_files(workspace):
+    directory, watcher = workspace
+    assert sorted(watcher.scan()) == sorted(p.name for p in REPORTS[:2])
+    _settle(watcher)
+    for path in REPORTS[:2]:
+        assert watcher.status(path.name) == "prêt"
+        expected = extract_period_state(parse_mirage_markdown(path.read_text(encoding="utf-8")))
+        assert watcher.get(path.name).state == expected
+    # Unchanged files are not queued again
+    assert watcher.scan() == []
+
+
+def test_modified_and_removed_files(workspace):
+    directory, watcher = workspace
+    watcher.scan()
+    _settle(watcher)
+    first, second = sorted(watcher.names())
+
+    (directory / second).unlink()
+    (directory / first).write_text(REPORTS[2].read_text(encoding="utf-8"), encoding="utf-8")
+    assert watcher.scan() == [first]
+    _settle(watcher)
+    assert watcher.names() == [first]
+    assert watcher.status(second) == "absent"
+    expected = extract_period_state(parse_mirage_markdown(REPORTS[2].read_text(encoding="utf-8")))
+    assert watcher.get(first).state == expected
+
+
+def test_report_the_cache_cannot_store_is_still_ready(workspace, monkeypatch):
+    # States of a class that no longer matches models.PeriodState (module reloaded)
+    class PeriodState(models.PeriodState):
+        pass
+
+    def stale_state(parsed):
+        return PeriodState(**vars(extract_period_state(parsed)))
+
+    monkeypatch.setattr(cache_module, "extract_period_state", stale_state)
+    directory, watcher = workspace
+    watcher.scan()
+    _settle(watcher)
+    assert {watcher.status(name) for name in watcher.names()} == {"prêt"}